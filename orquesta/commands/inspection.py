@@ -0,0 +1,251 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from xml.etree import ElementTree
+
+from orquesta.expressions import base as expr_base
+from orquesta.specs import loader as spec_loader
+from orquesta.utils import specs as spec_util
+
+
+LOG = logging.getLogger(__name__)
+
+WORKFLOW_FILE_EXTENSIONS = (".yaml", ".yml")
+
+# The exit code is 1 if any workflow has inspection errors and 2 if any file cannot be loaded
+# or if there is no workflow definition to inspect.
+EXIT_OK = 0
+EXIT_INSPECTION_ERRORS = 1
+EXIT_LOAD_ERRORS = 2
+
+RESULT_PASSED = "passed"
+RESULT_FAILED = "failed"
+RESULT_ERROR = "error"
+
+
+def get_workflow_files(paths, extensions=WORKFLOW_FILE_EXTENSIONS):
+    files = []
+
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+
+            for name in sorted(names):
+                if name.endswith(tuple(extensions)):
+                    files.append(os.path.join(root, name))
+
+    return files
+
+
+def init_worker(catalog):
+    # Warm up the schema validator and the expression evaluators once per worker so
+    # the cost is not paid again for every file processed by the worker.
+    spec_module = spec_loader.get_spec_module(catalog)
+    spec_module.WorkflowSpec.get_schema_validator()
+    expr_base.get_evaluators()
+
+
+def process(path, catalog="native"):
+    result = {"path": path, "status": RESULT_PASSED}
+    start = time.time()
+
+    try:
+        if not os.path.isfile(path):
+            raise ValueError('The workflow definition "%s" does not exist.' % path)
+
+        with open(path, "r") as f:
+            wf_spec = spec_util.instantiate(catalog, f.read())
+
+        errors = wf_spec.inspect()
+
+        if errors:
+            result["status"] = RESULT_FAILED
+            result["errors"] = errors
+    except Exception as e:
+        result["status"] = RESULT_ERROR
+        result["message"] = str(e)
+
+    result["duration"] = round(time.time() - start, 6)
+
+    return result
+
+
+def inspect_files(files, catalog="native", processes=None):
+    start = time.time()
+    processes = processes or multiprocessing.cpu_count()
+    processes = min(processes, len(files))
+
+    if processes <= 1:
+        init_worker(catalog)
+        results = [process(path, catalog=catalog) for path in files]
+    else:
+        # Shard the files into chunks so each worker processes a batch of files with the
+        # schema and expression caches that are warmed up by the previous files.
+        chunksize = max(1, len(files) // (processes * 4))
+        pool = multiprocessing.Pool(processes, initializer=init_worker, initargs=(catalog,))
+
+        try:
+            func = functools.partial(process, catalog=catalog)
+            results = list(pool.imap(func, files, chunksize=chunksize))
+        finally:
+            pool.close()
+            pool.join()
+
+    summary = {
+        "files": len(results),
+        RESULT_PASSED: len([r for r in results if r["status"] == RESULT_PASSED]),
+        RESULT_FAILED: len([r for r in results if r["status"] == RESULT_FAILED]),
+        RESULT_ERROR: len([r for r in results if r["status"] == RESULT_ERROR]),
+        "duration": round(time.time() - start, 6),
+    }
+
+    return {"summary": summary, "files": results}
+
+
+def get_exit_code(report):
+    if not report["summary"]["files"] or report["summary"][RESULT_ERROR]:
+        return EXIT_LOAD_ERRORS
+
+    if report["summary"][RESULT_FAILED]:
+        return EXIT_INSPECTION_ERRORS
+
+    return EXIT_OK
+
+
+def format_json(report):
+    return json.dumps(report, indent=2, sort_keys=True)
+
+
+def format_junit(report):
+    summary = report["summary"]
+
+    suite = ElementTree.Element(
+        "testsuite",
+        name="orquesta-inspect",
+        tests=str(summary["files"]),
+        failures=str(summary[RESULT_FAILED]),
+        errors=str(summary[RESULT_ERROR]),
+        time=str(summary["duration"]),
+    )
+
+    for result in report["files"]:
+        case = ElementTree.SubElement(
+            suite,
+            "testcase",
+            classname="orquesta.inspect",
+            name=result["path"],
+            time=str(result["duration"]),
+        )
+
+        if result["status"] == RESULT_FAILED:
+            categories = ", ".join(sorted(result["errors"].keys()))
+            failure = ElementTree.SubElement(
+                case, "failure", message="The workflow has %s errors." % categories
+            )
+            failure.text = json.dumps(result["errors"], indent=2, sort_keys=True)
+
+        if result["status"] == RESULT_ERROR:
+            ElementTree.SubElement(case, "error", message=result["message"])
+
+    # The XML is encoded with character references for non ascii characters and then decoded
+    # since the unicode encoding is not supported by tostring in python 2.7.
+    return ElementTree.tostring(suite).decode("utf-8")
+
+
+REPORT_FORMATS = {"json": format_json, "junit": format_junit}
+
+
+def inspect():
+    parser = argparse.ArgumentParser("A utility for inspecting orquesta workflows.")
+
+    parser.add_argument(
+        "paths",
+        type=str,
+        nargs="+",
+        help="The workflow definition files or directories of workflow definitions to inspect.",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--catalog",
+        type=str,
+        default="native",
+        help="The catalog of the workflow definitions.",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--processes",
+        type=int,
+        default=None,
+        help="The number of worker processes. Defaults to the number of CPUs.",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=sorted(REPORT_FORMATS.keys()),
+        default="json",
+        help="The format of the inspection report.",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="The file to write the inspection report to. Defaults to stdout.",
+    )
+
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Set the log level to debug.",
+    )
+
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    else:
+        logging.getLogger().setLevel(logging.INFO)
+
+    files = get_workflow_files(args.paths)
+    LOG.debug("Identified %s workflow definitions to inspect.", len(files))
+
+    if not files:
+        LOG.error("There is no workflow definition to inspect.")
+
+    report = inspect_files(files, catalog=args.catalog, processes=args.processes)
+    output = REPORT_FORMATS[args.format](report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output + "\n")
+
+    return get_exit_code(report)
@@ -13,19 +13,53 @@
 # limitations under the License.
 
 import abc
+import hashlib
+import json
 import logging
 import six
 
+from orquesta.utils import cache as cache_util
 from orquesta.utils import plugin as plugin_util
 
 
 LOG = logging.getLogger(__name__)
 
+DEFAULT_GRAPH_CACHE_SIZE = 128
+
 
 def get_composer(catalog):
     return plugin_util.get_module("orquesta.composers", catalog)
 
 
+def _get_canonical_key(key):
+    key_type = "str" if isinstance(key, six.string_types) else type(key).__name__
+
+    return "%s:%s" % (key_type, six.text_type(key))
+
+
+def _canonicalize(value):
+    # Convert the keys of the mappings to strings with the type of the key so the mappings with
+    # keys of mixed types can be sorted and keys of different types, i.e. 1 and "1", are distinct.
+    if isinstance(value, dict):
+        return {_get_canonical_key(k): _canonicalize(v) for k, v in six.iteritems(value)}
+
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+
+    return value
+
+
+def get_spec_digest(spec):
+    # The serialized spec includes the catalog and version so the digest is unique per composer.
+    data = json.dumps(_canonicalize(spec.serialize()), sort_keys=True, default=str)
+
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+# The composed graphs are cached for the process and shared by the workflow conductors.
+GRAPH_CACHE = cache_util.LRUCache(DEFAULT_GRAPH_CACHE_SIZE)
+
+
 @six.add_metaclass(abc.ABCMeta)
 class WorkflowComposer(object):
     wf_spec_type = None
@@ -34,3 +68,25 @@ class WorkflowComposer(object):
     @abc.abstractmethod
     def compose(cls, spec):
         raise NotImplementedError()
+
+    @classmethod
+    def get_graph(cls, spec):
+        # Return the composed graph for the spec from the cache if available. Otherwise,
+        # compose the graph and freeze it before caching since the graph is shared.
+        try:
+            digest = get_spec_digest(spec)
+        except Exception as e:
+            # Compose the graph without caching if the digest cannot be computed.
+            LOG.debug("Unable to compute the digest of the workflow spec. %s", str(e))
+            digest = None
+
+        graph = GRAPH_CACHE.get(digest) if digest else None
+
+        if graph is None:
+            graph = cls.compose(spec)
+            graph.freeze()
+
+            if digest:
+                GRAPH_CACHE.put(digest, graph)
+
+        return graph
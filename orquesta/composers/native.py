@@ -12,8 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import logging
-from six.moves import queue
 
 from orquesta.composers import base as comp_base
 from orquesta import graphing
@@ -41,15 +41,15 @@ class WorkflowComposer(comp_base.WorkflowComposer):
         if not isinstance(wf_spec, cls.wf_spec_type):
             raise TypeError("Workflow spec is not typeof %s." % cls.wf_spec_type.__name__)
 
-        q = queue.Queue()
+        q = collections.deque()
         wf_graph = graphing.WorkflowGraph()
         track_splits = {}
 
         for task_name, condition, task_transition_item_idx in wf_spec.tasks.get_start_tasks():
-            q.put((task_name, []))
+            q.append((task_name, []))
 
-        while not q.empty():
-            task_name, splits = q.get()
+        while q:
+            task_name, splits = q.popleft()
 
             wf_graph.add_task(task_name)
 
@@ -92,15 +92,15 @@ class WorkflowComposer(comp_base.WorkflowComposer):
                 ):
                     # Track splits and if superset is already in queue then don't add them again
                     split_id = next_task_name
-                    existing_splits = track_splits.get(split_id, set())
-                    if existing_splits:
+                    existing_splits = track_splits.get(split_id)
+                    if existing_splits is not None:
                         new_splits = set(splits)
                         if not new_splits.issubset(existing_splits):
-                            q.put((next_task_name, list(splits)))
+                            q.append((next_task_name, list(splits)))
                             existing_splits.update(new_splits)
                             track_splits[split_id] = existing_splits
                     else:
-                        q.put((next_task_name, list(splits)))
+                        q.append((next_task_name, list(splits)))
                         track_splits[split_id] = set(splits)
 
                 crta = [condition] if condition else []
@@ -13,8 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+import inspect
 import logging
+import re
 import six
+import sys
 
 from six.moves import queue
 
@@ -24,6 +28,7 @@ from orquesta import exceptions as exc
 from orquesta.expressions import base as expr_base
 from orquesta import graphing
 from orquesta import machines
+from orquesta import requests
 from orquesta.specs import base as spec_base
 from orquesta.specs import loader as spec_loader
 from orquesta import statuses
@@ -35,6 +40,84 @@ from orquesta.utils import plugin as plugin_util
 
 LOG = logging.getLogger(__name__)
 
+# Expression functions that only depend on their arguments and the task context. A task can
+# reuse an earlier render only if the expressions in its action, input, items, and delay call
+# no other function. Functions that read the workflow state or any external state, i.e. the
+# time or a key value store, are not listed here so the task is rendered every time.
+PURE_EXPRESSION_FUNCTIONS = frozenset(
+    [
+        # Orquesta functions that read the task context.
+        "ctx",
+        "item",
+        "json",
+        "result",
+        "zip",
+        # Common functions and filters from the yaql and jinja standard library.
+        "abs",
+        "bool",
+        "capitalize",
+        "concat",
+        "dict",
+        "distinct",
+        "first",
+        "float",
+        "format",
+        "int",
+        "join",
+        "keys",
+        "last",
+        "len",
+        "length",
+        "list",
+        "lower",
+        "max",
+        "min",
+        "range",
+        "replace",
+        "select",
+        "sort",
+        "split",
+        "str",
+        "string",
+        "sum",
+        "title",
+        "trim",
+        "upper",
+        "values",
+        "where",
+    ]
+)
+
+# Function calls, i.e. ctx(...) or $.select(...), and jinja filters, i.e. ... | length.
+EXPRESSION_FUNCTION_REGEX = re.compile(r"([A-Za-z_]\w*)\s*\(|\|\s*([A-Za-z_]\w*)")
+
+
+def journaled(func):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        # Only the outermost call is recorded. Any nested calls, i.e. engine commands
+        # or workflow status change on error, are replayed by the outermost call.
+        if self._journal is None or self._journaling:
+            return func(self, *args, **kwargs)
+
+        # The call is recorded before it is made since the call may change the state of
+        # the workflow before it fails. The failure is recorded so it is expected on replay.
+        entry = self._append_journal(
+            func.__name__, inspect.getcallargs(func, self, *args, **kwargs)
+        )
+
+        self._journaling = True
+
+        try:
+            return func(self, *args, **kwargs)
+        except Exception as e:
+            entry["error"] = {"type": type(e).__name__, "message": str(e)}
+            raise
+        finally:
+            self._journaling = False
+
+    return wrapper
+
 
 class WorkflowState(object):
     def __init__(self, conductor=None):
@@ -229,7 +312,7 @@ class WorkflowState(object):
 
 
 class WorkflowConductor(object):
-    def __init__(self, spec, context=None, inputs=None):
+    def __init__(self, spec, context=None, inputs=None, journal=False):
         if not spec or not isinstance(spec, spec_base.Spec):
             raise ValueError('The value of "spec" is not type of Spec.')
 
@@ -238,16 +321,37 @@ class WorkflowConductor(object):
         self.spec_module = spec_loader.get_spec_module(self.catalog)
         self.composer = plugin_util.get_module("orquesta.composers", self.catalog)
 
+        self._batch_deferred_events = []
+        self._batch_last_event = None
+        self._batch_workflow_quiet = None
         self._errors = []
         self._graph = None
+        self._inbound_criteria = None
         self._inputs = inputs or {}
+        self._journal = None
+        self._journal_seq = 0
+        self._journaling = False
         self._log = []
         self._outputs = None
         self._parent_ctx = context or {}
+        self._rendered_tasks = {}
         self._workflow_state = None
 
+        # Record the initial input and context as the first entry in the journal.
+        if journal:
+            self._journal = []
+            self._append_journal("init", {"context": context, "inputs": inputs})
+
     def restore(
-        self, graph, log=None, errors=None, state=None, inputs=None, outputs=None, context=None
+        self,
+        graph,
+        log=None,
+        errors=None,
+        state=None,
+        inputs=None,
+        outputs=None,
+        context=None,
+        journal=None,
     ):
         if not graph or not isinstance(graph, graphing.WorkflowGraph):
             raise ValueError('The value of "graph" is not type of WorkflowGraph.')
@@ -261,12 +365,20 @@ class WorkflowConductor(object):
         if outputs is not None and not isinstance(outputs, dict):
             raise ValueError('The value of "outputs" is not type of dict.')
 
+        self._batch_deferred_events = []
+        self._batch_last_event = None
+        self._batch_workflow_quiet = None
         self._errors = errors or []
         self._graph = graph
+        self._inbound_criteria = None
         self._inputs = inputs or {}
+        self._journal = [] if journal is not None else None
+        self._journal_seq = journal or 0
+        self._journaling = False
         self._log = log or []
         self._outputs = outputs
         self._parent_ctx = context or {}
+        self._rendered_tasks = {}
         self._workflow_state = state
 
         # Assign a back reference of the conductor to the workflow state.
@@ -274,10 +386,10 @@ class WorkflowConductor(object):
         # identify if there are next tasks.
         self._workflow_state.conductor = self
 
-    def serialize(self):
-        return {
+    def serialize(self, compact=False):
+        data = {
             "spec": self.spec.serialize(),
-            "graph": self.graph.serialize(),
+            "graph": self.graph.serialize(compact=compact),
             "input": self.get_workflow_input(),
             "context": self.get_workflow_parent_context(),
             "state": self.workflow_state.serialize(),
@@ -286,6 +398,13 @@ class WorkflowConductor(object):
             "output": self.get_workflow_output(),
         }
 
+        # Record the sequence of the next journal entry so the snapshot can be
+        # matched with the tail of the journal on replay.
+        if self._journal is not None:
+            data["journal"] = self._journal_seq
+
+        return data
+
     @classmethod
     def deserialize(cls, data):
         spec_module = spec_loader.get_spec_module(data["spec"]["catalog"])
@@ -298,16 +417,130 @@ class WorkflowConductor(object):
         log = json_util.deepcopy(data.get("log", []))
         errors = json_util.deepcopy(data["errors"])
         outputs = json_util.deepcopy(data["output"])
+        journal = data.get("journal")
 
         instance = cls(spec)
-        instance.restore(graph, log, errors, state, inputs, outputs, context)
+        instance.restore(graph, log, errors, state, inputs, outputs, context, journal)
 
         return instance
 
+    @classmethod
+    def replay(cls, spec, journal, snapshot=None):
+        instance = None
+
+        # Restore from the snapshot if provided. The journal entries that are already
+        # recorded in the snapshot are skipped below.
+        if snapshot:
+            if "journal" not in snapshot:
+                raise exc.WorkflowJournalError("The snapshot is not taken in journal mode.")
+
+            instance = cls.deserialize(snapshot)
+
+        for entry in journal:
+            if instance is not None and entry["seq"] < instance._journal_seq:
+                continue
+
+            expected_seq = instance._journal_seq if instance is not None else 0
+
+            if entry["seq"] != expected_seq:
+                message = 'The journal entry "%s" is expected but got "%s".'
+                raise exc.WorkflowJournalError(message % (expected_seq, entry["seq"]))
+
+            if instance is None and entry["op"] != "init":
+                raise exc.WorkflowJournalError("The journal does not start with the init entry.")
+
+            if instance is None:
+                instance = cls(spec, context=entry["context"], inputs=entry["inputs"], journal=True)
+                continue
+
+            instance._replay_journal_entry(entry)
+
+        if instance is None:
+            raise exc.WorkflowJournalError("The journal is empty and there is no snapshot.")
+
+        # The journal entries replayed here are already persisted by the caller.
+        instance.flush_journal()
+
+        return instance
+
+    @property
+    def journal(self):
+        return self._journal
+
+    def flush_journal(self):
+        entries = self._journal or []
+
+        if self._journal is not None:
+            self._journal = []
+
+        return entries
+
+    def _append_journal(self, op, callargs):
+        entry = {"seq": self._journal_seq, "op": op}
+
+        if op == "init":
+            entry["context"] = json_util.deepcopy(callargs["context"] or {})
+            entry["inputs"] = json_util.deepcopy(callargs["inputs"] or {})
+        elif op == "request_workflow_status":
+            entry["status"] = callargs["status"]
+        elif op == "update_task_state":
+            entry["task_id"] = callargs["task_id"]
+            entry["route"] = callargs["route"]
+            entry["event"] = callargs["event"].serialize()
+        elif op == "update_task_states":
+            entry["events"] = [[t, r, e.serialize()] for t, r, e in callargs["task_events"]]
+        elif op == "request_workflow_rerun":
+            entry["tasks"] = [
+                {"task_id": t.task_id, "route": t.route, "reset_items": t.reset_items}
+                for t in callargs["task_requests"] or []
+            ]
+
+        self._journal.append(entry)
+        self._journal_seq += 1
+
+        return entry
+
+    def _replay_journal_entry(self, entry):
+        # The call that failed when it was recorded is expected to fail the same way.
+        try:
+            self._replay_journal_op(entry)
+        except Exception as e:
+            if type(e).__name__ != entry.get("error", {}).get("type"):
+                raise
+        else:
+            if "error" in entry:
+                message = 'The journal entry "%s" is expected to fail but succeeded.'
+                raise exc.WorkflowJournalError(message % entry["seq"])
+
+    def _replay_journal_op(self, entry):
+        op = entry["op"]
+
+        if op == "request_workflow_status":
+            self.request_workflow_status(entry["status"])
+        elif op == "update_task_state":
+            event = events.ExecutionEvent.deserialize(entry["event"])
+            self.update_task_state(entry["task_id"], entry["route"], event)
+        elif op == "update_task_states":
+            task_events = [
+                (t, r, events.ExecutionEvent.deserialize(e)) for t, r, e in entry["events"]
+            ]
+            self.update_task_states(task_events)
+        elif op == "request_workflow_rerun":
+            task_requests = [requests.TaskRerunRequest.new(**t) for t in entry["tasks"]]
+            self.request_workflow_rerun(task_requests=task_requests)
+        elif op == "get_next_tasks":
+            self.get_next_tasks()
+        elif op == "render_workflow_output":
+            self.render_workflow_output()
+        elif op == "reset_workflow_output":
+            self.reset_workflow_output()
+        else:
+            raise exc.WorkflowJournalError('The journal operation "%s" is not valid.' % op)
+
     @property
     def graph(self):
         if not self._graph:
-            self._graph = self.composer.compose(self.spec)
+            self._graph = self.composer.get_graph(self.spec)
 
         return self._graph
 
@@ -423,6 +656,7 @@ class WorkflowConductor(object):
 
         self.workflow_state.status = value
 
+    @journaled
     def request_workflow_status(self, status):
         # Record current workflow status.
         current_status = self.get_workflow_status()
@@ -435,7 +669,8 @@ class WorkflowConductor(object):
             machines.TaskStateMachine.process_event(self.workflow_state, task_state, wf_ex_event)
 
         # Process the workflow status change event.
-        machines.WorkflowStateMachine.process_event(self.workflow_state, wf_ex_event)
+        situation = self.get_workflow_situation()
+        machines.WorkflowStateMachine.process_event(self.workflow_state, wf_ex_event, situation)
 
         # Get workflow status after event is processed.
         updated_status = self.get_workflow_status()
@@ -491,6 +726,7 @@ class WorkflowConductor(object):
 
         return wf_term_ctx
 
+    @journaled
     def render_workflow_output(self):
         wf_status = self.get_workflow_status()
 
@@ -515,52 +751,116 @@ class WorkflowConductor(object):
     def get_workflow_output(self):
         return json_util.deepcopy(self._outputs) if self._outputs else None
 
+    @journaled
     def reset_workflow_output(self):
         self._outputs = None
 
-    def get_inbound_criteria_status(self, task_id, route):
-        # Get the list of inbound task transitions for the barrier task.
-        inbound_transitions = self.graph.get_prev_transitions(task_id)
+    def _evaluate_inbound_criterion(self, prev_task_id, task_id, route):
+        prev_task_state_entry = self.get_task_state_entry(prev_task_id, route)
+
+        # The inbound criterion is undetermined if the inbound task has not run.
+        if not prev_task_state_entry:
+            return None
+
+        # The inbound criterion is satisfied if any transition to the task is satisfied.
+        for prev_transition in self.graph.get_next_transitions(prev_task_id):
+            if prev_transition[1] != task_id:
+                continue
+
+            prev_task_transition_id = constants.TASK_STATE_TRANSITION_FORMAT % (
+                prev_transition[1],
+                str(prev_transition[2]),
+            )
+
+            if prev_task_state_entry["next"].get(prev_task_transition_id):
+                return True
+
+        return False
+
+    def _get_inbound_criteria(self, task_id, route):
+        if self._inbound_criteria is None:
+            self._inbound_criteria = {}
+
+        key = (task_id, route)
+
+        if key in self._inbound_criteria:
+            return self._inbound_criteria[key]
+
+        # Get the list of inbound tasks for the barrier task.
+        inbound_tasks = set(t[0] for t in self.graph.get_prev_transitions(task_id))
 
         # Setup the result for the evaluation of the criteria for inbound task transitions.
-        inbound_evaluation = {i: None for i in list(set(t[0] for t in inbound_transitions))}
+        inbound_evaluation = {
+            prev_task_id: self._evaluate_inbound_criterion(prev_task_id, task_id, route)
+            for prev_task_id in inbound_tasks
+        }
 
         # Identify the join requirement.
         barrier = self.graph.get_barrier(task_id) or 1
         requirement = len(inbound_evaluation.keys()) if barrier == "*" else barrier
 
-        # Evaluate the criteria for each inbound task transitions.
-        for prev_transition in inbound_transitions:
-            prev_task_state_entry = self.get_task_state_entry(prev_transition[0], route)
+        # Keep a tally of the inbound criteria so the status can be determined without
+        # evaluating all the inbound task transitions on every request.
+        inbound_criteria = {
+            "evaluation": inbound_evaluation,
+            "requirement": requirement,
+            "satisfied": list(inbound_evaluation.values()).count(True),
+            "pending": list(inbound_evaluation.values()).count(None),
+        }
+
+        self._inbound_criteria[key] = inbound_criteria
+
+        return inbound_criteria
+
+    def _update_inbound_criteria(self, prev_task_id, route, task_id=None):
+        if not self._inbound_criteria:
+            return
+
+        if task_id is not None:
+            next_task_ids = [task_id]
+        else:
+            next_task_ids = set(t[1] for t in self.graph.get_next_transitions(prev_task_id))
+
+        for next_task_id in next_task_ids:
+            inbound_criteria = self._inbound_criteria.get((next_task_id, route))
 
-            if not prev_task_state_entry:
+            # Skip if the inbound criteria for the next task has not been tallied yet.
+            if not inbound_criteria:
                 continue
 
-            prev_task_transition_id = constants.TASK_STATE_TRANSITION_FORMAT % (
-                prev_transition[1],
-                str(prev_transition[2]),
-            )
+            old_value = inbound_criteria["evaluation"][prev_task_id]
+            new_value = self._evaluate_inbound_criterion(prev_task_id, next_task_id, route)
 
-            satisfied = (
-                prev_task_transition_id in prev_task_state_entry["next"]
-                and prev_task_state_entry["next"][prev_task_transition_id]
-            )
+            if old_value == new_value:
+                continue
+
+            inbound_criteria["evaluation"][prev_task_id] = new_value
+            inbound_criteria["satisfied"] += int(new_value is True) - int(old_value is True)
+            inbound_criteria["pending"] += int(new_value is None) - int(old_value is None)
+
+    def _is_inbound_criteria_satisfied(self, task_id, route):
+        inbound_criteria = self._get_inbound_criteria(task_id, route)
+
+        return inbound_criteria["satisfied"] >= inbound_criteria["requirement"]
 
-            if not bool(inbound_evaluation[prev_transition[0]]):
-                inbound_evaluation[prev_transition[0]] = satisfied
+    def get_inbound_criteria_status(self, task_id, route, is_workflow_active=None):
+        inbound_criteria = self._get_inbound_criteria(task_id, route)
 
         # If the count of inbound task(s) where the criteria is True >= requirements,
         # then the join requirement is satisified.
-        if list(inbound_evaluation.values()).count(True) >= requirement:
+        if inbound_criteria["satisfied"] >= inbound_criteria["requirement"]:
             return constants.INBOUND_CRITERIA_SATISFIED
 
         # If there is an inbound task(s) where the criteria is None and there is still
         # active task(s) or staged task(s) that is ready,  then this means that the
         # workflow is still active and it is possible that not all inbound branch(es)
         # and subsequent task(s) have run.
-        if None in inbound_evaluation.values() and (
-            self.workflow_state.has_active_tasks or self.workflow_state.has_staged_tasks
-        ):
+        if inbound_criteria["pending"] > 0 and is_workflow_active is None:
+            is_workflow_active = (
+                self.workflow_state.has_active_tasks or self.workflow_state.has_staged_tasks
+            )
+
+        if inbound_criteria["pending"] > 0 and is_workflow_active:
             return constants.INBOUND_CRITERIA_WIP
 
         # If reached here, then the requirement is not satisified.
@@ -576,8 +876,8 @@ class WorkflowConductor(object):
         current_task = {"id": task_id, "route": route}
         task_ctx = ctx_util.set_current_task(task_ctx, current_task)
         task_ctx = dict_util.merge_dicts(task_ctx, state_ctx, True)
-        task_spec = self.spec.tasks.get_task(task_id).copy()
-        task_spec, action_specs = task_spec.render(task_ctx)
+        # The task spec is not modified on render so the task spec is shared and not copied.
+        task_spec, action_specs = self.spec.tasks.get_task(task_id).render(task_ctx)
 
         task = {
             "id": task_id,
@@ -608,6 +908,82 @@ class WorkflowConductor(object):
 
         return task
 
+    def _is_task_render_reusable(self, task_spec):
+        render_specs = [
+            getattr(task_spec, "action", None),
+            getattr(task_spec, "input", None),
+            getattr(task_spec, "delay", None),
+        ]
+
+        if task_spec.has_items():
+            render_specs.append(task_spec.get_items_spec().spec)
+
+        statements = []
+
+        while render_specs:
+            value = render_specs.pop()
+
+            if isinstance(value, dict):
+                render_specs.extend(value.keys())
+                render_specs.extend(value.values())
+            elif isinstance(value, list):
+                render_specs.extend(value)
+            elif isinstance(value, six.string_types) and expr_base.has_expressions(value):
+                statements.append(value)
+
+        for statement in statements:
+            # The workflow state is not part of the render key so it cannot be referenced.
+            if "__state" in statement:
+                return False
+
+            for match in EXPRESSION_FUNCTION_REGEX.findall(statement):
+                if (match[0] or match[1]) not in PURE_EXPRESSION_FUNCTIONS:
+                    return False
+
+        return True
+
+    def _get_task_render_key(self, staged_task):
+        # The task context is identified by the task id and the indexes of the inbound contexts.
+        return (staged_task["id"], tuple(staged_task["ctxs"]["in"]))
+
+    def _get_staged_task_render(self, staged_task):
+        task_id = staged_task["id"]
+        task_route = staged_task["route"]
+        render_key = self._get_task_render_key(staged_task)
+        rendered_task = self._rendered_tasks.get((task_id, task_route))
+
+        if not rendered_task or rendered_task["key"] != render_key:
+            # Render the task if it is not rendered yet or if the task context has changed.
+            self._rendered_tasks.pop((task_id, task_route), None)
+            task = self.get_task(task_id, task_route)
+
+            if self._is_task_render_reusable(task["spec"]):
+                rendered_task = dict(task, key=render_key)
+                rendered_task["ctx"] = {
+                    k: v for k, v in six.iteritems(task["ctx"]) if k != "__state"
+                }
+                self._rendered_tasks[(task_id, task_route)] = rendered_task
+        else:
+            # Otherwise, reuse the earlier render and refresh the state in the task context.
+            task = {k: v for k, v in six.iteritems(rendered_task) if k != "key"}
+            task["ctx"] = dict(rendered_task["ctx"], __state=self.workflow_state.serialize())
+
+        # Trim the actions per concurrency policy. If the render is kept for reuse, copy only
+        # the actions that run next so the actions in the render are not modified by the caller.
+        task = self._evaluate_task_actions(task)
+
+        if (task_id, task_route) in self._rendered_tasks:
+            task["actions"] = json_util.deepcopy(task["actions"])
+
+        return task
+
+    def _remove_staged_task(self, task_id, route):
+        self.workflow_state.remove_staged_task(task_id, route)
+
+        # Drop the render of the task once the task leaves staging.
+        if not self.workflow_state.get_staged_task(task_id, route):
+            self._rendered_tasks.pop((task_id, route), None)
+
     def _evaluate_task_actions(self, task):
         task_id = task["id"]
         task_route = task["route"]
@@ -683,12 +1059,90 @@ class WorkflowConductor(object):
     def has_barrier_next(self, task_id, route=None):
         return self._has_next(task_id, route=route, eval_join_ready=False)
 
+    def _get_next_situation(self, task_id, route, is_workflow_active):
+        # Evaluate both has_barrier_next and has_next_tasks for the task in a single pass
+        # over the task transitions. See _has_next for details on the evaluation.
+        has_barrier_next = False
+        task_state_entry = self.get_task_state_entry(task_id, route)
+
+        if (
+            not task_state_entry
+            or task_state_entry.get("status") not in statuses.COMPLETED_STATUSES_SET
+        ):
+            return False, False
+
+        for next_seq in self.graph.get_next_transitions(task_id):
+            next_task_id, seq_key = next_seq[1], next_seq[2]
+
+            task_transition_id = constants.TASK_STATE_TRANSITION_FORMAT % (
+                next_task_id,
+                str(seq_key),
+            )
+
+            if next_task_id == "continue":
+                continue
+
+            if not task_state_entry["next"].get(task_transition_id):
+                continue
+
+            has_barrier_next = True
+
+            if self.graph.has_barrier(next_task_id):
+                inbound_criteria_status = self.get_inbound_criteria_status(
+                    next_task_id, route, is_workflow_active=is_workflow_active
+                )
+
+                if inbound_criteria_status == constants.INBOUND_CRITERIA_NOT_SATISFIED:
+                    continue
+
+            return True, has_barrier_next
+
+        return False, has_barrier_next
+
+    def get_workflow_situation(self, task_id=None, route=None):
+        situation = {
+            "has_active_tasks": False,
+            "has_staged_tasks": self.workflow_state.has_staged_tasks,
+            "has_pausing_tasks": False,
+            "has_paused_tasks": False,
+            "has_canceling_tasks": False,
+            "has_canceled_tasks": False,
+        }
+
+        # Identify the status of the last occurrence of each task in a single pass.
+        for idx in six.itervalues(self.workflow_state.tasks):
+            task_status = self.workflow_state.sequence[idx].get("status")
+
+            if task_status in statuses.ACTIVE_STATUSES_SET:
+                situation["has_active_tasks"] = True
+
+            if task_status == statuses.PAUSING:
+                situation["has_pausing_tasks"] = True
+            elif task_status in [statuses.PAUSED, statuses.PENDING]:
+                situation["has_paused_tasks"] = True
+            elif task_status == statuses.CANCELING:
+                situation["has_canceling_tasks"] = True
+            elif task_status == statuses.CANCELED:
+                situation["has_canceled_tasks"] = True
+
+        if task_id is not None:
+            is_workflow_active = situation["has_active_tasks"] or situation["has_staged_tasks"]
+            has_next_tasks, has_barrier_next = self._get_next_situation(
+                task_id, route, is_workflow_active
+            )
+
+            situation["has_next_tasks"] = has_next_tasks
+            situation["has_barrier_next"] = has_barrier_next
+
+        return situation
+
     def has_next_tasks(self, task_id=None, route=None):
         if not task_id:
             return True if self.workflow_state.get_staged_tasks() else False
 
         return self._has_next(task_id, route=route)
 
+    @journaled
     def get_next_tasks(self):
         fail_on_task_rendering = False
         staged_tasks = self.workflow_state.get_staged_tasks()
@@ -709,8 +1163,7 @@ class WorkflowConductor(object):
         # error one at a time during runtime.
         for staged_task in remediation_tasks or staged_tasks:
             try:
-                next_task = self.get_task(staged_task["id"], staged_task["route"])
-                next_task = self._evaluate_task_actions(next_task)
+                next_task = self._get_staged_task_render(staged_task)
 
                 # Assign the task retry delay which will overwrite any task delay
                 # specified in the task definition.
@@ -832,8 +1285,12 @@ class WorkflowConductor(object):
         self.workflow_state.sequence.append(task_state_entry)
         self.workflow_state.tasks[task_state_entry_id] = len(self.workflow_state.sequence) - 1
 
+        # Refresh the inbound criteria for the next tasks since this is the latest entry.
+        self._update_inbound_criteria(task_id, route)
+
         return task_state_entry
 
+    @journaled
     def update_task_state(self, task_id, route, event):
         engine_event_queue = queue.Queue()
 
@@ -890,7 +1347,7 @@ class WorkflowConductor(object):
 
         # Remove task from staging if task is not with items.
         if event.status and staged_task and "items" not in staged_task:
-            self.workflow_state.remove_staged_task(task_id, route)
+            self._remove_staged_task(task_id, route)
 
         # If action execution is for a task item, then record the execution status for the item.
         # Result for each item is not recorded in the staged_task because it impacts database
@@ -915,7 +1372,7 @@ class WorkflowConductor(object):
             task_state_entry["retry"]["tally"] += 1
 
             # Reset the staged task to be returned in get_next_tasks
-            self.workflow_state.remove_staged_task(task_id, route)
+            self._remove_staged_task(task_id, route)
 
             self.workflow_state.add_staged_task(
                 task_id,
@@ -931,7 +1388,7 @@ class WorkflowConductor(object):
             # Remove task from staging if exists but keep and flag entry
             # if task has items and failed for manual rerun.
             if not (task_spec.has_items() and new_task_status in statuses.ABENDED_STATUSES):
-                self.workflow_state.remove_staged_task(task_id, route)
+                self._remove_staged_task(task_id, route)
             else:
                 staged_task = self.workflow_state.get_staged_task(task_id, route)
                 staged_task["completed"] = True
@@ -976,6 +1433,7 @@ class WorkflowConductor(object):
                     criteria = task_transition[3].get("criteria") or []
                     evaluated_criteria = [expr_base.evaluate(c, current_ctx) for c in criteria]
                     task_state_entry["next"][task_transition_id] = all(evaluated_criteria)
+                    self._update_inbound_criteria(task_id, route, task_id=task_transition[1])
                 except Exception as e:
                     self.log_error(e, task_id, route, task_transition_id)
                     self.request_workflow_status(statuses.FAILED)
@@ -983,8 +1441,7 @@ class WorkflowConductor(object):
 
                 # If criteria met, then mark the next task staged and calculate outgoing context.
                 if task_state_entry["next"][task_transition_id]:
-                    next_task_node = self.graph.get_task(task_transition[1])
-                    next_task_id = next_task_node["id"]
+                    next_task_id = task_transition[1]
                     new_ctx_idx = None
 
                     # Get and process new context for the task transition.
@@ -1050,9 +1507,8 @@ class WorkflowConductor(object):
 
                     # Check if inbound criteria are met. Must use the original route
                     # to identify the inbound task transitions.
-                    staged_next_task["ready"] = (
-                        self.get_inbound_criteria_status(next_task_id, route)
-                        == constants.INBOUND_CRITERIA_SATISFIED
+                    staged_next_task["ready"] = self._is_inbound_criteria_satisfied(
+                        next_task_id, route
                     )
 
                     # Put the next task in the engine event queue if it is an engine command.
@@ -1083,8 +1539,13 @@ class WorkflowConductor(object):
                     staged_next_task["run_on_fail"] = True
 
         # Process the task event using the workflow state machine and update the workflow status.
-        task_ex_event = events.TaskExecutionEvent(task_id, route, task_state_entry["status"])
-        machines.WorkflowStateMachine.process_event(self.workflow_state, task_ex_event)
+        # The evaluation is skipped in a batch if the task event cannot change the workflow status.
+        if not self._is_task_event_deferrable(task_id, route, task_state_entry):
+            self._evaluate_workflow_state(task_id, route, task_state_entry["status"])
+            self._batch_deferred_events = []
+            self._batch_workflow_quiet = None
+        else:
+            self._batch_deferred_events.append((task_id, route, task_state_entry["status"]))
 
         # Process any engine commands in the queue.
         while not engine_event_queue.empty():
@@ -1098,6 +1559,94 @@ class WorkflowConductor(object):
 
         return task_state_entry
 
+    def _evaluate_workflow_state(self, task_id, route, task_status):
+        task_ex_event = events.TaskExecutionEvent(task_id, route, task_status)
+        situation = self.get_workflow_situation(task_id, route)
+        machines.WorkflowStateMachine.process_event(self.workflow_state, task_ex_event, situation)
+
+    def _is_task_event_deferrable(self, task_id, route, task_state_entry):
+        # Task events are only deferred while processing a batch of events.
+        if not self._batch_last_event:
+            return False
+
+        # A running workflow stays running on task running or succeeded event.
+        if self.get_workflow_status() != statuses.RUNNING:
+            return False
+
+        if task_state_entry.get("status") not in [statuses.RUNNING, statuses.SUCCEEDED]:
+            return False
+
+        # The last task in the batch has to be active, which means the workflow is also
+        # active until the event for that task is processed at the end of the batch.
+        last_task_id, last_route = self._batch_last_event
+
+        if (last_task_id, last_route) == (task_id, route):
+            return False
+
+        last_task_state_entry = self.get_task_state_entry(last_task_id, last_route)
+
+        if not last_task_state_entry:
+            return False
+
+        if last_task_state_entry.get("status") not in statuses.ACTIVE_STATUSES:
+            return False
+
+        # Paused and canceled tasks would pause or cancel the workflow on task succeeded.
+        # The check is only reset when the workflow state machine is evaluated since the
+        # deferred task events here do not pause or cancel any task.
+        if self._batch_workflow_quiet is None:
+            situation = self.get_workflow_situation()
+
+            self._batch_workflow_quiet = not (
+                situation["has_pausing_tasks"]
+                or situation["has_paused_tasks"]
+                or situation["has_canceling_tasks"]
+                or situation["has_canceled_tasks"]
+            )
+
+        return self._batch_workflow_quiet
+
+    @journaled
+    def update_task_states(self, task_events):
+        task_state_entries = []
+
+        if not task_events:
+            return task_state_entries
+
+        # The evaluation of the workflow state machine is deferred for the events in the
+        # batch until the event of the last task in the batch is processed.
+        self._batch_deferred_events = []
+        self._batch_last_event = tuple(task_events[-1][0:2])
+        self._batch_workflow_quiet = None
+
+        try:
+            for task_id, route, event in task_events:
+                task_state_entries.append(self.update_task_state(task_id, route, event))
+        except Exception:
+            # If the batch fails before the last event is processed, evaluate the workflow
+            # state machine for the deferred events so the workflow status is not stale.
+            exc_info = sys.exc_info()
+            self._evaluate_deferred_task_events()
+            six.reraise(*exc_info)
+        finally:
+            self._batch_deferred_events = []
+            self._batch_last_event = None
+            self._batch_workflow_quiet = None
+
+        return task_state_entries
+
+    def _evaluate_deferred_task_events(self):
+        deferred_events = self._batch_deferred_events
+        self._batch_deferred_events = []
+        self._batch_last_event = None
+
+        for task_id, route, task_status in deferred_events:
+            self._evaluate_workflow_state(task_id, route, task_status)
+
+            # Mark the task as a terminal task if workflow execution is completed.
+            if self.get_workflow_status() in statuses.COMPLETED_STATUSES:
+                self.get_task_state_entry(task_id, route)["term"] = True
+
     def _evaluate_route(self, task_transition, prev_route):
         task_id = task_transition[1]
 
@@ -1106,10 +1655,7 @@ class WorkflowConductor(object):
             str(task_transition[2]),
         )
 
-        is_split_task = self.spec.tasks.is_split_task(task_id)
-        is_in_cycle = self.graph.in_cycle(task_id)
-
-        if not is_split_task or is_in_cycle:
+        if not self.spec.tasks.is_split_task(task_id) or self.graph.in_cycle(task_id):
             return prev_route
 
         old_route_details = self.workflow_state.routes[prev_route]
@@ -1244,6 +1790,7 @@ class WorkflowConductor(object):
 
         return result
 
+    @journaled
     def request_workflow_rerun(self, task_requests=None):
         # Throw exception if workflow is still active.
         if self.get_workflow_status() not in statuses.COMPLETED_STATUSES:
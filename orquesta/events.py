@@ -16,6 +16,7 @@ import logging
 
 from orquesta import exceptions as exc
 from orquesta import statuses
+from orquesta.utils import jsonify as json_util
 
 
 LOG = logging.getLogger(__name__)
@@ -327,6 +328,22 @@ class ExecutionEvent(object):
         self.result = result
         self.context = context
 
+    def serialize(self):
+        return {"type": type(self).__name__, "attrs": json_util.deepcopy(vars(self))}
+
+    @classmethod
+    def deserialize(cls, data):
+        event_type = globals().get(data["type"])
+
+        if not isinstance(event_type, type) or not issubclass(event_type, ExecutionEvent):
+            raise exc.InvalidEventType(data["type"], data["attrs"].get("name"))
+
+        # Bypass the constructor since the signature varies by the type of event.
+        instance = event_type.__new__(event_type)
+        instance.__dict__.update(json_util.deepcopy(data["attrs"]))
+
+        return instance
+
 
 class WorkflowExecutionEvent(ExecutionEvent):
     def __init__(self, status):
@@ -72,6 +72,12 @@ class AmbiguousTaskTransition(OrquestaException):
         OrquestaException.__init__(self, message)
 
 
+class WorkflowGraphIsFrozenError(OrquestaException):
+    def __init__(self):
+        message = "The workflow graph is frozen and cannot be modified."
+        super(WorkflowGraphIsFrozenError, self).__init__(message)
+
+
 class InvalidEventType(OrquestaException):
     def __init__(self, type_name, event_name):
         message = 'Event type "%s" with event "%s" is not valid.' % (type_name, event_name)
@@ -128,6 +134,10 @@ class WorkflowLogEntryError(OrquestaException):
     pass
 
 
+class WorkflowJournalError(OrquestaException):
+    pass
+
+
 class WorkflowIsActiveAndNotRerunableError(OrquestaException):
     def __init__(self):
         message = "Unable to rerun workflow because it is not in a completed state."
@@ -19,8 +19,7 @@ import re
 import six
 import threading
 
-from stevedore import extension
-
+from orquesta.utils import cache as cache_util
 from orquesta.utils import expression as expr_util
 from orquesta.utils import plugin as plugin_util
 
@@ -31,6 +30,35 @@ _EXP_EVALUATORS = None
 _EXP_EVALUATORS_LOCK = threading.Lock()
 _EXP_EVALUATOR_NAMESPACE = "orquesta.expressions.evaluators"
 
+DEFAULT_VALIDATION_CACHE_SIZE = 4096
+
+
+class LazyClassAttribute(object):
+    # Build the value of the class attribute on first access and keep the value for the class.
+    # This defers building the expression engines until use. The value is built again after
+    # reset, i.e. when the expression functions are registered or reset.
+    _lock = threading.RLock()
+
+    def __init__(self, func):
+        self.func = func
+        self.values = {}
+
+    def __get__(self, instance, owner):
+        try:
+            return self.values[owner]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if owner not in self.values:
+                self.values[owner] = self.func(owner)
+
+            return self.values[owner]
+
+    def reset(self):
+        with self._lock:
+            self.values.clear()
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Evaluator(object):
@@ -69,6 +97,11 @@ class Evaluator(object):
         raise NotImplementedError()
 
 
+# The results of the expression validation are cached for the process by evaluator and
+# expression since the same expressions are repeated across tasks and workflows.
+VALIDATION_CACHE = cache_util.LRUCache(DEFAULT_VALIDATION_CACHE_SIZE)
+
+
 def get_evaluator(language):
     return plugin_util.get_module(_EXP_EVALUATOR_NAMESPACE, language)
 
@@ -79,16 +112,27 @@ def get_evaluators():
 
     with _EXP_EVALUATORS_LOCK:
         if _EXP_EVALUATORS is None:
-            _EXP_EVALUATORS = {}
+            _EXP_EVALUATORS = plugin_util.get_modules(_EXP_EVALUATOR_NAMESPACE)
+
+    return _EXP_EVALUATORS
+
 
-            mgr = extension.ExtensionManager(
-                namespace=_EXP_EVALUATOR_NAMESPACE, invoke_on_load=False
-            )
+def reset_evaluators():
+    global _EXP_EVALUATORS
+    global _EXP_EVALUATORS_LOCK
 
-            for name in mgr.names():
-                _EXP_EVALUATORS[name] = get_evaluator(name)
+    with _EXP_EVALUATORS_LOCK:
+        # Reset the expression engines of the evaluators so they are built again with the
+        # expression functions that are currently registered.
+        for evaluator in (_EXP_EVALUATORS or {}).values():
+            for attr in vars(evaluator).values():
+                if isinstance(attr, LazyClassAttribute):
+                    attr.reset()
 
-    return _EXP_EVALUATORS
+        _EXP_EVALUATORS = None
+
+
+plugin_util.register_reset_hook(reset_evaluators)
 
 
 def get_statement_regexes():
@@ -121,7 +165,7 @@ def validate(statement):
         ]
 
         if len(evaluators) == 1:
-            errors.extend(evaluators[0].validate(statement))
+            errors.extend(validate_expression(evaluators[0], statement))
         elif len(evaluators) > 1:
             message = "Expression with multiple types is not supported."
             errors.append(expr_util.format_error(None, statement, message))
@@ -129,6 +173,18 @@ def validate(statement):
     return {"errors": errors}
 
 
+def validate_expression(evaluator, statement):
+    key = (evaluator.get_type(), statement)
+    result = VALIDATION_CACHE.get(key)
+
+    if result is None:
+        result = tuple(evaluator.validate(statement))
+        VALIDATION_CACHE.put(key, result)
+
+    # Return a copy of the errors since the caller may add the spec path to the errors.
+    return [dict(error) for error in result]
+
+
 def evaluate(statement, data=None):
     if isinstance(statement, dict):
         return {evaluate(k, data=data): evaluate(v, data=data) for k, v in six.iteritems(statement)}
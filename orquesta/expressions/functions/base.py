@@ -14,9 +14,10 @@
 
 import threading
 
-from stevedore import extension
+from orquesta.utils import plugin as plugin_util
 
 
+_EXP_FUNC_NAMESPACE = "orquesta.expressions.functions"
 _EXP_FUNC_CATALOG = None
 _EXP_FUNC_CATALOG_LOCK = threading.Lock()
 
@@ -27,13 +28,17 @@ def load():
 
     with _EXP_FUNC_CATALOG_LOCK:
         if _EXP_FUNC_CATALOG is None:
-            _EXP_FUNC_CATALOG = {}
+            _EXP_FUNC_CATALOG = plugin_util.get_modules(_EXP_FUNC_NAMESPACE)
 
-            mgr = extension.ExtensionManager(
-                namespace="orquesta.expressions.functions", invoke_on_load=False
-            )
+    return _EXP_FUNC_CATALOG
 
-            for name in mgr.names():
-                _EXP_FUNC_CATALOG[name] = mgr[name].plugin
 
-    return _EXP_FUNC_CATALOG
+def reset():
+    global _EXP_FUNC_CATALOG
+    global _EXP_FUNC_CATALOG_LOCK
+
+    with _EXP_FUNC_CATALOG_LOCK:
+        _EXP_FUNC_CATALOG = None
+
+
+plugin_util.register_reset_hook(reset)
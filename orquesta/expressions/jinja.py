@@ -80,11 +80,19 @@ class JinjaEvaluator(expr_base.Evaluator):
     _regex_raw_block_pattern = "{% raw %}.*?{% endraw %}"
     _regex_raw_block_parser = re.compile(_regex_raw_block_pattern)
 
-    _jinja_env = jinja2.sandbox.SandboxedEnvironment(
-        undefined=jinja2.StrictUndefined, trim_blocks=True, lstrip_blocks=True
-    )
+    @expr_base.LazyClassAttribute
+    def _jinja_env(cls):
+        jinja_env = jinja2.sandbox.SandboxedEnvironment(
+            undefined=jinja2.StrictUndefined, trim_blocks=True, lstrip_blocks=True
+        )
 
-    _custom_functions = register_functions(_jinja_env)
+        register_functions(jinja_env)
+
+        return jinja_env
+
+    @expr_base.LazyClassAttribute
+    def _custom_functions(cls):
+        return func_base.load()
 
     @classmethod
     def contextualize(cls, data):
@@ -73,9 +73,19 @@ class YAQLEvaluator(expr_base.Evaluator):
         r'(?:\bctx\("({})"\))'.format(_regex_var),  # extract x in ctx("x")
     ]
 
-    _engine = yaql.language.factory.YaqlFactory().create()
-    _root_ctx = yaql.create_context()
-    _custom_functions = register_functions(_root_ctx)
+    @expr_base.LazyClassAttribute
+    def _engine(cls):
+        return yaql.language.factory.YaqlFactory().create()
+
+    @expr_base.LazyClassAttribute
+    def _root_ctx(cls):
+        root_ctx = yaql.create_context()
+        register_functions(root_ctx)
+        return root_ctx
+
+    @expr_base.LazyClassAttribute
+    def _custom_functions(cls):
+        return func_base.load()
 
     @classmethod
     def contextualize(cls, data):
@@ -15,47 +15,385 @@
 import abc
 import logging
 
-import networkx as nx
-from networkx.readwrite import json_graph
-
 import six
 
 from orquesta import exceptions as exc
-from orquesta.utils import dictionary as dict_util
 from orquesta.utils import jsonify as json_util
+from orquesta.utils import plugin as plugin_util
 
 
 LOG = logging.getLogger(__name__)
 
+# Version of the compact serialization format of the workflow graph.
+COMPACT_FORMAT_VERSION = 1
+
+# The graph backends are loaded from the orquesta.graphing.backends entry points.
+DEFAULT_GRAPH_BACKEND = "dict"
+
+
+def get_graph_backend(name=None):
+    return plugin_util.get_module("orquesta.graphing.backends", name or DEFAULT_GRAPH_BACKEND)
+
+
+def get_cycle_members(successors):
+    # Identify the nodes that are in a cycle, i.e. nodes in a strongly connected component
+    # with other nodes or nodes with a self loop. The strongly connected components are
+    # identified using an iterative version of Tarjan's algorithm so the graph is traversed
+    # once and there is no limit on the depth of the graph.
+    cycle_members = set()
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+
+    for root in successors:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors.get(root, [])))]
+
+        while work:
+            node, next_nodes = work[-1]
+            descended = False
+
+            for next_node in next_nodes:
+                if next_node == node:
+                    cycle_members.add(node)
+
+                if next_node not in index:
+                    index[next_node] = lowlink[next_node] = len(index)
+                    stack.append(next_node)
+                    on_stack.add(next_node)
+                    work.append((next_node, iter(successors.get(next_node, []))))
+                    descended = True
+                    break
+
+                if next_node in on_stack:
+                    lowlink[node] = min(lowlink[node], index[next_node])
+
+            if descended:
+                continue
+
+            work.pop()
+
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            if lowlink[node] == index[node]:
+                component = []
+
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+
+                    if member == node:
+                        break
+
+                if len(component) > 1:
+                    cycle_members.update(component)
+
+    return cycle_members
+
+
+class DictMultiDiGraph(object):
+    # A lightweight directed multigraph for conducting. The nodes and edges are stored in
+    # dicts with the same layout as networkx.MultiDiGraph so the workflow graph can operate
+    # on either backend. The successors and predecessors of a node share the same dict of
+    # edges keyed by the edge key.
+    def __init__(self, **attr):
+        self.graph = dict(attr)
+        self._node = {}
+        self._succ = {}
+        self._pred = {}
+
+    def __len__(self):
+        return len(self._node)
+
+    def __contains__(self, n):
+        return n in self._node
+
+    @property
+    def nodes(self):
+        return self._node
+
+    def has_node(self, n):
+        return n in self._node
+
+    def add_node(self, n, **attr):
+        if n not in self._node:
+            self._succ[n] = {}
+            self._pred[n] = {}
+            self._node[n] = attr
+        else:
+            self._node[n].update(attr)
+
+    def add_edge(self, u, v, key=None, **attr):
+        for n in [u, v]:
+            if n not in self._node:
+                self.add_node(n)
+
+        keydict = self._succ[u].get(v)
+
+        if keydict is None:
+            keydict = {}
+            self._succ[u][v] = keydict
+            self._pred[v][u] = keydict
+
+        # Use the lowest unused integer as the key the same way as networkx.
+        if key is None:
+            key = len(keydict)
+
+            while key in keydict:
+                key += 1
+
+        keydict.setdefault(key, {}).update(attr)
+
+        return key
+
 
 @six.add_metaclass(abc.ABCMeta)
 class WorkflowGraph(object):
-    def __init__(self, graph=None):
+    def __init__(self, graph=None, backend=None):
         # self._graph is the graph model for the workflow. The tracking of workflow and task
         # progress and state is separate from the graph model. There are use cases where tasks
-        # may be cycled and states overwritten.
-        self._graph = graph if graph else nx.MultiDiGraph()
+        # may be cycled and states overwritten. The graph model is either a networkx
+        # MultiDiGraph or any backend that stores the nodes and edges in the same layout.
+        self._graph = graph if graph is not None else get_graph_backend(backend)()
+
+        # The cycles in the graph are identified on first use and then cached. The cache
+        # is reset whenever a task or transition is added to the graph.
+        self._cycles = None
+        self._cycle_members = None
+
+        # The inbound and outbound transitions of each task are sorted on first use and then
+        # cached. The cache for the source and destination is reset when a transition is added.
+        self._next_transitions = {}
+        self._prev_transitions = {}
+
+        # A frozen graph cannot be modified so it can be shared, i.e. between conductors.
+        self._frozen = False
+
+    @property
+    def backend(self):
+        return type(self._graph)
+
+    def to_backend(self, backend=None):
+        # Copy the tasks and transitions to a new graph in the given backend. The attributes
+        # are copied in a single pass so the new graph does not share any value.
+        g = get_graph_backend(backend)(**self._graph.graph)
+        task_attrs, transitions = json_util.deepcopy(
+            [
+                [[task_id, attrs] for task_id, attrs in six.iteritems(self._graph._node)],
+                [
+                    [source, destination, key, attrs]
+                    for source, destination, key, attrs in self._iter_transitions()
+                ],
+            ]
+        )
+
+        for task_id, attrs in task_attrs:
+            g.add_node(task_id, **attrs)
 
-    def serialize(self):
-        data = json_graph.adjacency_data(self._graph)
+        for source, destination, key, attrs in transitions:
+            g.add_edge(source, destination, key=key, **attrs)
 
-        data["adjacency"] = [
-            sorted(outbounds, key=lambda x: x["id"]) for outbounds in data["adjacency"]
+        return self.__class__(graph=g)
+
+    def to_networkx(self):
+        # Return the graph as a networkx graph for analysis. If the graph is already a
+        # networkx graph, then the graph is returned as is and must not be modified.
+        import networkx as nx
+
+        if isinstance(self._graph, nx.MultiDiGraph):
+            return self._graph
+
+        return self.to_backend("networkx")._graph
+
+    def _iter_transitions(self):
+        for source, outbounds in six.iteritems(self._graph._succ):
+            for destination, keydict in six.iteritems(outbounds):
+                for key, attrs in six.iteritems(keydict):
+                    yield source, destination, key, attrs
+
+    def serialize(self, compact=False):
+        if compact:
+            data = self._serialize_compact()
+        else:
+            data = self._serialize_adjacency()
+
+        # The attribute values are shared with the graph so copy them if the graph is frozen.
+        return json_util.deepcopy(data) if self._frozen else data
+
+    def _serialize_adjacency(self):
+        # Serialize the graph in the same format as the adjacency data from networkx.
+        g_nodes, g_succ = self._graph._node, self._graph._succ
+
+        adjacency = [
+            sorted(
+                [
+                    dict(attrs, id=destination, key=key)
+                    for destination, keydict in six.iteritems(g_succ[task_id])
+                    for key, attrs in six.iteritems(keydict)
+                ],
+                key=lambda x: x["id"],
+            )
+            for task_id in g_nodes
         ]
 
-        return data
+        return {
+            "directed": True,
+            "multigraph": True,
+            "graph": list(self._graph.graph.items()),
+            "nodes": [dict(attrs, id=task_id) for task_id, attrs in six.iteritems(g_nodes)],
+            "adjacency": adjacency,
+        }
+
+    def _serialize_compact(self):
+        # The task names and attribute values are listed once and referenced by their index in
+        # the list. The task and transition attributes are stored in tables keyed by attribute
+        # name with entries of the index of the task or transition and the index of the value.
+        tasks = list(self._graph._node)
+        task_idxs = {task_id: i for i, task_id in enumerate(tasks)}
+        task_attrs = {}
+        transitions = []
+        transition_attrs = {}
+        values = []
+        value_idxs = {}
+
+        # The repr of the JSON compatible value is unique to the value and cheaper to compute.
+        def intern(value):
+            value_key = repr(value)
+
+            if value_key not in value_idxs:
+                value_idxs[value_key] = len(values)
+                values.append(value)
+
+            return value_idxs[value_key]
+
+        g_nodes, g_succ = self._graph._node, self._graph._succ
+
+        for task_id in tasks:
+            for attr, value in six.iteritems(g_nodes[task_id]):
+                task_attrs.setdefault(attr, []).append([task_idxs[task_id], intern(value)])
+
+        # Order the transitions the same way as the adjacency in the default format so the
+        # keys and order of the transitions are preserved on deserialization.
+        for task_id in tasks:
+            for destination in sorted(g_succ[task_id]):
+                for key, attrs in six.iteritems(g_succ[task_id][destination]):
+                    for attr, value in six.iteritems(attrs):
+                        entry = [len(transitions), intern(value)]
+                        transition_attrs.setdefault(attr, []).append(entry)
+
+                    transitions.append([task_idxs[task_id], task_idxs[destination], key])
+
+        return {
+            "version": COMPACT_FORMAT_VERSION,
+            "graph": dict(self._graph.graph),
+            "tasks": tasks,
+            "task_attrs": task_attrs,
+            "transitions": transitions,
+            "transition_attrs": transition_attrs,
+            "values": values,
+        }
+
+    @classmethod
+    def deserialize(cls, data, backend=None):
+        # The graph in the default format is from networkx and does not have a version.
+        if "version" in data:
+            return cls._deserialize_compact(data, backend=backend)
+
+        return cls._deserialize_adjacency(json_util.deepcopy(data), backend=backend)
 
     @classmethod
-    def deserialize(cls, data):
-        g = json_graph.adjacency_graph(json_util.deepcopy(data), directed=True, multigraph=True)
+    def _deserialize_adjacency(cls, data, backend=None):
+        # Deserialize the graph from the adjacency data the same way as networkx.
+        g = get_graph_backend(backend)(**dict(data.get("graph", [])))
+        task_ids = []
+
+        for task_attrs in data["nodes"]:
+            task_id = task_attrs.pop("id")
+            task_ids.append(task_id)
+            g.add_node(task_id, **task_attrs)
+
+        for task_id, outbounds in zip(task_ids, data["adjacency"]):
+            for attrs in outbounds:
+                destination = attrs.pop("id")
+                key = attrs.pop("key", None)
+                g.add_edge(task_id, destination, key=key, **attrs)
+
         return cls(graph=g)
 
+    @classmethod
+    def _deserialize_compact(cls, data, backend=None):
+        if data["version"] != COMPACT_FORMAT_VERSION:
+            raise ValueError(
+                'Serialized workflow graph version "%s" is not supported.' % data["version"]
+            )
+
+        tasks = data["tasks"]
+        values = data["values"]
+        task_attrs = [{} for task_id in tasks]
+        transition_attrs = [{} for transition in data["transitions"]]
+
+        for attr, entries in six.iteritems(data["task_attrs"]):
+            for idx, value_idx in entries:
+                task_attrs[idx][attr] = values[value_idx]
+
+        for attr, entries in six.iteritems(data["transition_attrs"]):
+            for idx, value_idx in entries:
+                transition_attrs[idx][attr] = values[value_idx]
+
+        # The same value can be referenced by more than one task or transition. Copy the
+        # attributes in a single pass so each task and transition has its own copy.
+        task_attrs, transition_attrs = json_util.deepcopy([task_attrs, transition_attrs])
+
+        # Populate the adjacency of the graph directly instead of adding the tasks and the
+        # transitions one at a time. The successors and predecessors of a task share the same
+        # dict of transitions keyed by the transition key.
+        g = get_graph_backend(backend)(**data.get("graph", {}))
+        g_nodes, g_succ, g_pred = g._node, g._succ, g._pred
+
+        for task_id, attrs in zip(tasks, task_attrs):
+            g_nodes[task_id] = attrs
+            g_succ[task_id] = {}
+            g_pred[task_id] = {}
+
+        for i, (s, d, k) in enumerate(data["transitions"]):
+            source, destination = tasks[s], tasks[d]
+            keydict = g_succ[source].get(destination)
+
+            if keydict is None:
+                keydict = {}
+                g_succ[source][destination] = keydict
+                g_pred[destination][source] = keydict
+
+            keydict[k] = transition_attrs[i]
+
+        return cls(graph=g)
+
+    @property
+    def frozen(self):
+        return self._frozen
+
+    def freeze(self):
+        self._frozen = True
+
+    def _check_frozen(self):
+        if self._frozen:
+            raise exc.WorkflowGraphIsFrozenError()
+
     @staticmethod
     def get_root_nodes(graph):
         nodes = [
-            {"id": n, "name": graph.nodes[n].get("name", n)}
-            for n, d in dict(graph.in_degree()).items()
-            if d == 0
+            {"id": n, "name": attrs.get("name", n)}
+            for n, attrs in six.iteritems(graph._node)
+            if not graph._pred[n]
         ]
 
         return sorted(nodes, key=lambda x: x["id"])
@@ -66,71 +404,77 @@ class WorkflowGraph(object):
 
     @property
     def leaves(self):
-        # Reverse the graph using a copy to identify the root nodes.
-        return self.get_root_nodes(self._graph.reverse(copy=True))
+        nodes = [
+            {"id": n, "name": attrs.get("name", n)}
+            for n, attrs in six.iteritems(self._graph._node)
+            if not self._graph._succ[n]
+        ]
+
+        return sorted(nodes, key=lambda x: x["id"])
 
     def has_tasks(self):
         return len(self._graph) > 0
 
     def has_task(self, task_id):
-        return self._graph.has_node(task_id)
+        return task_id in self._graph._node
 
     def get_task(self, task_id):
         if not self.has_task(task_id):
             raise exc.InvalidTask(task_id)
 
         task = {"id": task_id}
-        task.update(json_util.deepcopy(self._graph.nodes[task_id]))
+        task.update(json_util.deepcopy(self._graph._node[task_id]))
 
         return task
 
+    def _get_task_attribute(self, task_id, attribute):
+        # Read the attribute directly from the task node without copying the node attributes.
+        # The value returned is shared with the graph and must not be modified by the caller.
+        if not self.has_task(task_id):
+            raise exc.InvalidTask(task_id)
+
+        return self._graph._node[task_id].get(attribute)
+
     def get_task_attributes(self, attribute):
-        return dict_util.merge_dicts(
-            {n: None for n in self._graph.nodes()},
-            nx.get_node_attributes(self._graph, attribute),
-            overwrite=True,
-        )
+        return {n: attrs.get(attribute) for n, attrs in six.iteritems(self._graph._node)}
 
     def add_task(self, task_id, **kwargs):
+        self._check_frozen()
+
         if not self.has_task(task_id):
             self._graph.add_node(task_id, **kwargs)
+            self._reset_cycles()
         else:
             self.update_task(task_id, **kwargs)
 
     def update_task(self, task_id, **kwargs):
+        self._check_frozen()
+
         if not self.has_task(task_id):
             raise exc.InvalidTask(task_id)
 
         for key, value in six.iteritems(kwargs):
-            self._graph.nodes[task_id][key] = value
+            self._graph._node[task_id][key] = value
 
-    def has_transition(self, source, destination, **kwargs):
-        edges = filter(
-            lambda e: e[0] == source and e[1] == destination,
-            self._graph.edges(data=True, keys=True),  # pylint: disable=unexpected-keyword-arg
-        )
+    def _get_transitions(self, source, destination, **kwargs):
+        # Look up the transitions between the source and destination directly from the
+        # adjacency of the graph instead of filtering through every transition in the graph.
+        edges = self._graph._succ.get(source, {}).get(destination, {})
 
-        for attr, value in six.iteritems(kwargs):
-            edges = filter(lambda e: e[3].get(attr, None) == value, list(edges))
+        return [
+            (source, destination, k, d)
+            for k, d in six.iteritems(edges)
+            if all(d.get(attr, None) == value for attr, value in six.iteritems(kwargs))
+        ]
 
-        return list(edges)
+    def has_transition(self, source, destination, **kwargs):
+        return self._get_transitions(source, destination, **kwargs)
 
     def get_transition(self, source, destination, key=None, **kwargs):
         if key is not None:
-            edges = filter(
-                lambda e: e[0] == source and e[1] == destination and e[2] == key,
-                self._graph.edges(data=True, keys=True),  # pylint: disable=unexpected-keyword-arg
-            )
+            edges = [e for e in self._get_transitions(source, destination) if e[2] == key]
         else:
-            edges = filter(
-                lambda e: e[0] == source and e[1] == destination,
-                self._graph.edges(data=True, keys=True),  # pylint: disable=unexpected-keyword-arg
-            )
-
-            for attr, value in six.iteritems(kwargs):
-                edges = filter(lambda e: e[3].get(attr, None) == value, list(edges))
-
-        edges = list(edges)
+            edges = self._get_transitions(source, destination, **kwargs)
 
         if len(edges) <= 0:
             raise exc.InvalidTaskTransition(source, destination)
@@ -141,9 +485,15 @@ class WorkflowGraph(object):
         return edges[0]
 
     def get_transition_attributes(self, attribute):
-        return nx.get_edge_attributes(self._graph, attribute)
+        return {
+            (source, destination, key): attrs[attribute]
+            for source, destination, key, attrs in self._iter_transitions()
+            if attribute in attrs
+        }
 
     def add_transition(self, source, destination, **kwargs):
+        self._check_frozen()
+
         if not self.has_task(source):
             self.add_task(source)
 
@@ -158,47 +508,83 @@ class WorkflowGraph(object):
                 attrs[attr] = value
 
         self._graph.add_edge(source, destination, **attrs)
+        self._next_transitions.pop(source, None)
+        self._prev_transitions.pop(destination, None)
+        self._reset_cycles()
 
     def update_transition(self, source, destination, key, **kwargs):
+        self._check_frozen()
+
         seq = self.get_transition(source, destination, key=key)
 
         for attr, value in six.iteritems(kwargs):
-            self._graph[source][destination][seq[2]][attr] = value
+            self._graph._succ[source][destination][seq[2]][attr] = value
 
     def get_next_transitions(self, task_id):
-        return sorted(
-            [e for e in self._graph.out_edges([task_id], data=True, keys=True)], key=lambda x: x[1]
-        )
+        if task_id not in self._next_transitions:
+            self._next_transitions[task_id] = sorted(
+                [
+                    (task_id, destination, key, attrs)
+                    for destination, keydict in six.iteritems(self._graph._succ.get(task_id, {}))
+                    for key, attrs in six.iteritems(keydict)
+                ],
+                key=lambda x: x[1],
+            )
+
+        return list(self._next_transitions[task_id])
 
     def get_prev_transitions(self, task_id):
-        return sorted(
-            [e for e in self._graph.in_edges([task_id], data=True, keys=True)], key=lambda x: x[1]
-        )
+        if task_id not in self._prev_transitions:
+            self._prev_transitions[task_id] = [
+                (source, task_id, key, attrs)
+                for source, keydict in six.iteritems(self._graph._pred.get(task_id, {}))
+                for key, attrs in six.iteritems(keydict)
+            ]
+
+        return list(self._prev_transitions[task_id])
 
     def get_barriers(self):
         return {
-            x[0]: x[1] for x in filter(lambda x: x[1].get("barrier"), self._graph.nodes(data=True))
+            task_id: attrs
+            for task_id, attrs in six.iteritems(self._graph._node)
+            if attrs.get("barrier")
         }
 
     def set_barrier(self, task_id, value="*"):
         self.update_task(task_id, barrier=value)
 
     def get_barrier(self, task_id):
-        return self.get_task(task_id).get("barrier")
+        return self._get_task_attribute(task_id, "barrier")
 
     def has_barrier(self, task_id):
         b = self.get_barrier(task_id)
 
         return b is not None and b != ""
 
+    def _reset_cycles(self):
+        self._cycles = None
+        self._cycle_members = None
+
     def get_cycles(self):
-        return [
-            {"tasks": sorted(c), "route": nx.find_cycle(self._graph, c)}
-            for c in nx.simple_cycles(self._graph)
-        ]
+        # Enumerating the simple cycles is only required for analysis so networkx is used.
+        import networkx as nx
+
+        if self._cycles is None:
+            g = self.to_networkx()
+
+            self._cycles = [
+                {"tasks": sorted(c), "route": nx.find_cycle(g, c)} for c in nx.simple_cycles(g)
+            ]
+
+        return [{"tasks": list(c["tasks"]), "route": list(c["route"])} for c in self._cycles]
 
     def in_cycle(self, task_id):
-        return [c for c in nx.simple_cycles(self._graph) if task_id in c]
+        # A task is in a cycle if it belongs to a strongly connected component with other
+        # tasks or if it transitions to itself. The components are computed in linear time.
+        if self._cycle_members is None:
+            self._cycle_members = frozenset(get_cycle_members(self._graph._succ))
+
+        return task_id in self._cycle_members
 
     def is_cycle_closed(self, cycle):
         # A cycle is closed, for a lack of better term, if there is no task
@@ -211,7 +597,7 @@ class WorkflowGraph(object):
         return True
 
     def get_task_retry_spec(self, task_id):
-        return self.get_task(task_id).get("retry")
+        return self._get_task_attribute(task_id, "retry")
 
     def task_has_retry(self, task_id):
         r = self.get_task_retry_spec(task_id)
@@ -18,7 +18,6 @@ import logging
 from orquesta import events
 from orquesta import exceptions as exc
 from orquesta import statuses
-from orquesta.utils import jsonify as json_util
 
 
 LOG = logging.getLogger(__name__)
@@ -450,29 +449,120 @@ TASK_STATE_MACHINE_DATA = {
 }
 
 
-class TaskStateMachine(object):
-    @classmethod
-    def is_transition_valid(cls, old_status, new_status):
-        if old_status is None:
-            old_status = "null"
+# Integer codes for the statuses and events in the state machine tables.
+STATUS_CODES = {s: i for i, s in enumerate(statuses.ALL_STATUSES)}
+
+EVENT_CODES = {
+    e: i
+    for i, e in enumerate(
+        sorted(
+            set(
+                events.WORKFLOW_EXECUTION_EVENTS
+                + events.TASK_EXECUTION_EVENTS
+                + events.ACTION_EXECUTION_EVENTS
+                + events.ENGINE_OPERATION_EVENTS
+                + [e for t in WORKFLOW_STATE_MACHINE_DATA.values() for e in t.keys()]
+                + [e for t in TASK_STATE_MACHINE_DATA.values() for e in t.keys()]
+            )
+        )
+    )
+}
+
+# Sets of the event groups for constant time membership check.
+ACTION_EVENTS_SET = frozenset(events.ACTION_EXECUTION_EVENTS + events.ENGINE_OPERATION_EVENTS)
+
+WORKFLOW_EVENTS_SET = frozenset(events.WORKFLOW_EXECUTION_EVENTS)
+
+TASK_EVENTS_SET = frozenset(events.TASK_EXECUTION_EVENTS)
+
+TASK_CONDITIONAL_EVENTS_SET = frozenset(events.TASK_CONDITIONAL_EVENTS)
+
+TASK_ITEM_EVENT_STATUSES_SET = frozenset(
+    [
+        statuses.RESUMING,
+        statuses.PENDING,
+        statuses.PAUSED,
+        statuses.SUCCEEDED,
+        statuses.FAILED,
+        statuses.EXPIRED,
+        statuses.ABANDONED,
+        statuses.CANCELED,
+    ]
+)
+
+
+def compile_state_machine_data(data):
+    # Compile the state machine data into a list indexed by the code of the current status.
+    # Each entry is a list of the new status indexed by the code of the event or None if
+    # there is no transition. The entry is None if the current status cannot transition.
+    table = [None] * len(STATUS_CODES)
+
+    for status, transitions in data.items():
+        table[STATUS_CODES[status]] = [None] * len(EVENT_CODES)
+
+        for event_name, new_status in transitions.items():
+            table[STATUS_CODES[status]][EVENT_CODES[event_name]] = new_status
+
+    return table
+
+
+def compile_state_machine_targets(data):
+    # Compile the set of new statuses that each current status can transition to.
+    table = [None] * len(STATUS_CODES)
+
+    for status, transitions in data.items():
+        table[STATUS_CODES[status]] = frozenset(transitions.values())
+
+    return table
+
+
+TASK_STATE_MACHINE_TABLE = compile_state_machine_data(TASK_STATE_MACHINE_DATA)
+
+TASK_STATE_MACHINE_TARGETS = compile_state_machine_targets(TASK_STATE_MACHINE_DATA)
+
+WORKFLOW_STATE_MACHINE_TABLE = compile_state_machine_data(WORKFLOW_STATE_MACHINE_DATA)
+
+WORKFLOW_STATE_MACHINE_TARGETS = compile_state_machine_targets(WORKFLOW_STATE_MACHINE_DATA)
+
 
-        if new_status is None:
-            new_status = "null"
+def get_transitions(table, status):
+    status_code = STATUS_CODES.get(status)
 
-        if not statuses.is_valid(old_status):
-            raise exc.InvalidStatus(old_status)
+    return table[status_code] if status_code is not None else None
 
-        if not statuses.is_valid(new_status):
-            raise exc.InvalidStatus(new_status)
 
-        if old_status not in TASK_STATE_MACHINE_DATA.keys():
-            return False
+def get_transition(transitions, event_name):
+    event_code = EVENT_CODES.get(event_name)
 
-        if old_status == new_status or new_status in TASK_STATE_MACHINE_DATA[old_status].values():
-            return True
+    return transitions[event_code] if event_code is not None else None
 
+
+def is_transition_valid(table, old_status, new_status):
+    if old_status is None:
+        old_status = statuses.UNSET
+
+    if new_status is None:
+        new_status = statuses.UNSET
+
+    if not statuses.is_valid(old_status):
+        raise exc.InvalidStatus(old_status)
+
+    if not statuses.is_valid(new_status):
+        raise exc.InvalidStatus(new_status)
+
+    targets = get_transitions(table, old_status)
+
+    if targets is None:
         return False
 
+    return old_status == new_status or new_status in targets
+
+
+class TaskStateMachine(object):
+    @classmethod
+    def is_transition_valid(cls, old_status, new_status):
+        return is_transition_valid(TASK_STATE_MACHINE_TARGETS, old_status, new_status)
+
     @classmethod
     def add_context_to_action_event(cls, workflow_state, task_id, task_route, ac_ex_event):
         return ac_ex_event.name
@@ -480,7 +570,7 @@ class TaskStateMachine(object):
     @classmethod
     def process_action_event(cls, workflow_state, task_state, ac_ex_event):
         # Check if event is valid.
-        if ac_ex_event.name not in events.ACTION_EXECUTION_EVENTS + events.ENGINE_OPERATION_EVENTS:
+        if ac_ex_event.name not in ACTION_EVENTS_SET:
             raise exc.InvalidEvent(ac_ex_event.name)
 
         # Append additional task context to the event.
@@ -488,55 +578,28 @@ class TaskStateMachine(object):
             workflow_state, task_state["id"], task_state["route"], ac_ex_event
         )
 
-        # Identify current task status.
-        current_task_status = task_state.get("status", statuses.UNSET)
-
-        if current_task_status is None:
-            current_task_status = statuses.UNSET
-
-        if current_task_status not in statuses.ALL_STATUSES:
-            raise exc.InvalidStatus(current_task_status)
-
-        if current_task_status not in TASK_STATE_MACHINE_DATA:
-            raise exc.InvalidTaskStatusTransition(current_task_status, event_name)
-
-        # If no transition is identified, then there is no status change.
-        if event_name not in TASK_STATE_MACHINE_DATA[current_task_status]:
-            return
-
-        new_task_status = TASK_STATE_MACHINE_DATA[current_task_status][event_name]
-
-        # Assign new status to the task flow entry.
-        task_state["status"] = new_task_status
+        cls.process_task_status_transition(task_state, event_name)
 
     @classmethod
     def add_context_to_task_item_event(cls, workflow_state, task_id, task_route, ac_ex_event):
         action_event = ac_ex_event.name
 
-        requirements = [
-            statuses.RESUMING,
-            statuses.PENDING,
-            statuses.PAUSED,
-            statuses.SUCCEEDED,
-            statuses.FAILED,
-            statuses.EXPIRED,
-            statuses.ABANDONED,
-            statuses.CANCELED,
-        ]
-
-        if ac_ex_event.status in requirements:
-            # Make a copy of the items and remove current item under evaluation.
+        if ac_ex_event.status in TASK_ITEM_EVENT_STATUSES_SET:
+            # Identify the status of the items other than the current item under evaluation.
             staged_task = workflow_state.get_staged_task(task_id, task_route)
-            items = json_util.deepcopy(staged_task["items"])
-            del items[ac_ex_event.item_id]
-            items_status = [item.get("status", statuses.UNSET) for item in items]
+
+            items_status = set(
+                item.get("status", statuses.UNSET)
+                for i, item in enumerate(staged_task["items"])
+                if i != ac_ex_event.item_id
+            )
 
             # Assess various situations.
-            active = list(filter(lambda x: x in statuses.ACTIVE_STATUSES, items_status))
-            incomplete = list(filter(lambda x: x not in statuses.COMPLETED_STATUSES, items_status))
-            paused = list(filter(lambda x: x in [statuses.PENDING, statuses.PAUSED], items_status))
-            canceled = list(filter(lambda x: x == statuses.CANCELED, items_status))
-            failed = list(filter(lambda x: x in statuses.ABENDED_STATUSES, items_status))
+            active = not items_status.isdisjoint(statuses.ACTIVE_STATUSES_SET)
+            incomplete = not items_status.issubset(statuses.COMPLETED_STATUSES_SET)
+            paused = statuses.PENDING in items_status or statuses.PAUSED in items_status
+            canceled = statuses.CANCELED in items_status
+            failed = not items_status.isdisjoint(statuses.ABENDED_STATUSES_SET)
 
             # Attach info on whether task is still active or dormant.
             action_event += "_task_active" if active else "_task_dormant"
@@ -562,7 +625,7 @@ class TaskStateMachine(object):
     @classmethod
     def process_task_item_event(cls, workflow_state, task_state, ac_ex_event):
         # Check if event is valid.
-        if ac_ex_event.name not in events.ACTION_EXECUTION_EVENTS + events.ENGINE_OPERATION_EVENTS:
+        if ac_ex_event.name not in ACTION_EVENTS_SET:
             raise exc.InvalidEvent(ac_ex_event.name)
 
         # Append additional task context to the event.
@@ -570,37 +633,24 @@ class TaskStateMachine(object):
             workflow_state, task_state["id"], task_state["route"], ac_ex_event
         )
 
-        # Identify current task status.
-        current_task_status = task_state.get("status", statuses.UNSET)
-
-        if current_task_status is None:
-            current_task_status = statuses.UNSET
-
-        if current_task_status not in statuses.ALL_STATUSES:
-            raise exc.InvalidStatus(current_task_status)
-
-        if current_task_status not in TASK_STATE_MACHINE_DATA:
-            raise exc.InvalidTaskStatusTransition(current_task_status, event_name)
-
-        # If no transition is identified, then there is no status change.
-        if event_name not in TASK_STATE_MACHINE_DATA[current_task_status]:
-            return
-
-        new_task_status = TASK_STATE_MACHINE_DATA[current_task_status][event_name]
-
-        # Assign new status to the task flow entry.
-        task_state["status"] = new_task_status
+        cls.process_task_status_transition(task_state, event_name)
 
     @classmethod
     def add_context_to_workflow_event(cls, workflow_state, task_id, task_route, wf_ex_event):
         workflow_event = wf_ex_event.name
-        requirements = statuses.PAUSE_STATUSES + statuses.CANCEL_STATUSES
+
+        if (
+            wf_ex_event.status not in statuses.PAUSE_STATUSES_SET
+            and wf_ex_event.status not in statuses.CANCEL_STATUSES_SET
+        ):
+            return workflow_event
+
         staged_task = workflow_state.get_staged_task(task_id, task_route)
 
-        if wf_ex_event.status in requirements and staged_task and "items" in staged_task:
-            items_status = [item.get("status", statuses.UNSET) for item in staged_task["items"]]
-            active = list(filter(lambda x: x in statuses.ACTIVE_STATUSES, items_status))
-            incomplete = list(filter(lambda x: x not in statuses.COMPLETED_STATUSES, items_status))
+        if staged_task and "items" in staged_task:
+            items_status = set(item.get("status", statuses.UNSET) for item in staged_task["items"])
+            active = not items_status.isdisjoint(statuses.ACTIVE_STATUSES_SET)
+            incomplete = not items_status.issubset(statuses.COMPLETED_STATUSES_SET)
             workflow_event += "_task_active" if active else "_task_dormant"
             workflow_event += "_items_incomplete" if incomplete else "_items_completed"
 
@@ -609,7 +659,7 @@ class TaskStateMachine(object):
     @classmethod
     def process_workflow_event(cls, workflow_state, task_state, wf_ex_event):
         # Check if event is valid.
-        if wf_ex_event.name not in events.WORKFLOW_EXECUTION_EVENTS:
+        if wf_ex_event.name not in WORKFLOW_EVENTS_SET:
             raise exc.InvalidEvent(wf_ex_event.name)
 
         # Append additional task context to the event.
@@ -617,24 +667,30 @@ class TaskStateMachine(object):
             workflow_state, task_state["id"], task_state["route"], wf_ex_event
         )
 
+        cls.process_task_status_transition(task_state, event_name)
+
+    @classmethod
+    def process_task_status_transition(cls, task_state, event_name):
         # Identify current task status.
         current_task_status = task_state.get("status", statuses.UNSET)
 
         if current_task_status is None:
             current_task_status = statuses.UNSET
 
-        if current_task_status not in statuses.ALL_STATUSES:
-            raise exc.InvalidStatus(current_task_status)
+        transitions = get_transitions(TASK_STATE_MACHINE_TABLE, current_task_status)
+
+        if transitions is None:
+            if current_task_status not in statuses.ALL_STATUSES:
+                raise exc.InvalidStatus(current_task_status)
 
-        if current_task_status not in TASK_STATE_MACHINE_DATA:
             raise exc.InvalidTaskStatusTransition(current_task_status, event_name)
 
+        new_task_status = get_transition(transitions, event_name)
+
         # If no transition is identified, then there is no status change.
-        if event_name not in TASK_STATE_MACHINE_DATA[current_task_status]:
+        if new_task_status is None:
             return
 
-        new_task_status = TASK_STATE_MACHINE_DATA[current_task_status][event_name]
-
         # Assign new status to the task flow entry.
         task_state["status"] = new_task_status
 
@@ -662,48 +718,48 @@ class TaskStateMachine(object):
 class WorkflowStateMachine(object):
     @classmethod
     def is_transition_valid(cls, old_status, new_status):
-        if old_status is None:
-            old_status = "null"
-
-        if new_status is None:
-            new_status = "null"
-
-        if not statuses.is_valid(old_status):
-            raise exc.InvalidStatus(old_status)
+        return is_transition_valid(WORKFLOW_STATE_MACHINE_TARGETS, old_status, new_status)
 
-        if not statuses.is_valid(new_status):
-            raise exc.InvalidStatus(new_status)
-
-        if old_status not in WORKFLOW_STATE_MACHINE_DATA.keys():
-            return False
-
-        if (
-            old_status == new_status
-            or new_status in WORKFLOW_STATE_MACHINE_DATA[old_status].values()
-        ):
-            return True
-
-        return False
+    @classmethod
+    def get_workflow_situation(cls, workflow_state):
+        # Assess the workflow situation by querying the workflow state. The conductor
+        # computes the situation in a single pass and passes it to the state machine.
+        return {
+            "has_active_tasks": workflow_state.has_active_tasks,
+            "has_staged_tasks": workflow_state.has_staged_tasks,
+            "has_pausing_tasks": workflow_state.has_pausing_tasks,
+            "has_paused_tasks": workflow_state.has_paused_tasks,
+            "has_canceling_tasks": workflow_state.has_canceling_tasks,
+            "has_canceled_tasks": workflow_state.has_canceled_tasks,
+        }
 
     @classmethod
-    def add_context_to_task_event(cls, workflow_state, tk_ex_event):
+    def add_context_to_task_event(cls, workflow_state, tk_ex_event, situation=None):
         # Identify current workflow status.
         task_event = tk_ex_event.name
-        task_id = getattr(tk_ex_event, "task_id", None)
-        task_route = getattr(tk_ex_event, "route", None)
-        has_barrier_next = workflow_state.has_barrier_next(task_id, task_route)
-        has_next_tasks = workflow_state.has_next_tasks(task_id, task_route)
-        has_active_tasks = workflow_state.has_active_tasks
+
+        if situation is None:
+            task_id = getattr(tk_ex_event, "task_id", None)
+            task_route = getattr(tk_ex_event, "route", None)
+            situation = cls.get_workflow_situation(workflow_state)
+            situation["has_barrier_next"] = workflow_state.has_barrier_next(task_id, task_route)
+            situation["has_next_tasks"] = workflow_state.has_next_tasks(task_id, task_route)
+
+        has_barrier_next = situation["has_barrier_next"]
+        has_next_tasks = situation["has_next_tasks"]
+        has_active_tasks = situation["has_active_tasks"]
 
         # Mark task remediated if task is in abended statuses and there are transitions.
-        if tk_ex_event.status in statuses.ABENDED_STATUSES and (has_next_tasks or has_barrier_next):
+        if tk_ex_event.status in statuses.ABENDED_STATUSES_SET and (
+            has_next_tasks or has_barrier_next
+        ):
             task_event = events.TASK_REMEDIATED
 
         # For certain events like cancel and pause, whether there are tasks in active
         # status determine whether the workflow reached final status or still in progress.
         # For example, if the workflow is being canceled and there are other active
         # tasks, the workflow should be set to canceling.
-        if task_event in events.TASK_CONDITIONAL_EVENTS:
+        if task_event in TASK_CONDITIONAL_EVENTS_SET:
             task_event += "_workflow_active" if has_active_tasks else "_workflow_dormant"
 
         # When a task succeeded, additional information need to be included in the
@@ -716,41 +772,41 @@ class WorkflowStateMachine(object):
         ):
             return task_event
 
-        if workflow_state.has_canceling_tasks or workflow_state.has_canceled_tasks:
+        if situation["has_canceling_tasks"] or situation["has_canceled_tasks"]:
             return task_event + "_canceled"
 
-        if workflow_state.has_pausing_tasks or workflow_state.has_paused_tasks:
+        if situation["has_pausing_tasks"] or situation["has_paused_tasks"]:
             return task_event + "_paused"
 
-        if workflow_state.has_staged_tasks or has_next_tasks:
+        if situation["has_staged_tasks"] or has_next_tasks:
             return task_event + "_incomplete"
 
         return task_event + "_completed"
 
     @classmethod
-    def process_task_event(cls, workflow_state, tk_ex_event):
+    def process_task_event(cls, workflow_state, tk_ex_event, situation=None):
         # Append additional workflow context to the event.
-        event_name = cls.add_context_to_task_event(workflow_state, tk_ex_event)
+        event_name = cls.add_context_to_task_event(workflow_state, tk_ex_event, situation)
 
         # Check if event is valid.
-        if event_name not in events.TASK_EXECUTION_EVENTS:
+        if event_name not in TASK_EVENTS_SET:
             raise exc.InvalidEvent(event_name)
 
         # Capture current workflow status.
         current_workflow_status = workflow_state.status
-        new_workflow_status = current_workflow_status
+        transitions = get_transitions(WORKFLOW_STATE_MACHINE_TABLE, current_workflow_status)
 
         # Check if the current workflow status can be transitioned.
-        if current_workflow_status not in WORKFLOW_STATE_MACHINE_DATA:
+        if transitions is None:
             raise exc.InvalidWorkflowStatusTransition(current_workflow_status, event_name)
 
+        new_workflow_status = get_transition(transitions, event_name)
+
         # If the current workflow status can be transitioned and there is no match on the
         # event, then there is not status transition.
-        if event_name not in WORKFLOW_STATE_MACHINE_DATA[current_workflow_status]:
+        if new_workflow_status is None:
             return
 
-        new_workflow_status = WORKFLOW_STATE_MACHINE_DATA[current_workflow_status][event_name]
-
         # Assign new workflow status if there is change.
         if current_workflow_status != new_workflow_status:
             workflow_state.status = new_workflow_status
@@ -759,7 +815,7 @@ class WorkflowStateMachine(object):
         # barrier task(s). A barrier task is unreachable if the workflow is completed but then one
         # or more criteria for the task is satisified. In this case, log the task and fail the
         # workflow to notify that the execution is incomplete but unable to proceed.
-        if workflow_state.status in statuses.COMPLETED_STATUSES:
+        if workflow_state.status in statuses.COMPLETED_STATUSES_SET:
             unreachable_barriers = workflow_state.get_unreachable_barriers()
 
             # If there are unreachable barrier tasks, then change workflow status to failed
@@ -772,66 +828,73 @@ class WorkflowStateMachine(object):
                     workflow_state.conductor.log_error(e, task_id=entry["id"], route=entry["route"])
 
     @classmethod
-    def add_context_to_workflow_event(cls, workflow_state, wf_ex_event):
+    def add_context_to_workflow_event(cls, workflow_state, wf_ex_event, situation=None):
         # Identify current workflow status.
         workflow_event = wf_ex_event.name
-        has_active_tasks = workflow_state.has_active_tasks
+
+        if situation is None:
+            situation = cls.get_workflow_situation(workflow_state)
+
+        has_active_tasks = situation["has_active_tasks"]
 
         # For certain events like cancel and pause, whether there are tasks in active
         # status determine whether the workflow reached final status or still in progress.
         # For example, if the workflow is being canceled and there are other active
         # tasks, the workflow should be set to canceling.
-        if wf_ex_event.status in statuses.PAUSE_STATUSES + statuses.CANCEL_STATUSES:
+        if (
+            wf_ex_event.status in statuses.PAUSE_STATUSES_SET
+            or wf_ex_event.status in statuses.CANCEL_STATUSES_SET
+        ):
             workflow_event += "_workflow_active" if has_active_tasks else "_workflow_dormant"
 
         # If the workflow is paused and on resume, check whether it is already completed.
         if (
             workflow_state.status == statuses.PAUSED
             and wf_ex_event.status in [statuses.RUNNING, statuses.RESUMING]
-            and not workflow_state.has_active_tasks
-            and not workflow_state.has_staged_tasks
-            and not workflow_state.has_paused_tasks
+            and not has_active_tasks
+            and not situation["has_staged_tasks"]
+            and not situation["has_paused_tasks"]
         ):
             workflow_event += "_workflow_completed"
 
         return workflow_event
 
     @classmethod
-    def process_workflow_event(cls, workflow_state, wf_ex_event):
+    def process_workflow_event(cls, workflow_state, wf_ex_event, situation=None):
         # Append additional workflow context to the event.
-        event_name = cls.add_context_to_workflow_event(workflow_state, wf_ex_event)
+        event_name = cls.add_context_to_workflow_event(workflow_state, wf_ex_event, situation)
 
         # Check if event is valid.
-        if event_name not in events.WORKFLOW_EXECUTION_EVENTS:
+        if event_name not in WORKFLOW_EVENTS_SET:
             raise exc.InvalidEvent(event_name)
 
         # Capture current workflow status.
         current_workflow_status = workflow_state.status
-        new_workflow_status = current_workflow_status
+        transitions = get_transitions(WORKFLOW_STATE_MACHINE_TABLE, current_workflow_status)
 
         # Check if the current workflow status can be transitioned.
-        if current_workflow_status not in WORKFLOW_STATE_MACHINE_DATA:
+        if transitions is None:
             raise exc.InvalidWorkflowStatusTransition(current_workflow_status, event_name)
 
+        new_workflow_status = get_transition(transitions, event_name)
+
         # If the current workflow status can be transitioned and there is no match on the
         # event, then there is not status transition.
-        if event_name not in WORKFLOW_STATE_MACHINE_DATA[current_workflow_status]:
+        if new_workflow_status is None:
             return
 
-        new_workflow_status = WORKFLOW_STATE_MACHINE_DATA[current_workflow_status][event_name]
-
         # Assign new workflow status if there is change.
         if current_workflow_status != new_workflow_status:
             workflow_state.status = new_workflow_status
 
     @classmethod
-    def process_event(cls, workflow_state, event):
+    def process_event(cls, workflow_state, event, situation=None):
         if isinstance(event, events.WorkflowExecutionEvent):
-            cls.process_workflow_event(workflow_state, event)
+            cls.process_workflow_event(workflow_state, event, situation=situation)
             return
 
         if isinstance(event, events.TaskExecutionEvent):
-            cls.process_task_event(workflow_state, event)
+            cls.process_task_event(workflow_state, event, situation=situation)
             return
 
         raise exc.InvalidEventType(type(event), event.name)
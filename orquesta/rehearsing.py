@@ -31,11 +31,20 @@ from orquesta.specs.native.v1 import base as native_v1_specs
 from orquesta.specs import types as spec_types
 from orquesta import statuses
 from orquesta.tests.fixtures import loader as fixture_loader
+from orquesta.utils import specs as spec_util
+from orquesta.utils import yml as yaml_util
 
 LOG = logging.getLogger(__name__)
 
+# The results of mock action executions in a fixture file are kept as lazily loaded references.
+MOCK_RESULT_LAZY_PATHS = [("mock_action_executions", "*", "result")]
 
-def load_test_spec(fixture=None, fixture_path=None, base_path=None):
+
+def read_result_file(f):
+    return f.read()
+
+
+def load_test_spec(fixture=None, fixture_path=None, base_path=None, max_size=None):
     if not fixture and not fixture_path:
         raise ValueError("Workflow test spec is not provided.")
 
@@ -53,7 +62,9 @@ def load_test_spec(fixture=None, fixture_path=None, base_path=None):
     if fixture_path:
         fixture_path = "%s/%s" % (base_path, fixture_path) if base_path else fixture_path
         with open(fixture_path, "r") as f:
-            fixture = yaml.safe_load(f)
+            fixture = yaml_util.safe_load_stream(
+                f, max_size=max_size, lazy_paths=MOCK_RESULT_LAZY_PATHS
+            )
 
     if not isinstance(fixture, dict):
         raise ValueError("Unable to convert workflow test case into dict.")
@@ -66,10 +77,22 @@ def load_test_spec(fixture=None, fixture_path=None, base_path=None):
             if "result_path" in ac_ex and not ac_ex["result_path"].startswith("/"):
                 ac_ex["result_path"] = "%s/%s" % (base_path, ac_ex["result_path"])
 
+    # Replace the lazy results with a placeholder so the spec is validated without loading
+    # them. The results are loaded on access and when the test spec is serialized.
+    lazy_results = {}
+
+    for i, ac_ex in enumerate(fixture.get("mock_action_executions") or []):
+        if isinstance(ac_ex, dict) and isinstance(ac_ex.get("result"), yaml_util.LazyValue):
+            lazy_results[i] = ac_ex["result"]
+            ac_ex["result"] = None
+
     test_spec = (
         WorkflowRerunTestCase(fixture) if "workflow_state" in fixture else WorkflowTestCase(fixture)
     )
 
+    for i, result in six.iteritems(lazy_results):
+        test_spec.mock_action_executions[i].result = result
+
     test_spec.inspect(raise_exception=True)
 
     return WorkflowRehearsal(test_spec)
@@ -156,6 +179,22 @@ class MockActionExecution(native_v1_specs.Spec):
 
         self.iter_pos = self.iter_id - 1
 
+    # The result is loaded on each access if it is a lazily loaded reference.
+    @property
+    def result(self):
+        result = self.__dict__.get("_result", self.spec.get("result"))
+
+        return result.load() if isinstance(result, yaml_util.LazyValue) else result
+
+    @result.setter
+    def result(self, value):
+        self._result = value
+
+    def has_lazy_result(self):
+        return "result" in self.spec and isinstance(
+            self.__dict__.get("_result"), yaml_util.LazyValue
+        )
+
 
 class MockActionExecutionSequenceSpec(native_v1_specs.SequenceSpec):
     _schema = {"type": "array", "items": MockActionExecution, "default": []}
@@ -180,6 +219,21 @@ class WorkflowTestCaseMixin(object):
 
         return ac_exs[0] if len(ac_exs) > 0 else None
 
+    def serialize_lazy_results(self, value):
+        # Load the lazy results of the mock action executions into the serialized spec in
+        # place of the placeholders without modifying the spec.
+        ac_exs = getattr(self, "mock_action_executions", None) or []
+
+        if not any(x.has_lazy_result() for x in ac_exs):
+            return value
+
+        value["spec"] = dict(value["spec"])
+        value["spec"]["mock_action_executions"] = [
+            dict(x.spec, result=x.result) if x.has_lazy_result() else x.spec for x in ac_exs
+        ]
+
+        return value
+
 
 class WorkflowTestCase(native_v1_specs.Spec, WorkflowTestCaseMixin):
     _schema = {
@@ -218,6 +272,9 @@ class WorkflowTestCase(native_v1_specs.Spec, WorkflowTestCaseMixin):
         if not getattr(self, "expected_workflow_status", None):
             self.expected_workflow_status = statuses.SUCCEEDED
 
+    def serialize(self):
+        return self.serialize_lazy_results(super(WorkflowTestCase, self).serialize())
+
 
 class WorkflowRerunTestCase(native_v1_specs.Spec, WorkflowTestCaseMixin):
     _schema = {
@@ -249,6 +306,9 @@ class WorkflowRerunTestCase(native_v1_specs.Spec, WorkflowTestCaseMixin):
         if not getattr(self, "expected_workflow_status", None):
             self.expected_workflow_status = statuses.SUCCEEDED
 
+    def serialize(self):
+        return self.serialize_lazy_results(super(WorkflowRerunTestCase, self).serialize())
+
 
 class WorkflowRehearsal(unittest.TestCase):
     def __init__(self, session, *args, **kwargs):
@@ -270,7 +330,9 @@ class WorkflowRehearsal(unittest.TestCase):
 
         if isinstance(session, WorkflowTestCase):
             self.spec_module = spec_loader.get_spec_module(session.spec_module_name)
-            self.wf_spec = self.spec_module.instantiate(self.session.wf_def)
+            self.wf_spec = spec_util.instantiate_workflow_spec(
+                session.spec_module_name, session.wf_def
+            )
             self.conductor = None
         elif isinstance(session, WorkflowRerunTestCase):
             self.conductor = self.session.conductor
@@ -296,13 +358,8 @@ class WorkflowRehearsal(unittest.TestCase):
                 raise exc.WorkflowRehearsalError(msg % mock_ac_ex.result_path)
 
             name, ext = os.path.splitext(mock_ac_ex.result_path)
-
-            with open(mock_ac_ex.result_path) as f:
-                mock_ac_ex.result = (
-                    fixture_loader.FIXTURE_EXTS[ext](f)
-                    if ext in fixture_loader.FIXTURE_EXTS
-                    else f.read()
-                )
+            loader = fixture_loader.FIXTURE_EXTS.get(ext, read_result_file)
+            mock_ac_ex.result = yaml_util.LazyValue(mock_ac_ex.result_path, loader=loader)
 
     def runTest(self):
         """Override runTest
@@ -422,12 +479,14 @@ class WorkflowRehearsal(unittest.TestCase):
                         placeholders = [None] * (ac_ex.item_id - len_accum_result + 1)
                         items_task_accum_result[current_task_id].extend(placeholders)
 
-                    items_task_accum_result[current_task_id][ac_ex.item_id] = ac_ex.result
+                    # Load the result once since it may be a lazily loaded reference.
+                    ac_ex_result = ac_ex.result
+                    items_task_accum_result[current_task_id][ac_ex.item_id] = ac_ex_result
 
                     ac_ex_event = events.TaskItemActionExecutionEvent(
                         ac_ex.item_id,
                         ac_ex.status,
-                        result=ac_ex.result,
+                        result=ac_ex_result,
                         accumulated_result=items_task_accum_result[current_task_id],
                     )
 
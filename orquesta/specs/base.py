@@ -14,18 +14,20 @@
 # limitations under the License.
 
 import collections
+import copy
 import inspect
 import json
-import jsonschema
 import logging
 import re
 import six
+import threading
 
 from orquesta import exceptions as exc
 from orquesta.expressions import base as expr_base
 from orquesta.specs import types as spec_types
 from orquesta.utils import expression as expr_util
 from orquesta.utils import parameters as args_util
+from orquesta.utils import plugin as plugin_util
 from orquesta.utils import schema as schema_util
 from orquesta.utils import strings as str_util
 from orquesta.utils import yml as yaml_util
@@ -34,10 +36,53 @@ from orquesta.utils import yml as yaml_util
 LOG = logging.getLogger(__name__)
 
 
+# The schemas are resolved once per spec class and then shared as read only views.
+_SCHEMA_CACHE = {}
+
+# The spec properties that the attributes resolve to are identified once per spec class.
+_ATTRIBUTE_CACHE = {}
+
+# The schema validators are built once per spec class from the resolved schema. The validators
+# are shared across threads since the schemas have no references to resolve during validation.
+_VALIDATOR_CACHE = {}
+_VALIDATOR_CACHE_LOCK = threading.Lock()
+
+
 def isspec(value):
     return inspect.isclass(value) and issubclass(value, Spec)
 
 
+def reset_schema_cache():
+    _SCHEMA_CACHE.clear()
+    _ATTRIBUTE_CACHE.clear()
+
+    with _VALIDATOR_CACHE_LOCK:
+        _VALIDATOR_CACHE.clear()
+
+
+# The schemas include the patterns of the expressions so they are resolved again on reset.
+plugin_util.register_reset_hook(reset_schema_cache)
+
+
+def _get_cached_schema(key, build_schema):
+    schema = _SCHEMA_CACHE.get(key)
+
+    if schema is None:
+        schema = schema_util.freeze_schema(build_schema())
+        _SCHEMA_CACHE[key] = schema
+
+    return schema
+
+
+def _get_path_str(path):
+    items = []
+
+    for s in path:
+        items.append("[%s]" % s if isinstance(s, int) else "." + s if items else s)
+
+    return "".join(items) or None
+
+
 class Spec(object):
     _catalog = None
 
@@ -55,7 +100,8 @@ class Spec(object):
         },
     }
 
-    _schema_validator = None
+    # The errors from the last inspection of the spec.
+    _inspection_errors = None
 
     # Put the name of the spec properties in the order of validation.
     _context_evaluation_sequence = []
@@ -63,10 +109,12 @@ class Spec(object):
     # Put the name of the spec properties that are inputs for the context.
     _context_inputs = []
 
-    def getattr_default(self, name, meta=False):
-        properties = (
-            self._meta_schema.get("properties", {}) if meta else self._schema.get("properties", {})
+    @classmethod
+    def getattr_default(cls, name, meta=False):
+        schema = (
+            cls.get_meta_schema() if meta else cls.get_schema(includes=None, resolve_specs=False)
         )
+        properties = schema.get("properties", {})
 
         attr = properties.get(name, {})
 
@@ -80,28 +128,66 @@ class Spec(object):
     # this case, the attribute does not physically exist on the class and so __getattr__
     # is called which it is overridden here to access the spec dict.
     def __getattr__(self, name):
-        # Retrieve from spec if attribute is a meta schema property.
-        if name in self._meta_schema.get("properties", {}):
-            return self.spec.get(name, self.getattr_default(name, meta=True))
+        attributes, patterns = _ATTRIBUTE_CACHE.get(type(self)) or self.get_attribute_table()
 
-        if name.replace("_", "-") in self._meta_schema.get("properties", {}):
-            return self.spec.get(name.replace("_", "-"), self.getattr_default(name, meta=True))
+        # Retrieve from spec if attribute is a meta schema or schema property.
+        if name in attributes:
+            prop_name, default = attributes[name]
+            value = self.spec.get(prop_name, default)
 
-        # Retrieve from spec if attribute is a schema property.
-        if name in self._schema.get("properties", {}):
-            return self.spec.get(name, self.getattr_default(name))
+            # The default is shared with the schema so return a copy if the default is mutable.
+            if value is default and isinstance(default, (dict, list)):
+                return copy.deepcopy(default)
 
-        if name.replace("_", "-") in self._schema.get("properties", {}):
-            return self.spec.get(name.replace("_", "-"), self.getattr_default(name))
+            return value
+
+        if name.replace("_", "-") in attributes:
+            return self.spec.get(attributes[name.replace("_", "-")][0], None)
 
         # Retrieve from spec if attribute match a regex pattern in the schema.
-        for pattern in self._schema.get("patternProperties", {}).keys():
-            if re.match(pattern, name):
+        for pattern in patterns:
+            if pattern.match(name):
                 return self.spec.get(name)
 
         # Use default for all other attributes.
         return self.__getattribute__(name)
 
+    @classmethod
+    def get_attribute_table(cls):
+        table = _ATTRIBUTE_CACHE.get(cls)
+
+        if table is None:
+            table = cls._get_attribute_table()
+            _ATTRIBUTE_CACHE[cls] = table
+
+        return table
+
+    @classmethod
+    def _get_attribute_table(cls):
+        # Map the name of the attribute to the spec property and the default value. The
+        # properties are added in reverse order of precedence so the meta schema properties
+        # take precedence over the schema properties and the exact match of the property name
+        # takes precedence over the property name with dashes replaced by underscores.
+        attributes = {}
+        schema = cls.get_schema(includes=None, resolve_specs=False)
+        meta_schema = cls.get_meta_schema()
+
+        for meta, properties in [
+            (False, schema.get("properties", {})),
+            (True, meta_schema.get("properties", {})),
+        ]:
+            for prop_name in properties:
+                if "_" not in prop_name:
+                    attr_name = prop_name.replace("-", "_")
+                    attributes[attr_name] = (prop_name, cls.getattr_default(attr_name, meta=meta))
+
+            for prop_name in properties:
+                attributes[prop_name] = (prop_name, cls.getattr_default(prop_name, meta=meta))
+
+        patterns = [re.compile(p) for p in schema.get("patternProperties", {}).keys()]
+
+        return attributes, patterns
+
     def __init__(self, spec, name=None, member=False):
         """jsonSchema specifications
 
@@ -134,11 +220,7 @@ class Spec(object):
 
         self.member = member
 
-        schema = (
-            self._schema
-            if member
-            else schema_util.merge_schema(self.get_meta_schema(), self._schema)
-        )
+        schema = self._schema if member else self.get_spec_schema()
 
         # Process attributes defined under properties in the schema.
         property_specs = {k: v for k, v in six.iteritems(schema.get("properties", {})) if isspec(v)}
@@ -158,7 +240,8 @@ class Spec(object):
                     setattr(self, name, spec_cls(value, member=True))
 
     def copy(self):
-        return self.deserialize(self.serialize())
+        # The raw spec is copied so the copy does not share any nested dict with the original.
+        return self.deserialize(copy.deepcopy(self.serialize()))
 
     def serialize(self):
         value = {"catalog": self.get_catalog(), "version": self.get_version(), "spec": self.spec}
@@ -191,13 +274,54 @@ class Spec(object):
 
     @classmethod
     def get_schema_validator(cls):
-        if not cls._schema_validator:
-            cls._schema_validator = jsonschema.Draft4Validator(cls.get_schema())
+        # The validator is cached by class and not as a class attribute which would be
+        # inherited by the subclasses that have a different schema.
+        validator = _VALIDATOR_CACHE.get(cls)
+
+        if validator is None:
+            with _VALIDATOR_CACHE_LOCK:
+                validator = _VALIDATOR_CACHE.get(cls)
+
+                if validator is None:
+                    import jsonschema
 
-        return cls._schema_validator
+                    validator = jsonschema.Draft4Validator(cls.get_schema())
+                    _VALIDATOR_CACHE[cls] = validator
+
+        return validator
+
+    @classmethod
+    def is_valid_syntax(cls, spec):
+        # Check the spec against the schema and stop at the first error. This is cheaper than
+        # instantiating and inspecting the spec when only a pass or fail is needed.
+        if not isinstance(spec, dict) and not isinstance(spec, list):
+            try:
+                spec = yaml_util.safe_load(spec)
+            except ValueError:
+                return False
+
+        # The spec that does not load into a dict or list is not valid as in the constructor.
+        if not isinstance(spec, dict) and not isinstance(spec, list):
+            return False
+
+        return cls.get_schema_validator().is_valid(spec)
+
+    @classmethod
+    def get_spec_schema(cls):
+        # Return the schema and meta schema merged with the schema taking precedence.
+        def build_schema():
+            return schema_util.merge_schema(
+                cls.get_meta_schema(), cls.get_schema(includes=None, resolve_specs=False)
+            )
+
+        return _get_cached_schema((cls, "spec"), build_schema)
 
     @classmethod
     def get_meta_schema(cls):
+        return _get_cached_schema((cls, "meta"), cls._get_meta_schema)
+
+    @classmethod
+    def _get_meta_schema(cls):
         meta_schema = {}
 
         bases = [b for b in cls.__bases__ if issubclass(b, Spec)]
@@ -210,6 +334,15 @@ class Spec(object):
 
     @classmethod
     def get_schema(cls, includes=["meta"], resolve_specs=True):
+        includes = tuple(sorted(includes)) if includes else None
+
+        def build_schema():
+            return cls._get_schema(includes=includes, resolve_specs=resolve_specs)
+
+        return _get_cached_schema((cls, "schema", includes, resolve_specs), build_schema)
+
+    @classmethod
+    def _get_schema(cls, includes=None, resolve_specs=True):
         schema = {}
 
         bases = [b for b in cls.__bases__ if issubclass(b, Spec)]
@@ -242,8 +375,11 @@ class Spec(object):
 
         if inspect.isclass(items_schema) and issubclass(items_schema, Spec):
             schema["items"] = items_schema.get_schema(includes=None)
-        elif isinstance(items_schema, dict):
-            for k, v in six.iteritems(items_schema.get("properties", {})):
+        elif isinstance(items_schema, dict) and "properties" in items_schema:
+            # The items schema may be shared with the class so copy before resolving the specs.
+            schema["items"] = copy.deepcopy(items_schema)
+
+            for k, v in six.iteritems(items_schema["properties"]):
                 if inspect.isclass(v) and issubclass(v, Spec):
                     schema_properties = schema["items"]["properties"]
                     schema_properties[k] = v.get_schema(includes=None)
@@ -260,7 +396,7 @@ class Spec(object):
             else "properties." + prop_name
         )
 
-    def inspect(self, app_ctx=None, raise_exception=False):
+    def inspect(self, app_ctx=None, raise_exception=False, previous=None):
         if app_ctx and not isinstance(app_ctx, dict):
             raise TypeError("Application context is not type of dict.")
 
@@ -270,57 +406,43 @@ class Spec(object):
         def sort_errors(e):
             return (e["schema_path"], e["spec_path"])
 
-        syntax_errors = sorted(self.inspect_syntax(), key=sort_errors)
-
-        if syntax_errors:
-            errors["syntax"] = syntax_errors
-
-        semantic_errors = sorted(self.inspect_semantics(), key=sort_errors)
-
-        if semantic_errors:
-            errors["semantics"] = semantic_errors
-
-        expr_errors = sorted(self.inspect_expressions(), key=sort_errors)
-
-        if expr_errors:
-            errors["expressions"] = expr_errors
-
         if app_ctx:
             app_ctx_metadata = {"ctx": app_ctx.keys(), "spec_path": ".", "schema_path": "."}
 
-        ctx_errors, _ = self.inspect_context(parent=app_ctx_metadata)
-        ctx_errors = sorted(ctx_errors, key=sort_errors)
+        inspections = self.get_inspections(parent=app_ctx_metadata, previous=previous)
+
+        for category, inspection in inspections:
+            result = sorted(inspection(), key=sort_errors)
 
-        if ctx_errors:
-            errors["context"] = ctx_errors
+            if result:
+                errors[category] = result
+
+        # Keep the result so the spec can be used as the previous spec for an incremental
+        # inspection of a changed spec.
+        self._inspection_errors = errors
 
         if errors and raise_exception:
             raise exc.WorkflowInspectionError(errors)
 
         return errors
 
+    def get_inspections(self, parent=None, previous=None):
+        return [
+            ("syntax", self.inspect_syntax),
+            ("semantics", self.inspect_semantics),
+            ("expressions", self.inspect_expressions),
+            ("context", lambda: self.inspect_context(parent=parent)[0]),
+        ]
+
     def inspect_syntax(self):
         result = []
         validator = self.get_schema_validator()
 
         for e in validator.iter_errors(self.spec):
-            spec_path = ""
-            schema_path = ""
-
-            for s in list(e.absolute_path):
-                spec_path += (
-                    "[" + str(s) + "]" if isinstance(s, int) else "." + s if spec_path else s
-                )
-
-            for s in list(e.absolute_schema_path):
-                schema_path += (
-                    "[" + str(s) + "]" if isinstance(s, int) else "." + s if schema_path else s
-                )
-
             entry = {
                 "message": str_util.unescape(e.message),
-                "spec_path": spec_path or None,
-                "schema_path": schema_path or None,
+                "spec_path": _get_path_str(e.absolute_path),
+                "schema_path": _get_path_str(e.absolute_schema_path),
             }
 
             result.append(entry)
@@ -588,7 +710,7 @@ class MappingSpec(Spec):
     def copy(self):
         name = self.name if "name" not in self.spec and hasattr(self, "name") else None
 
-        return self.__class__(self.spec.copy(), name=name, member=self.member)
+        return self.__class__(copy.deepcopy(self.spec), name=name, member=self.member)
 
     def keys(self):
         return self.spec.keys()
@@ -617,11 +739,7 @@ class SequenceSpec(Spec, collections.MutableSequence):
     def __init__(self, spec, name=None, member=False):
         super(SequenceSpec, self).__init__(spec, name=name, member=member)
 
-        schema = (
-            self._schema
-            if member
-            else schema_util.merge_schema(self.get_meta_schema(), self._schema)
-        )
+        schema = self._schema if member else self.get_spec_schema()
 
         if schema.get("type") != "array":
             raise exc.SchemaDefinitionError("The schema for SequenceSpec must be type of array.")
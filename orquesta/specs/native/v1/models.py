@@ -14,11 +14,13 @@
 # limitations under the License.
 
 import logging
+import re
 import six
 from six.moves import queue
 
 from orquesta import events
 from orquesta import exceptions as exc
+from orquesta import graphing
 from orquesta.expressions import base as expr_base
 from orquesta.specs.native.v1 import base as native_v1_specs
 from orquesta.specs import types as spec_types
@@ -26,6 +28,7 @@ from orquesta.utils import context as ctx_util
 from orquesta.utils import dictionary as dict_util
 from orquesta.utils import jsonify as json_util
 from orquesta.utils import parameters as args_util
+from orquesta.utils import plugin as plugin_util
 from orquesta.utils import yml as yaml_util
 
 
@@ -33,6 +36,9 @@ LOG = logging.getLogger(__name__)
 
 RESERVED_TASK_NAMES = list(events.ENGINE_EVENT_MAP.keys())
 
+# Identify the name of the task from the spec path of an inspection error.
+TASK_SPEC_PATH_REGEX = re.compile(r"^tasks\.([^.\[]+)")
+
 
 def instantiate(definition):
     return WorkflowSpec(definition)
@@ -76,26 +82,41 @@ class TaskTransitionSequenceSpec(native_v1_specs.SequenceSpec):
 
 
 class ItemizedSpec(native_v1_specs.Spec):
-    _items_regex = (
+    # The regex and the schema include the patterns of the expressions and are built on first
+    # use so the expression evaluators are not loaded on import.
+    @expr_base.LazyClassAttribute
+    def _items_regex(cls):
         # Regular expression in the form "x, y, z, ... in <expression>"
         # or "x in <expression>" with optional space(s) on both end.
-        r"^(\s+)?({expr})(\s+)?$|^(\s+)?((\w+,\s?|\s+)+)?(\w+)\s+in\s+({expr})(\s+)?$".format(
-            expr="|".join(expr_base.get_statement_regexes().values())
+        return (
+            r"^(\s+)?({expr})(\s+)?$|^(\s+)?((\w+,\s?|\s+)+)?(\w+)\s+in\s+({expr})(\s+)?$".format(
+                expr="|".join(expr_base.get_statement_regexes().values())
+            )
         )
-    )
 
-    _schema = {
-        "type": "object",
-        "properties": {
-            "items": {"type": "string", "minLength": 1, "pattern": _items_regex},
-            "concurrency": spec_types.STRING_OR_POSITIVE_INTEGER,
-        },
-        "additionalProperties": False,
-    }
+    @expr_base.LazyClassAttribute
+    def _schema(cls):
+        return {
+            "type": "object",
+            "properties": {
+                "items": {"type": "string", "minLength": 1, "pattern": cls._items_regex},
+                "concurrency": spec_types.STRING_OR_POSITIVE_INTEGER,
+            },
+            "additionalProperties": False,
+        }
 
     _context_evaluation_sequence = ["items", "concurrency"]
 
 
+def reset_itemized_spec():
+    # Build the regex and the schema again with the expression evaluators that are registered.
+    for attr in ["_items_regex", "_schema"]:
+        ItemizedSpec.__dict__[attr].reset()
+
+
+plugin_util.register_reset_hook(reset_itemized_spec)
+
+
 class TaskRetrySpec(native_v1_specs.Spec):
     _schema = {
         "type": "object",
@@ -234,6 +255,24 @@ class TaskSpec(native_v1_specs.Spec):
 class TaskMappingSpec(native_v1_specs.MappingSpec):
     _schema = {"type": "object", "minProperties": 1, "patternProperties": {r"^\w+$": TaskSpec}}
 
+    def __init__(self, spec, name=None, member=False):
+        # The index of the task transitions is built on first use and then cached.
+        self._transitions_index = None
+
+        # The results of the context inspection are kept for each task and keyed by the context
+        # that flows into the task so the results can be reused on incremental inspection.
+        self._context_inspections = {}
+
+        super(TaskMappingSpec, self).__init__(spec, name=name, member=member)
+
+    def __setattr__(self, name, value):
+        super(TaskMappingSpec, self).__setattr__(name, value)
+
+        # Reset the index of the task transitions if a task spec is set or replaced.
+        if name not in ["_transitions_index", "_context_inspections"]:
+            super(TaskMappingSpec, self).__setattr__("_transitions_index", None)
+            super(TaskMappingSpec, self).__setattr__("_context_inspections", {})
+
     def has_tasks(self):
         return len(self.keys()) > 0
 
@@ -249,7 +288,54 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
 
         return self[task_name]
 
+    def _get_transitions_index(self):
+        if self._transitions_index is not None:
+            return self._transitions_index
+
+        next_tasks = {}
+        prev_tasks = {}
+        transitions = {}
+
+        # Identify the next and previous tasks for each task in a single pass.
+        for task_name in self.keys():
+            next_tasks[task_name] = self._get_next_tasks(task_name)
+            transitions[task_name] = []
+
+            for next_task_name, condition, task_transition_item_idx in next_tasks[task_name]:
+                prev_task = (task_name, condition, task_transition_item_idx)
+                prev_tasks.setdefault(next_task_name, []).append(prev_task)
+                transitions[task_name].append(next_task_name)
+
+        for next_task_name in prev_tasks.keys():
+            prev_tasks[next_task_name] = sorted(prev_tasks[next_task_name], key=lambda x: x[0])
+
+        # A task is in a cycle if it is in a strongly connected component with other tasks
+        # or if it transitions to itself.
+        cycle_members = graphing.get_cycle_members(transitions)
+
+        start_tasks = sorted(
+            [(task_name, None, None) for task_name in self.keys() if task_name not in prev_tasks],
+            key=lambda x: x[0],
+        )
+
+        self._transitions_index = {
+            "next": next_tasks,
+            "prev": prev_tasks,
+            "start": start_tasks,
+            "cycle": frozenset(cycle_members),
+        }
+
+        return self._transitions_index
+
     def get_next_tasks(self, task_name, *args, **kwargs):
+        next_tasks = self._get_transitions_index()["next"].get(task_name)
+
+        if next_tasks is None:
+            return self._get_next_tasks(task_name)
+
+        return list(next_tasks)
+
+    def _get_next_tasks(self, task_name):
         task_spec = self.get_task(task_name)
 
         next_tasks = []
@@ -269,23 +355,10 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
         return sorted(next_tasks, key=lambda x: x[0])
 
     def get_prev_tasks(self, task_name, *args, **kwargs):
-        prev_tasks = []
-
-        for name, task_spec in six.iteritems(self):
-            for next_task in self.get_next_tasks(name):
-                if task_name == next_task[0]:
-                    prev_tasks.append((name, next_task[1], next_task[2]))
-
-        return sorted(prev_tasks, key=lambda x: x[0])
+        return list(self._get_transitions_index()["prev"].get(task_name, []))
 
     def get_start_tasks(self):
-        start_tasks = [
-            (task_name, None, None)
-            for task_name in self.keys()
-            if not self.get_prev_tasks(task_name)
-        ]
-
-        return sorted(start_tasks, key=lambda x: x[0])
+        return list(self._get_transitions_index()["start"])
 
     def is_join_task(self, task_name):
         task_spec = self.get_task(task_name)
@@ -296,38 +369,10 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
         return not self.is_join_task(task_name) and len(self.get_prev_tasks(task_name)) > 1
 
     def in_cycle(self, task_name):
-        traversed = []
-        q = queue.Queue()
-
-        for task in self.get_next_tasks(task_name):
-            q.put(task[0])
-
-        while not q.empty():
-            next_task_name = q.get()
-
-            # If the next task matches the original task, then it's in a loop.
-            if next_task_name == task_name:
-                return True
-
-            # If the next task has already been traversed but didn't match the
-            # original task, then there's a loop but the original task is not
-            # in the loop.
-            if next_task_name in traversed:
-                continue
-
-            for task in self.get_next_tasks(next_task_name):
-                q.put(task[0])
-
-            traversed.append(next_task_name)
-
-        return False
+        return task_name in self._get_transitions_index()["cycle"]
 
     def has_cycles(self):
-        for task_name, task_spec in six.iteritems(self):
-            if self.in_cycle(task_name):
-                return True
-
-        return False
+        return len(self._get_transitions_index()["cycle"]) > 0
 
     def detect_actionless_with_items(self, parent=None):
         result = []
@@ -384,8 +429,13 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
         traversed = []
         q = queue.Queue()
 
+        # Keep track of the tasks that are already queued so each task is only traversed once.
+        queued = set()
+
         for task in self.get_start_tasks():
-            q.put(task[0])
+            if task[0] not in queued:
+                q.put(task[0])
+                queued.add(task[0])
 
         while not q.empty():
             task_name = q.get()
@@ -412,8 +462,12 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
                         continue
 
                     if self.has_task(next_task_name):
-                        if next_task_name not in RESERVED_TASK_NAMES + traversed:
+                        if (
+                            next_task_name not in RESERVED_TASK_NAMES
+                            and next_task_name not in queued
+                        ):
                             q.put(next_task_name)
+                            queued.add(next_task_name)
                     else:
                         entry = {
                             "message": 'The task "%s" is not defined.' % next_task_name,
@@ -470,8 +524,8 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
                     # Keep track of splits for task and its next task combination,
                     # if superset is already added to queue, then no need to add again.
                     split_id = task_name + "_" + next_task_name
-                    existing_splits = track_splits.get(split_id, set())
-                    if existing_splits:
+                    existing_splits = track_splits.get(split_id)
+                    if existing_splits is not None:
                         new_splits = set(splits)
                         if not new_splits.issubset(existing_splits):
                             q.put((task_name, next_task_name, list(splits)))
@@ -543,7 +597,7 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
             schema_path = parent.get("schema_path") + ".patternProperties.^\\w+$"
             task_parent = {"ctx": task_ctx, "spec_path": spec_path, "schema_path": schema_path}
 
-            result = task_spec.inspect_context(parent=task_parent)
+            result = self._inspect_task_context(task_name, None, task_spec, task_parent)
             errors.extend(result[0])
             task_ctx = list(set(task_ctx + result[1]))
             rolling_ctx = list(set(rolling_ctx + task_ctx))
@@ -578,7 +632,10 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
                     "schema_path": schema_path + ".properties.next.items",
                 }
 
-                result = task_transition_spec.inspect_context(parent_ctx)
+                result = self._inspect_task_context(
+                    task_name, seq_num, task_transition_spec, parent_ctx
+                )
+
                 errors.extend(result[0])
                 branch_ctx = list(set(task_ctx + result[1]))
 
@@ -600,6 +657,24 @@ class TaskMappingSpec(native_v1_specs.MappingSpec):
 
         return (errors, rolling_ctx)
 
+    def _inspect_task_context(self, task_name, seq_num, spec, parent):
+        key = (seq_num, parent["spec_path"], parent["schema_path"], frozenset(parent["ctx"]))
+        results = self._context_inspections.setdefault(task_name, {})
+
+        if key not in results:
+            results[key] = spec.inspect_context(parent=parent)
+
+        errors, ctx = results[key]
+
+        return json_util.deepcopy(errors), list(ctx)
+
+    def reuse_context_inspections(self, previous, task_names):
+        # Reuse the results of the context inspection from the previous spec for the given tasks.
+        for task_name in task_names:
+            if task_name in previous._context_inspections:
+                results = self._context_inspections.setdefault(task_name, {})
+                results.update(previous._context_inspections[task_name])
+
 
 class WorkflowSpec(native_v1_specs.Spec):
     _schema = {
@@ -636,6 +711,72 @@ class WorkflowSpec(native_v1_specs.Spec):
 
         super(WorkflowSpec, self).__init__(spec, name=name, member=member)
 
+    def get_changed_tasks(self, previous):
+        # Incremental inspection requires the previous spec to be inspected and the tasks in both
+        # specs to be defined. Otherwise, return None and the spec is inspected in full.
+        if not isinstance(previous, WorkflowSpec) or previous._inspection_errors is None:
+            return None
+
+        tasks = self.spec.get("tasks")
+        prev_tasks = previous.spec.get("tasks")
+
+        if not tasks or not isinstance(tasks, dict):
+            return None
+
+        if not prev_tasks or not isinstance(prev_tasks, dict):
+            return None
+
+        return set(
+            task_name
+            for task_name, task_spec in six.iteritems(tasks)
+            if task_name not in prev_tasks or prev_tasks[task_name] != task_spec
+        )
+
+    def get_inspections(self, parent=None, previous=None):
+        inspections = super(WorkflowSpec, self).get_inspections(parent=parent)
+        changed_tasks = self.get_changed_tasks(previous)
+
+        if changed_tasks is None:
+            return inspections
+
+        tasks = self.spec["tasks"]
+        unchanged_tasks = set(tasks.keys()) - changed_tasks
+
+        # Inspect a reduced copy of the spec with only the changed tasks. If no task is changed,
+        # keep one of the tasks in the copy so the tasks in the spec are not reported as missing.
+        reduced_tasks = changed_tasks or set(sorted(unchanged_tasks)[:1])
+        reduced_spec = dict(self.spec, tasks={k: tasks[k] for k in reduced_tasks})
+        reduced_spec = self.__class__(reduced_spec, name=self.name, member=self.member)
+
+        def is_unchanged_task_error(error):
+            match = TASK_SPEC_PATH_REGEX.match(error.get("spec_path") or "")
+            return match is not None and match.group(1) in unchanged_tasks
+
+        def merge_errors(category, errors):
+            prev_errors = previous._inspection_errors.get(category, [])
+            result = [e for e in errors if not is_unchanged_task_error(e)]
+            result.extend(
+                json_util.deepcopy([e for e in prev_errors if is_unchanged_task_error(e)])
+            )
+            return result
+
+        # The context of the unchanged tasks is inspected again only if the context that flows
+        # into the task is different from the previous inspection. The reserved task names are
+        # always resolved to the same task spec and are also reused.
+        reused_tasks = unchanged_tasks.union(RESERVED_TASK_NAMES)
+        self.tasks.reuse_context_inspections(previous.tasks, reused_tasks)
+
+        # The semantics and the context depend on the graph of the tasks and are not merged.
+        return [
+            ("syntax", lambda: merge_errors("syntax", reduced_spec.inspect_syntax())),
+            ("semantics", self.inspect_semantics),
+            (
+                "expressions",
+                lambda: merge_errors("expressions", reduced_spec.inspect_expressions()),
+            ),
+            ("context", lambda: self.inspect_context(parent=parent)[0]),
+        ]
+
     def render_input(self, runtime_inputs, in_ctx=None):
         rolling_ctx = json_util.deepcopy(in_ctx) if in_ctx else {}
         errors = []
@@ -64,5 +64,17 @@ ABENDED_STATUSES = [FAILED, EXPIRED, ABANDONED]
 COMPLETED_STATUSES = [SUCCEEDED, FAILED, EXPIRED, ABANDONED, CANCELED]
 
 
+# Sets of the status groups above for constant time membership check.
+ACTIVE_STATUSES_SET = frozenset(ACTIVE_STATUSES)
+
+PAUSE_STATUSES_SET = frozenset(PAUSE_STATUSES)
+
+CANCEL_STATUSES_SET = frozenset(CANCEL_STATUSES)
+
+ABENDED_STATUSES_SET = frozenset(ABENDED_STATUSES)
+
+COMPLETED_STATUSES_SET = frozenset(COMPLETED_STATUSES)
+
+
 def is_valid(status):
     return status is None or status in ALL_STATUSES
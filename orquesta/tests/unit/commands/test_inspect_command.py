@@ -0,0 +1,164 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import mock
+import os
+import six
+import tempfile
+import unittest
+from xml.etree import ElementTree
+
+from orquesta.commands import inspection
+from orquesta.specs import native as native_specs
+from orquesta.tests.fixtures import loader as fixture_loader
+
+
+WF_FIXTURES_PATH = os.path.join(fixture_loader.get_workflow_fixtures_base_path(), "native")
+
+
+def get_args(paths, processes=1, output=None, format="json"):
+    return argparse.Namespace(
+        paths=paths,
+        catalog="native",
+        processes=processes,
+        format=format,
+        output=output,
+        debug=False,
+    )
+
+
+class WorkflowInspectCommandTest(unittest.TestCase):
+    def get_wf_file_path(self, wf_name):
+        return os.path.join(WF_FIXTURES_PATH, wf_name + ".yaml")
+
+    def run_inspect(self, paths, processes=1, format="json"):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+
+        args = get_args(paths, processes=processes, output=path, format=format)
+
+        with mock.patch.object(argparse.ArgumentParser, "parse_args", return_value=args):
+            exit_code = inspection.inspect()
+
+        with open(path, "r") as f:
+            output = f.read()
+
+        os.remove(path)
+
+        return exit_code, output
+
+    def test_get_workflow_files(self):
+        files = inspection.get_workflow_files([WF_FIXTURES_PATH, "/path/does/not/exist"])
+
+        self.assertEqual(len(files), len(os.listdir(WF_FIXTURES_PATH)) + 1)
+        self.assertListEqual(files[:-1], sorted(files[:-1]))
+        self.assertEqual(files[0], self.get_wf_file_path("branching"))
+        self.assertEqual(files[-1], "/path/does/not/exist")
+
+    def test_inspect_passed(self):
+        exit_code, output = self.run_inspect([self.get_wf_file_path("sequential")])
+        report = json.loads(output)
+
+        self.assertEqual(exit_code, inspection.EXIT_OK)
+        self.assertEqual(report["summary"]["files"], 1)
+        self.assertEqual(report["summary"]["passed"], 1)
+        self.assertEqual(report["files"][0]["status"], inspection.RESULT_PASSED)
+        self.assertIn("duration", report["files"][0])
+
+    def test_inspect_failed(self):
+        fd, path = tempfile.mkstemp(suffix=".yaml")
+
+        with os.fdopen(fd, "w") as tmp:
+            tmp.write("version: 1.0\ntasks:\n  task1:\n    action: core.noop\n    next:\n")
+            tmp.write("      - do: task2\n")
+
+        exit_code, output = self.run_inspect([path, self.get_wf_file_path("sequential")])
+        report = json.loads(output)
+        os.remove(path)
+
+        self.assertEqual(exit_code, inspection.EXIT_INSPECTION_ERRORS)
+        self.assertEqual(report["summary"]["failed"], 1)
+        self.assertEqual(report["files"][0]["status"], inspection.RESULT_FAILED)
+        self.assertListEqual(list(report["files"][0]["errors"].keys()), ["semantics"])
+        self.assertEqual(report["files"][1]["status"], inspection.RESULT_PASSED)
+
+    def test_inspect_load_error(self):
+        exit_code, output = self.run_inspect(
+            ["/path/does/not/exist.yaml", self.get_wf_file_path("sequential")]
+        )
+
+        report = json.loads(output)
+
+        self.assertEqual(exit_code, inspection.EXIT_LOAD_ERRORS)
+        self.assertEqual(report["summary"]["error"], 1)
+        self.assertEqual(report["files"][0]["status"], inspection.RESULT_ERROR)
+
+        self.assertEqual(
+            report["files"][0]["message"],
+            'The workflow definition "/path/does/not/exist.yaml" does not exist.',
+        )
+
+    def test_inspect_no_files(self):
+        path = tempfile.mkdtemp()
+        exit_code, output = self.run_inspect([path])
+        report = json.loads(output)
+        os.rmdir(path)
+
+        self.assertEqual(exit_code, inspection.EXIT_LOAD_ERRORS)
+        self.assertEqual(report["summary"]["files"], 0)
+        self.assertListEqual(report["files"], [])
+
+    def test_inspect_with_process_pool(self):
+        exit_code, output = self.run_inspect([WF_FIXTURES_PATH], processes=4)
+        report = json.loads(output)
+        files = inspection.get_workflow_files([WF_FIXTURES_PATH])
+
+        self.assertListEqual([r["path"] for r in report["files"]], files)
+
+        # The result from the worker processes is the same as inspecting the workflows inline.
+        for result in report["files"]:
+            with open(result["path"], "r") as f:
+                wf_spec = native_specs.WorkflowSpec(f.read())
+
+            self.assertDictEqual(result.get("errors", {}), wf_spec.inspect())
+
+        failed = [r for r in report["files"] if r["status"] == inspection.RESULT_FAILED]
+        expected_exit_code = inspection.EXIT_INSPECTION_ERRORS if failed else inspection.EXIT_OK
+        self.assertEqual(exit_code, expected_exit_code)
+
+    def test_inspect_junit_report(self):
+        paths = [
+            "/path/does/not/%sxist.yaml" % six.unichr(233),
+            self.get_wf_file_path("sequential"),
+        ]
+        exit_code, output = self.run_inspect(paths, format="junit")
+        suite = ElementTree.fromstring(output)
+
+        # The report is text and the non ascii characters are encoded as character references.
+        self.assertIsInstance(output, six.text_type)
+        self.assertIn("&#233;xist.yaml", output)
+
+        self.assertEqual(exit_code, inspection.EXIT_LOAD_ERRORS)
+        self.assertEqual(suite.tag, "testsuite")
+        self.assertEqual(suite.get("tests"), "2")
+        self.assertEqual(suite.get("errors"), "1")
+        self.assertEqual(suite.get("failures"), "0")
+
+        cases = suite.findall("testcase")
+        self.assertListEqual([c.get("name") for c in cases], paths)
+        self.assertIsNotNone(cases[0].find("error"))
+        self.assertIsNone(cases[1].find("error"))
+        self.assertIsNotNone(cases[1].get("time"))
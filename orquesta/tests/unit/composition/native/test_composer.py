@@ -12,7 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+
+from orquesta.composers import base as comp_base
 from orquesta.composers import native as native_comp
+from orquesta import conducting
+from orquesta import exceptions as exc
+from orquesta.specs import native as native_specs
+from orquesta import statuses
 from orquesta.tests.unit.composition.native import base as native_comp_test_base
 from orquesta.utils import plugin as plugin_util
 
@@ -23,3 +30,146 @@ class WorkflowComposerTest(native_comp_test_base.OrchestraWorkflowComposerTest):
             plugin_util.get_module("orquesta.composers", self.spec_module_name),
             native_comp.WorkflowComposer,
         )
+
+    def test_compose_large_workflow(self):
+        # Generate a workflow with a long chain of splits and joins and a loop at the end.
+        num_segments = 125
+        tasks = {"task0": {"action": "core.noop"}}
+        prev_task_name = "task0"
+
+        for i in range(1, num_segments + 1):
+            a, b, m = "a" + str(i), "b" + str(i), "m" + str(i)
+            tasks[prev_task_name]["next"] = [{"when": "<% succeeded() %>", "do": [a, b]}]
+            tasks[a] = {"action": "core.noop", "next": [{"do": m}]}
+            tasks[b] = {"action": "core.noop", "next": [{"do": m}]}
+            tasks[m] = {"action": "core.noop"}
+
+            if i % 2 == 0:
+                tasks[m]["join"] = "all"
+
+            prev_task_name = m
+
+        tasks[prev_task_name]["next"] = [{"when": "<% failed() %>", "do": a}]
+
+        wf_spec = native_specs.WorkflowSpec({"version": 1.0, "tasks": tasks})
+        self.assertEqual(len(wf_spec.tasks.keys()), num_segments * 3 + 1)
+
+        comp_base.GRAPH_CACHE.clear()
+
+        with mock.patch.object(
+            native_specs.TaskMappingSpec,
+            "get_next_tasks",
+            side_effect=native_specs.TaskMappingSpec.get_next_tasks,
+            autospec=True,
+        ) as get_next_tasks:
+            wf_graph = self.composer.compose(wf_spec)
+
+        # The composition visits each task once and is linear in the number of tasks.
+        self.assertEqual(get_next_tasks.call_count, len(tasks))
+
+        self.assertEqual(len(wf_graph.serialize()["nodes"]), num_segments * 3 + 1)
+        self.assertTrue(wf_graph.in_cycle(a))
+        self.assertFalse(wf_graph.in_cycle("a1"))
+        self.assertEqual(wf_graph.get_barrier("m2"), "*")
+        self.assertIsNone(wf_graph.get_barrier("m1"))
+        self.assertListEqual(wf_graph.get_task("m1")["splits"], ["m1"])
+        self.assertListEqual(wf_graph.get_task("b2")["splits"], ["m1"])
+        self.assertNotIn("splits", wf_graph.get_task("b1"))
+
+    def test_compose_join_chain(self):
+        # Generate a workflow with a long chain of joins where each join has no splits.
+        num_segments = 50
+        tasks = {"task0": {"action": "core.noop"}}
+        prev_task_name = "task0"
+
+        for i in range(1, num_segments + 1):
+            a, b, m = "a" + str(i), "b" + str(i), "m" + str(i)
+            tasks[prev_task_name]["next"] = [{"do": [a, b]}]
+            tasks[a] = {"action": "core.noop", "next": [{"do": m}]}
+            tasks[b] = {"action": "core.noop", "next": [{"do": m}]}
+            tasks[m] = {"action": "core.noop", "join": "all"}
+            prev_task_name = m
+
+        wf_spec = native_specs.WorkflowSpec({"version": 1.0, "tasks": tasks})
+
+        with mock.patch.object(
+            native_specs.TaskMappingSpec,
+            "get_next_tasks",
+            side_effect=native_specs.TaskMappingSpec.get_next_tasks,
+            autospec=True,
+        ) as get_next_tasks:
+            wf_graph = native_comp.WorkflowComposer._compose_wf_graph(wf_spec)
+
+        # Each join is visited once and not once for each path into the join.
+        self.assertEqual(get_next_tasks.call_count, len(tasks))
+        self.assertEqual(len(wf_graph.serialize()["nodes"]), len(tasks))
+        self.assertEqual(wf_graph.get_barrier(prev_task_name), "*")
+        self.assertNotIn("splits", wf_graph.get_task(prev_task_name))
+
+    def test_get_graph_with_mixed_key_types(self):
+        comp_base.GRAPH_CACHE.clear()
+
+        wf_def = """
+        version: 1.0
+        vars:
+          - m: {1: one, a: two}
+        tasks:
+          task1:
+            action: core.noop
+        """
+
+        # The mappings with keys of mixed types are digested and keys of different types
+        # with the same string value have different digests.
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+        other_wf_spec = native_specs.WorkflowSpec(wf_def.replace("1: one", "'1': one"))
+        self.assertNotEqual(
+            comp_base.get_spec_digest(wf_spec), comp_base.get_spec_digest(other_wf_spec)
+        )
+
+        conductor = conducting.WorkflowConductor(wf_spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.assertEqual(conductor.get_workflow_status(), statuses.RUNNING)
+        self.assertEqual(len(comp_base.GRAPH_CACHE), 1)
+
+        # The graph is composed without caching if the digest cannot be computed.
+        with mock.patch.object(comp_base, "get_spec_digest", side_effect=TypeError("foobar")):
+            wf_graph = self.composer.get_graph(wf_spec)
+
+        self.assertTrue(wf_graph.frozen)
+        self.assertListEqual(list(wf_graph.serialize()["nodes"]), [{"id": "task1"}])
+        self.assertEqual(comp_base.GRAPH_CACHE.get_stats()["misses"], 1)
+
+    def test_get_graph_from_cache(self):
+        comp_base.GRAPH_CACHE.clear()
+
+        # The spec digest is the same for the same definition in YAML and dict.
+        wf_def = self.get_wf_def("sequential", raw=True)
+        wf_spec_1 = native_specs.WorkflowSpec(wf_def)
+        wf_spec_2 = native_specs.WorkflowSpec(self.get_wf_def("sequential"))
+        self.assertEqual(comp_base.get_spec_digest(wf_spec_1), comp_base.get_spec_digest(wf_spec_2))
+
+        conductor_1 = conducting.WorkflowConductor(wf_spec_1)
+        conductor_2 = conducting.WorkflowConductor(wf_spec_2)
+        self.assertIs(conductor_1.graph, conductor_2.graph)
+
+        expected_stats = {"hits": 1, "misses": 1, "evictions": 0, "size": 1, "max_size": 128}
+        self.assertDictEqual(comp_base.GRAPH_CACHE.get_stats(), expected_stats)
+
+        # The cached graph is frozen and is the same as the composed graph.
+        wf_graph = conductor_1.graph
+        self.assertTrue(wf_graph.frozen)
+        self.assertDictEqual(wf_graph.serialize(), self.composer.compose(wf_spec_1).serialize())
+        self.assertRaises(exc.WorkflowGraphIsFrozenError, wf_graph.add_task, "task4")
+        self.assertRaises(exc.WorkflowGraphIsFrozenError, wf_graph.update_task, "task1", foo=1)
+
+        # The serialized graph does not share attribute values with the cached graph.
+        wf_graph.serialize()["adjacency"][0][0]["criteria"].append("foobar")
+        self.assertNotIn("foobar", wf_graph.get_next_transitions("task1")[0][3]["criteria"])
+
+        # A different definition is composed separately.
+        wf_spec_3 = native_specs.WorkflowSpec(self.get_wf_def("parallel"))
+        self.assertIsNot(self.composer.get_graph(wf_spec_3), wf_graph)
+        self.assertEqual(comp_base.GRAPH_CACHE.get_stats()["misses"], 2)
+
+        comp_base.GRAPH_CACHE.clear()
+        self.assertEqual(len(comp_base.GRAPH_CACHE), 0)
@@ -302,6 +302,21 @@ class WorkflowConductorTest(test_base.WorkflowConductorTest):
         self.assertEqual(len(conductor.workflow_state.tasks), 5)
         self.assertEqual(len(conductor.workflow_state.sequence), 5)
 
+    def test_serialization_with_compact_graph(self):
+        conductor = self._prep_conductor(status=statuses.RUNNING)
+        self.forward_task_statuses(conductor, "task1", [statuses.RUNNING, statuses.SUCCEEDED])
+
+        data = conductor.serialize(compact=True)
+        self.assertDictEqual(data["graph"], conductor.graph.serialize(compact=True))
+
+        # Deserialize and check the conductor continues from the same state.
+        conductor = conducting.WorkflowConductor.deserialize(data)
+
+        self.assertDictEqual(conductor.serialize(compact=True), data)
+        expected_wf_graph = conductor.composer.compose(conductor.spec).serialize()
+        self.assertDictEqual(conductor.graph.serialize(), expected_wf_graph)
+        self.assert_next_task(conductor, "task2", {"a": None, "b": False, "c": "xyz"})
+
     def test_get_workflow_initial_context(self):
         conductor = self._prep_conductor()
         expected_init_ctx = {"a": None, "b": False}
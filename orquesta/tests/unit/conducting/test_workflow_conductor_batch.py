@@ -0,0 +1,175 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from orquesta import conducting
+from orquesta import events
+from orquesta import exceptions as exc
+from orquesta import machines
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class WorkflowConductorBatchTest(test_base.WorkflowConductorTest):
+    def _prep_conductor(self, num_branches):
+        wf_def = {"tasks": {"init": {"action": "core.noop", "next": [{"do": []}]}}}
+
+        for i in range(1, num_branches + 1):
+            task_name = "t" + str(i)
+            wf_def["tasks"]["init"]["next"][0]["do"].append(task_name)
+            wf_def["tasks"][task_name] = {
+                "action": "core.noop",
+                "next": [{"when": "<% succeeded() %>", "do": "join"}],
+            }
+
+        wf_def["tasks"]["join"] = {"join": "all", "action": "core.noop"}
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, "init", [statuses.RUNNING, statuses.SUCCEEDED])
+
+        for i in range(1, num_branches + 1):
+            self.forward_task_statuses(conductor, "t" + str(i), [statuses.RUNNING])
+
+        return conductor
+
+    def _make_events(self, task_statuses):
+        return [
+            (task_id, 0, events.ActionExecutionEvent(status)) for task_id, status in task_statuses
+        ]
+
+    def assert_batch_equal(self, conductor, task_statuses):
+        batch_conductor = conducting.WorkflowConductor.deserialize(conductor.serialize())
+        task_state_entries = batch_conductor.update_task_states(self._make_events(task_statuses))
+
+        for task_id, route, event in self._make_events(task_statuses):
+            conductor.update_task_state(task_id, route, event)
+
+        self.assertEqual(len(task_state_entries), len(task_statuses))
+        self.assertDictEqual(batch_conductor.serialize(), conductor.serialize())
+        self.assert_task_list(
+            conductor, batch_conductor.get_next_tasks(), conductor.get_next_tasks()
+        )
+
+        return batch_conductor
+
+    def test_update_task_states_empty(self):
+        conductor = self._prep_conductor(2)
+        expected_state = conductor.serialize()
+
+        self.assertListEqual(conductor.update_task_states([]), [])
+        self.assertDictEqual(conductor.serialize(), expected_state)
+
+    def test_update_task_states_join(self):
+        num_branches = 50
+        conductor = self._prep_conductor(num_branches)
+
+        task_statuses = [("t" + str(i), statuses.SUCCEEDED) for i in range(1, num_branches + 1)]
+        conductor = self.assert_batch_equal(conductor, task_statuses)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.RUNNING)
+        self.assert_next_task(conductor, "join", {})
+
+    def test_update_task_states_join_partial(self):
+        num_branches = 10
+        conductor = self._prep_conductor(num_branches)
+
+        task_statuses = [("t" + str(i), statuses.SUCCEEDED) for i in range(1, num_branches)]
+        conductor = self.assert_batch_equal(conductor, task_statuses)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.RUNNING)
+        self.assert_next_task(conductor, has_next_task=False)
+
+    def test_update_task_states_completes_workflow(self):
+        num_branches = 10
+        conductor = self._prep_conductor(num_branches)
+
+        task_statuses = [("t" + str(i), statuses.SUCCEEDED) for i in range(1, num_branches + 1)]
+        task_statuses += [("join", statuses.RUNNING), ("join", statuses.SUCCEEDED)]
+        conductor = self.assert_batch_equal(conductor, task_statuses)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+    def test_update_task_states_with_failure(self):
+        num_branches = 10
+        conductor = self._prep_conductor(num_branches)
+
+        task_statuses = [("t" + str(i), statuses.SUCCEEDED) for i in range(1, num_branches + 1)]
+        task_statuses[3] = ("t4", statuses.FAILED)
+        conductor = self.assert_batch_equal(conductor, task_statuses)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+
+    def test_update_task_states_with_pause(self):
+        num_branches = 10
+        conductor = self._prep_conductor(num_branches)
+
+        task_statuses = [("t" + str(i), statuses.SUCCEEDED) for i in range(1, num_branches)]
+        task_statuses.insert(3, ("t" + str(num_branches), statuses.PAUSED))
+        conductor = self.assert_batch_equal(conductor, task_statuses)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.PAUSED)
+
+    def test_update_task_states_with_workflow_canceling(self):
+        num_branches = 10
+        conductor = self._prep_conductor(num_branches)
+        conductor.request_workflow_status(statuses.CANCELING)
+
+        task_statuses = [("t" + str(i), statuses.SUCCEEDED) for i in range(1, num_branches + 1)]
+        conductor = self.assert_batch_equal(conductor, task_statuses)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.CANCELED)
+
+    def test_update_task_states_with_bad_event(self):
+        conductor = self._prep_conductor(2)
+
+        task_events = self._make_events([("t1", statuses.SUCCEEDED), ("foobar", statuses.RUNNING)])
+        self.assertRaises(exc.InvalidTask, conductor.update_task_states, task_events)
+
+        # The batch is reset and the workflow state machine is evaluated for each event.
+        self.forward_task_statuses(conductor, "t2", [statuses.SUCCEEDED])
+        self.assertEqual(conductor.get_workflow_status(), statuses.RUNNING)
+        self.assert_next_task(conductor, "join", {})
+
+    def test_update_task_states_with_bad_last_event(self):
+        conductor = self._prep_conductor(3)
+        expected_conductor = conducting.WorkflowConductor.deserialize(conductor.serialize())
+
+        task_statuses = [("t1", statuses.SUCCEEDED), ("t2", statuses.SUCCEEDED)]
+        task_events = self._make_events(task_statuses)
+        task_events.append(("t3", 0, statuses.SUCCEEDED))
+
+        for task_id, route, event in task_events[0:2]:
+            expected_conductor.update_task_state(task_id, route, event)
+
+        process_event = machines.WorkflowStateMachine.process_event
+
+        with mock.patch.object(
+            machines.WorkflowStateMachine, "process_event", side_effect=process_event
+        ) as mock_process_event:
+            self.assertRaises(TypeError, conductor.update_task_states, task_events)
+
+        # The workflow state machine is evaluated for the deferred events when the batch fails.
+        processed_events = [
+            (c[0][1].task_id, c[0][1].status) for c in mock_process_event.call_args_list
+        ]
+
+        self.assertListEqual(processed_events, task_statuses)
+        self.assertDictEqual(conductor.serialize(), expected_conductor.serialize())
+        self.assertEqual(conductor.get_workflow_status(), statuses.RUNNING)
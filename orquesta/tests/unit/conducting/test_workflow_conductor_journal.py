@@ -0,0 +1,280 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from orquesta import conducting
+from orquesta import events
+from orquesta import exceptions as exc
+from orquesta import requests
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class WorkflowConductorJournalTest(test_base.WorkflowConductorTest):
+    wf_def = """
+    version: 1.0
+
+    input:
+      - xs
+
+    vars:
+      - ys: []
+
+    tasks:
+      task1:
+        action: core.noop
+        next:
+          - when: <% succeeded() %>
+            do: task2
+          - when: <% failed() %>
+            do: task3, fail
+      task2:
+        with: <% ctx(xs) %>
+        action: core.echo message=<% item() %>
+        next:
+          - publish: ys=<% result() %>
+      task3:
+        action: core.noop
+    """
+
+    def _prep_conductor(self, inputs=None, journal=True):
+        spec = native_specs.WorkflowSpec(self.wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        inputs = inputs or {"xs": ["fee", "fi"]}
+        conductor = conducting.WorkflowConductor(spec, inputs=inputs, journal=journal)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        return conductor
+
+    def _run_workflow(self, conductor):
+        self.assert_next_task(conductor, "task1", {"xs": ["fee", "fi"], "ys": []})
+        self.forward_task_statuses(conductor, "task1", [statuses.RUNNING, statuses.SUCCEEDED])
+
+        conductor.get_next_tasks()
+
+        for i, item in enumerate(["fee", "fi"]):
+            self.forward_task_item_statuses(conductor, "task2", i, [statuses.RUNNING])
+            self.forward_task_item_statuses(
+                conductor, "task2", i, [statuses.SUCCEEDED], result=item
+            )
+
+        conductor.render_workflow_output()
+
+    def assert_replay_equal(self, conductor, journal, snapshot=None):
+        replayed = conducting.WorkflowConductor.replay(conductor.spec, journal, snapshot=snapshot)
+
+        self.assertDictEqual(replayed.serialize(), conductor.serialize())
+        self.assertListEqual(replayed.journal, [])
+
+        return replayed
+
+    def test_journal_disabled(self):
+        conductor = self._prep_conductor(journal=False)
+        self._run_workflow(conductor)
+
+        self.assertIsNone(conductor.journal)
+        self.assertListEqual(conductor.flush_journal(), [])
+        self.assertNotIn("journal", conductor.serialize())
+
+    def test_journal_entries(self):
+        conductor = self._prep_conductor()
+        self._run_workflow(conductor)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        journal = conductor.flush_journal()
+        self.assertListEqual([e["seq"] for e in journal], list(range(0, len(journal))))
+
+        expected_ops = (
+            ["init", "request_workflow_status", "get_next_tasks"]
+            + ["update_task_state"] * 2
+            + ["get_next_tasks"]
+            + ["update_task_state"] * 4
+            + ["render_workflow_output"]
+        )
+
+        self.assertListEqual([e["op"] for e in journal], expected_ops)
+        self.assertDictEqual(
+            journal[0], {"seq": 0, "op": "init", "context": {}, "inputs": {"xs": ["fee", "fi"]}}
+        )
+        self.assertDictEqual(
+            journal[1], {"seq": 1, "op": "request_workflow_status", "status": "running"}
+        )
+
+        self.assertListEqual(conductor.journal, [])
+        self.assertEqual(conductor.serialize()["journal"], len(journal))
+
+    def test_journal_nested_calls_not_recorded(self):
+        conductor = self._prep_conductor()
+        self.forward_task_statuses(conductor, "task1", [statuses.RUNNING, statuses.FAILED])
+
+        # The engine command to fail the workflow is not recorded in the journal.
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertListEqual(
+            [e["op"] for e in conductor.journal],
+            ["init", "request_workflow_status"] + ["update_task_state"] * 2,
+        )
+
+        self.assert_replay_equal(conductor, conductor.journal)
+
+    def test_replay_from_journal(self):
+        conductor = self._prep_conductor()
+        self._run_workflow(conductor)
+
+        self.assert_replay_equal(conductor, conductor.journal)
+
+    def test_replay_from_snapshot_and_journal_tail(self):
+        conductor = self._prep_conductor()
+        self.forward_task_statuses(conductor, "task1", [statuses.RUNNING, statuses.SUCCEEDED])
+
+        # Take a snapshot and continue to record the tail of the journal.
+        journal = conductor.flush_journal()
+        snapshot = conductor.serialize()
+        self._run_workflow_tail(conductor)
+        journal_tail = conductor.flush_journal()
+
+        self.assertEqual(journal_tail[0]["seq"], snapshot["journal"])
+        self.assert_replay_equal(conductor, journal_tail, snapshot=snapshot)
+
+        # Entries in the journal that are already recorded in the snapshot are skipped.
+        self.assert_replay_equal(conductor, journal + journal_tail, snapshot=snapshot)
+
+        # The replayed conductor continues to record the journal.
+        replayed = self.assert_replay_equal(conductor, journal_tail, snapshot=snapshot)
+        replayed.request_workflow_rerun()
+
+        self.assertListEqual(
+            replayed.journal,
+            [{"seq": journal_tail[-1]["seq"] + 1, "op": "request_workflow_rerun", "tasks": []}],
+        )
+
+    def _run_workflow_tail(self, conductor):
+        conductor.get_next_tasks()
+
+        for i, item in enumerate(["fee", "fi"]):
+            self.forward_task_item_statuses(conductor, "task2", i, [statuses.RUNNING])
+            self.forward_task_item_statuses(conductor, "task2", i, [statuses.FAILED], result=item)
+
+    def test_replay_with_batch_and_rerun(self):
+        conductor = self._prep_conductor()
+        self.forward_task_statuses(conductor, "task1", [statuses.RUNNING, statuses.SUCCEEDED])
+        self._run_workflow_tail(conductor)
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+
+        rerun_request = requests.TaskRerunRequest.new("task2", reset_items=True)
+        conductor.request_workflow_rerun(task_requests=[rerun_request])
+        conductor.get_next_tasks()
+
+        task_events = [
+            ("task2", 0, events.TaskItemActionExecutionEvent(0, statuses.RUNNING)),
+            ("task2", 0, events.TaskItemActionExecutionEvent(1, statuses.RUNNING)),
+            ("task2", 0, events.TaskItemActionExecutionEvent(0, statuses.SUCCEEDED, result=1)),
+            ("task2", 0, events.TaskItemActionExecutionEvent(1, statuses.SUCCEEDED, result=2)),
+        ]
+
+        conductor.update_task_states(task_events)
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        self.assertDictEqual(
+            conductor.journal[-3]["tasks"][0], {"task_id": "task2", "route": 0, "reset_items": True}
+        )
+
+        self.assertEqual(len(conductor.journal[-1]["events"]), 4)
+        self.assert_replay_equal(conductor, conductor.journal)
+
+    def test_replay_failed_call(self):
+        conductor = self._prep_conductor()
+        self.forward_task_statuses(conductor, "task1", [statuses.RUNNING, statuses.SUCCEEDED])
+        conductor.get_next_tasks()
+
+        # The first event in the batch is processed before the call fails on the second event.
+        task_events = [
+            ("task2", 0, events.TaskItemActionExecutionEvent(0, statuses.RUNNING)),
+            ("task2", 0, events.TaskItemActionExecutionEvent(9, statuses.RUNNING)),
+        ]
+
+        self.assertRaises(IndexError, conductor.update_task_states, task_events)
+        self.assertEqual(conductor.get_task_state_entry("task2", 0)["status"], statuses.RUNNING)
+
+        # The failed call is recorded in the journal and fails the same way on replay.
+        entry = conductor.journal[-1]
+        self.assertEqual(entry["op"], "update_task_states")
+        self.assertEqual(entry["error"]["type"], "IndexError")
+
+        replayed = self.assert_replay_equal(conductor, conductor.journal)
+        self.assertEqual(replayed.get_task_state_entry("task2", 0)["status"], statuses.RUNNING)
+
+        # The replay fails if the call that failed when recorded succeeds on replay.
+        journal = conductor.flush_journal()
+        journal[-1]["events"] = journal[-1]["events"][0:1]
+
+        self.assertRaises(
+            exc.WorkflowJournalError,
+            conducting.WorkflowConductor.replay,
+            conductor.spec,
+            journal,
+        )
+
+    def test_replay_bad_journal(self):
+        conductor = self._prep_conductor()
+        self._run_workflow(conductor)
+        journal = conductor.flush_journal()
+
+        self.assertRaises(
+            exc.WorkflowJournalError, conducting.WorkflowConductor.replay, conductor.spec, []
+        )
+
+        self.assertRaises(
+            exc.WorkflowJournalError,
+            conducting.WorkflowConductor.replay,
+            conductor.spec,
+            journal[1:],
+        )
+
+        self.assertRaises(
+            exc.WorkflowJournalError,
+            conducting.WorkflowConductor.replay,
+            conductor.spec,
+            journal[0:2] + journal[3:],
+        )
+
+        snapshot = self._prep_conductor(journal=False).serialize()
+
+        self.assertRaises(
+            exc.WorkflowJournalError,
+            conducting.WorkflowConductor.replay,
+            conductor.spec,
+            journal,
+            snapshot=snapshot,
+        )
+
+    def test_event_serialization(self):
+        task_events = [
+            events.ActionExecutionEvent(statuses.SUCCEEDED, result={"k": "v"}),
+            events.TaskItemActionExecutionEvent(1, statuses.FAILED, accumulated_result=[1]),
+            events.TaskRetryEvent(),
+            events.WorkflowExecutionEvent(statuses.RUNNING),
+        ]
+
+        for event in task_events:
+            actual = events.ExecutionEvent.deserialize(event.serialize())
+            self.assertIs(type(actual), type(event))
+            self.assertDictEqual(vars(actual), vars(event))
+
+        self.assertRaises(
+            exc.InvalidEventType,
+            events.ExecutionEvent.deserialize,
+            {"type": "WorkflowState", "attrs": {}},
+        )
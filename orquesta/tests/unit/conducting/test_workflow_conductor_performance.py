@@ -13,10 +13,12 @@
 # limitations under the License.
 
 import datetime
+import mock
 import random
 import string
 
 from orquesta import conducting
+from orquesta.specs import base as spec_base
 from orquesta.specs import native as native_specs
 from orquesta import statuses
 from orquesta.tests.unit import base as test_base
@@ -102,6 +104,73 @@ class WorkflowConductorStressTest(test_base.WorkflowConductorTest):
         delta = t2 - t1
         self.assertLess(delta.seconds, 3)
 
+    def test_runtime_function_of_join_size(self):
+        num_branches = 200
+
+        wf_def = {"tasks": {"init": {"action": "core.noop", "next": [{"do": []}]}}}
+
+        for i in range(1, num_branches + 1):
+            task_name = "t" + str(i)
+            wf_def["tasks"]["init"]["next"][0]["do"].append(task_name)
+            wf_def["tasks"][task_name] = {"action": "core.noop", "next": [{"do": "join"}]}
+
+        wf_def["tasks"]["join"] = {"join": "all", "action": "core.noop"}
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, "init", [statuses.RUNNING, statuses.SUCCEEDED])
+
+        for i in range(1, num_branches + 1):
+            self.forward_task_statuses(conductor, "t" + str(i), [statuses.RUNNING])
+
+        for i in range(1, num_branches + 1):
+            self.forward_task_statuses(conductor, "t" + str(i), [statuses.SUCCEEDED])
+
+            # Compare the tally of the inbound criteria against a fresh evaluation.
+            if i % 50 == 0 or i == num_branches - 1:
+                expected = conducting.WorkflowConductor.deserialize(conductor.serialize())
+                self.assertEqual(
+                    conductor.get_inbound_criteria_status("join", 0),
+                    expected.get_inbound_criteria_status("join", 0),
+                )
+
+        self.assert_next_task(conductor, "join", {})
+        self.forward_task_statuses(conductor, "join", [statuses.RUNNING, statuses.SUCCEEDED])
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+    def test_runtime_function_of_fan_out_size(self):
+        num_branches = 200
+
+        wf_def = {"tasks": {"init": {"action": "core.noop", "next": [{"do": []}]}}}
+
+        for i in range(1, num_branches + 1):
+            task_name = "t" + str(i)
+            wf_def["tasks"]["init"]["next"][0]["do"].append(task_name)
+            wf_def["tasks"][task_name] = {
+                "action": "core.echo",
+                "input": {"message": task_name},
+                "retry": {"count": 3},
+                "next": [{"when": "<% succeeded() %>", "publish": [{"x": task_name}]}],
+            }
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, "init", [statuses.RUNNING, statuses.SUCCEEDED])
+
+        # The task specs are rendered without copying the specs.
+        with mock.patch.object(spec_base.Spec, "copy", side_effect=Exception("copied")):
+            t1 = datetime.datetime.utcnow()
+            next_tasks = conductor.get_next_tasks()
+            t2 = datetime.datetime.utcnow()
+
+        self.assertEqual(len(next_tasks), num_branches)
+        self.assertIs(next_tasks[0]["spec"], spec.tasks.get_task(next_tasks[0]["id"]))
+
+        delta = t2 - t1
+        self.assertLess(delta.seconds, 3)
+
 
 class WorkflowConductorWithItemsStressTest(test_base.WorkflowConductorWithItemsTest):
     def test_runtime_function_of_items_list_size(self):
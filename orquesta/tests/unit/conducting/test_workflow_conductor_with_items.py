@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+
 from orquesta import conducting
 from orquesta.specs import native as native_specs
 from orquesta import statuses
@@ -649,3 +651,138 @@ class WorkflowConductorWithItemsTest(test_base.WorkflowConductorWithItemsTest):
 
         # Assert the workflow succeeded.
         self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+    def test_items_list_with_concurrency_reuses_task_render(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs:
+              - fee
+              - fi
+              - fo
+              - fum
+
+        tasks:
+          task1:
+            with:
+              items: <% ctx(xs) %>
+              concurrency: 2
+            action: core.echo message="succeeded <% item() %>"
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        with mock.patch.object(
+            conducting.WorkflowConductor, "get_task", wraps=conductor.get_task
+        ) as mock_get_task:
+            next_tasks = conductor.get_next_tasks()
+            self.assertEqual(len(next_tasks[0]["actions"]), 2)
+            self.forward_task_item_statuses(conductor, "task1", 0, [statuses.RUNNING])
+            self.forward_task_item_statuses(conductor, "task1", 1, [statuses.RUNNING])
+
+            # The task is not rendered again when the state of the items changes
+            # because the task context did not change.
+            self.assertListEqual(conductor.get_next_tasks(), [])
+            self.assertEqual(mock_get_task.call_count, 1)
+
+            self.forward_task_item_statuses(conductor, "task1", 0, [statuses.SUCCEEDED])
+            next_tasks = conductor.get_next_tasks()
+            reused_next_tasks = conductor.get_next_tasks()
+            self.assertEqual(mock_get_task.call_count, 1)
+
+        # Compare the reused render against the render from a new conductor.
+        expected_conductor = conducting.WorkflowConductor.deserialize(conductor.serialize())
+        expected_next_tasks = expected_conductor.get_next_tasks()
+        expected_actions = [
+            {"action": "core.echo", "input": {"message": "succeeded fo"}, "item_id": 2}
+        ]
+        self.assertListEqual([t["actions"] for t in next_tasks], [expected_actions])
+        self.assertListEqual([t["actions"] for t in reused_next_tasks], [expected_actions])
+        self.assertDictEqual(reused_next_tasks[0]["ctx"], expected_next_tasks[0]["ctx"])
+        self.assertListEqual(reused_next_tasks[0]["actions"], expected_next_tasks[0]["actions"])
+
+        # The render is dropped once the task leaves staging.
+        self.assertIn(("task1", 0), conductor._rendered_tasks)
+
+        for i in range(1, 4):
+            if i > 1:
+                self.forward_task_item_statuses(conductor, "task1", i, [statuses.RUNNING])
+
+            self.forward_task_item_statuses(conductor, "task1", i, [statuses.SUCCEEDED])
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor._rendered_tasks, {})
+
+    def test_items_list_with_impure_function_does_not_reuse_task_render(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs:
+              - fee
+              - fi
+
+        tasks:
+          task1:
+            with:
+              items: <% ctx(xs) %>
+              concurrency: 1
+            action: core.echo message=<% item() %>
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        task_spec = spec.tasks.get_task("task1")
+
+        self.assertTrue(conductor._is_task_render_reusable(task_spec))
+
+        # The task is always rendered if a function is not known to be pure.
+        with mock.patch.object(conducting, "PURE_EXPRESSION_FUNCTIONS", frozenset(["ctx"])):
+            self.assertFalse(conductor._is_task_render_reusable(task_spec))
+
+            conductor.get_next_tasks()
+            conductor.get_next_tasks()
+
+        self.assertDictEqual(conductor._rendered_tasks, {})
+
+    def test_items_list_with_task_status_does_not_reuse_task_render(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs:
+              - fee
+              - fi
+
+        tasks:
+          task1:
+            with:
+              items: <% ctx(xs) %>
+              concurrency: 1
+            action: core.echo message=<% task_status(task1) %>
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        next_tasks = conductor.get_next_tasks()
+        expected_actions = [{"action": "core.echo", "input": {"message": "null"}, "item_id": 0}]
+        self.assertListEqual(next_tasks[0]["actions"], expected_actions)
+
+        self.forward_task_item_statuses(conductor, "task1", 0, [statuses.RUNNING])
+        self.forward_task_item_statuses(conductor, "task1", 0, [statuses.SUCCEEDED])
+
+        next_tasks = conductor.get_next_tasks()
+        expected_actions = [{"action": "core.echo", "input": {"message": "running"}, "item_id": 1}]
+        self.assertListEqual(next_tasks[0]["actions"], expected_actions)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
 import unittest
 
 from orquesta.expressions import base as expr_base
@@ -53,3 +54,47 @@ class ExpressionEvaluatorTest(unittest.TestCase):
         self.assertTrue(expr_base.has_expressions("foo <% ctx().foo %> bar"))
         self.assertTrue(expr_base.has_expressions("foo {{ ctx().foo }} bar"))
         self.assertFalse(expr_base.has_expressions("foobar"))
+
+    def test_validation_cache(self):
+        expr_base.VALIDATION_CACHE.clear()
+        validate = yaql_expr.YAQLEvaluator.validate
+
+        with mock.patch.object(
+            yaql_expr.YAQLEvaluator, "validate", side_effect=validate
+        ) as mock_validate:
+            for i in range(0, 3):
+                result = expr_base.validate(["<% succeeded() %>", "<% $.foo.bar[ %>"])
+                self.assertEqual(len(result["errors"]), 1)
+                self.assertEqual(result["errors"][0]["expression"], "<% $.foo.bar[ %>")
+
+                # The cached errors are not modified by the caller.
+                result["errors"][0]["spec_path"] = "tasks.task1"
+
+        self.assertEqual(mock_validate.call_count, 2)
+        self.assertNotIn("spec_path", expr_base.validate("<% $.foo.bar[ %>")["errors"][0])
+
+        expected_stats = {"hits": 5, "misses": 2, "evictions": 0, "size": 2, "max_size": 4096}
+        self.assertDictEqual(expr_base.VALIDATION_CACHE.get_stats(), expected_stats)
+
+        # The cache is keyed by the evaluator and the expression.
+        self.assertListEqual(expr_base.validate("{{ succeeded() }}")["errors"], [])
+        self.assertEqual(len(expr_base.VALIDATION_CACHE), 3)
+
+    def test_lazy_class_attribute(self):
+        calls = []
+
+        class MockEvaluator(object):
+            @expr_base.LazyClassAttribute
+            def _engine(cls):
+                calls.append(cls)
+                return object()
+
+        engine = MockEvaluator._engine
+
+        # The value is built once on first access and then again after reset.
+        self.assertIs(MockEvaluator._engine, engine)
+        self.assertListEqual(calls, [MockEvaluator])
+
+        MockEvaluator.__dict__["_engine"].reset()
+        self.assertIsNot(MockEvaluator._engine, engine)
+        self.assertListEqual(calls, [MockEvaluator, MockEvaluator])
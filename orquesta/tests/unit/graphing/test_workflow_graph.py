@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+
 from orquesta import exceptions as exc
 from orquesta import graphing
 from orquesta.tests.unit import base as test_base
@@ -86,6 +88,51 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
 
         self.assert_graph_equal(wf_graph, EXPECTED_WF_GRAPH)
 
+    def test_compact_serialization(self):
+        wf_graph = self._prep_graph()
+        wf_graph.add_transition("task1", "task2", attr1="fubar")
+        wf_graph.update_task("task1", retry={"count": 3})
+
+        data = wf_graph.serialize(compact=True)
+
+        self.assertEqual(data["version"], graphing.COMPACT_FORMAT_VERSION)
+        self.assertListEqual(data["tasks"], ["task" + str(i) for i in range(1, 10)])
+        self.assertListEqual(data["transitions"][0:2], [[0, 1, 0], [0, 1, 1]])
+        self.assertEqual(len(data["transitions"]), 11)
+        self.assertListEqual(data["values"], [{"count": 3}, "*", "foobar", "fubar"])
+        self.assertDictEqual(data["task_attrs"], {"retry": [[0, 0]], "barrier": [[4, 1]]})
+        self.assertDictEqual(data["transition_attrs"], {"attr1": [[0, 2], [1, 3]]})
+
+        # The graph deserialized from the compact format is the same as the original graph.
+        expected_wf_graph = json_util.deepcopy(EXPECTED_WF_GRAPH)
+        expected_wf_graph["nodes"][0]["retry"] = {"count": 3}
+        expected_transition = {"id": "task2", "key": 1, "attr1": "fubar"}
+        expected_wf_graph["adjacency"][0].insert(1, expected_transition)
+
+        actual_wf_graph = graphing.WorkflowGraph.deserialize(data)
+        self.assertDictEqual(actual_wf_graph.serialize(), wf_graph.serialize())
+        self.assertDictEqual(actual_wf_graph.serialize(), expected_wf_graph)
+        self.assertDictEqual(actual_wf_graph.serialize(compact=True), data)
+        self.assertListEqual(
+            actual_wf_graph.get_prev_transitions("task9"), wf_graph.get_prev_transitions("task9")
+        )
+
+        # The attribute values are not shared between the tasks and the serialized data.
+        wf_graph.update_task("task2", retry={"count": 3})
+        data = wf_graph.serialize(compact=True)
+        self.assertListEqual(data["task_attrs"]["retry"], [[0, 0], [1, 0]])
+
+        actual_wf_graph = graphing.WorkflowGraph.deserialize(data)
+        actual_wf_graph.get_task_retry_spec("task1")["count"] = 5
+        self.assertDictEqual(actual_wf_graph.get_task_retry_spec("task2"), {"count": 3})
+        self.assertDictEqual(data["values"][0], {"count": 3})
+
+    def test_compact_serialization_unsupported_version(self):
+        data = self._prep_graph().serialize(compact=True)
+        data["version"] = graphing.COMPACT_FORMAT_VERSION + 1
+
+        self.assertRaises(ValueError, graphing.WorkflowGraph.deserialize, data)
+
     def test_graph_roots(self):
         wf_graph = self._prep_graph()
 
@@ -149,6 +196,26 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
 
         self.assertRaises(exc.InvalidTask, wf_graph.get_task, "task999")
 
+    def test_get_task_attributes_without_copy(self):
+        wf_graph = self._prep_graph()
+        wf_graph.update_task("task2", retry={"count": 3})
+
+        with mock.patch.object(json_util, "deepcopy", mock.MagicMock(side_effect=AssertionError)):
+            self.assertEqual(wf_graph.get_barrier("task5"), "*")
+            self.assertTrue(wf_graph.has_barrier("task5"))
+            self.assertFalse(wf_graph.has_barrier("task2"))
+            self.assertDictEqual(wf_graph.get_task_retry_spec("task2"), {"count": 3})
+            self.assertTrue(wf_graph.task_has_retry("task2"))
+            self.assertFalse(wf_graph.task_has_retry("task1"))
+
+        self.assertRaises(exc.InvalidTask, wf_graph.get_barrier, "task999")
+        self.assertRaises(exc.InvalidTask, wf_graph.get_task_retry_spec, "task999")
+
+        # The public get_task returns a copy of the task attributes.
+        task = wf_graph.get_task("task2")
+        task["retry"]["count"] = 5
+        self.assertDictEqual(wf_graph.get_task_retry_spec("task2"), {"count": 3})
+
     def test_update_task(self):
         wf_graph = self._prep_graph()
 
@@ -251,6 +318,59 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
             sorted(wf_graph.get_prev_transitions("task5")), sorted(expected_transitions)
         )
 
+    def test_transitions_cache_after_update(self):
+        wf_graph = self._prep_graph()
+
+        self.assertEqual(len(wf_graph.get_next_transitions("task1")), 4)
+        self.assertEqual(len(wf_graph.get_prev_transitions("task9")), 2)
+
+        # The cached transitions are reset when a transition is added.
+        wf_graph.add_transition("task1", "task9", attr1="fubar")
+        wf_graph.add_transition("task1", "task3")
+
+        expected_transitions = [
+            ("task1", "task2", 0, {"attr1": "foobar"}),
+            ("task1", "task3", 0, {}),
+            ("task1", "task4", 0, {}),
+            ("task1", "task7", 0, {}),
+            ("task1", "task9", 0, {}),
+            ("task1", "task9", 1, {"attr1": "fubar"}),
+        ]
+
+        self.assertListEqual(wf_graph.get_next_transitions("task1"), expected_transitions)
+        self.assertEqual(len(wf_graph.get_prev_transitions("task9")), 3)
+        self.assertEqual(len(wf_graph.has_transition("task1", "task9")), 2)
+
+        # The cached transitions reflect the attributes of the updated transition.
+        wf_graph.update_transition("task1", "task9", 1, attr1="foobar")
+
+        expected = [("task1", "task9", 1, {"attr1": "foobar"})]
+        self.assertIn(expected[0], wf_graph.get_next_transitions("task1"))
+        self.assertIn(expected[0], wf_graph.get_prev_transitions("task9"))
+        self.assertListEqual(wf_graph.has_transition("task1", "task9", attr1="foobar"), expected)
+        self.assertEqual(wf_graph.get_transition("task1", "task9", key=1), expected[0])
+
+        # The cached transitions are not modified by the caller.
+        wf_graph.get_next_transitions("task1").pop()
+        self.assertEqual(len(wf_graph.get_next_transitions("task1")), 6)
+
+    def test_freeze_graph(self):
+        wf_graph = self._prep_graph()
+        self.assertFalse(wf_graph.frozen)
+
+        wf_graph.freeze()
+        self.assertTrue(wf_graph.frozen)
+
+        self.assertRaises(exc.WorkflowGraphIsFrozenError, wf_graph.add_task, "task10")
+        self.assertRaises(exc.WorkflowGraphIsFrozenError, wf_graph.update_task, "task1", a=1)
+        self.assertRaises(exc.WorkflowGraphIsFrozenError, wf_graph.set_barrier, "task9")
+        self.assertRaises(exc.WorkflowGraphIsFrozenError, wf_graph.add_transition, "task9", "task1")
+        self.assertRaises(
+            exc.WorkflowGraphIsFrozenError, wf_graph.update_transition, "task1", "task2", 0, a=1
+        )
+
+        self.assert_graph_equal(wf_graph, EXPECTED_WF_GRAPH)
+
     def test_task_has_barrier(self):
         wf_graph = self._prep_graph()
 
@@ -273,3 +393,33 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
         self.assertTrue(
             len(wf_graph.get_prev_transitions("task9")) > 1 and not wf_graph.has_barrier("task9")
         )
+
+    def test_get_cycles(self):
+        wf_graph = self._prep_graph()
+
+        self.assertListEqual(wf_graph.get_cycles(), [])
+        self.assertFalse(wf_graph.in_cycle("task1"))
+        self.assertFalse(wf_graph.in_cycle("task5"))
+
+        # The cached cycles are reset when a transition is added.
+        wf_graph.add_transition("task6", "task2")
+        wf_graph.add_transition("task9", "task9")
+
+        cycles = sorted(wf_graph.get_cycles(), key=lambda c: c["tasks"])
+        self.assertEqual(len(cycles), 2)
+        self.assertListEqual(cycles[0]["tasks"], ["task2", "task3", "task5", "task6"])
+        self.assertListEqual(cycles[1]["tasks"], ["task9"])
+
+        self.assertFalse(wf_graph.in_cycle("task1"))
+        self.assertFalse(wf_graph.in_cycle("task4"))
+        self.assertTrue(wf_graph.in_cycle("task2"))
+        self.assertTrue(wf_graph.in_cycle("task6"))
+        self.assertTrue(wf_graph.in_cycle("task9"))
+
+        # The cached cycles are not modified by the caller.
+        cycles[0]["tasks"].append("task1")
+        self.assertFalse(any("task1" in c["tasks"] for c in wf_graph.get_cycles()))
+
+        # The cached cycles are reset when a task is added.
+        wf_graph.add_task("task10")
+        self.assertFalse(wf_graph.in_cycle("task10"))
@@ -0,0 +1,163 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import networkx as nx
+from networkx.readwrite import json_graph
+
+from orquesta import exceptions as exc
+from orquesta import graphing
+from orquesta.tests.unit import base as test_base
+
+
+WF_NAMES = [
+    "sequential",
+    "branching",
+    "decision",
+    "cycle",
+    "cycles",
+    "cycle-fork",
+    "join",
+    "join-count",
+    "split",
+    "splits",
+    "splits-mixed",
+    "splits-nested",
+    "task-duplicate-transition",
+    "task-retry-spec",
+    "error-handling",
+    "with-items",
+]
+
+
+class WorkflowGraphBackendTest(test_base.WorkflowComposerTest):
+    spec_module_name = "native"
+
+    def compose_wf_graph(self, wf_name, backend=None):
+        with mock.patch.object(graphing, "DEFAULT_GRAPH_BACKEND", backend or "dict"):
+            return self.composer._compose_wf_graph(self.get_wf_spec(wf_name))
+
+    def assert_graph_parity(self, wf_graph, nx_wf_graph):
+        self.assertDictEqual(wf_graph.serialize(), nx_wf_graph.serialize())
+        self.assertDictEqual(wf_graph.serialize(compact=True), nx_wf_graph.serialize(compact=True))
+        self.assertListEqual(wf_graph.roots, nx_wf_graph.roots)
+        self.assertListEqual(wf_graph.leaves, nx_wf_graph.leaves)
+        self.assertDictEqual(wf_graph.get_barriers(), nx_wf_graph.get_barriers())
+
+        self.assertDictEqual(
+            wf_graph.get_transition_attributes("criteria"),
+            nx_wf_graph.get_transition_attributes("criteria"),
+        )
+
+        for task_id in nx_wf_graph._graph.nodes:
+            self.assertEqual(wf_graph.in_cycle(task_id), nx_wf_graph.in_cycle(task_id))
+
+            self.assertListEqual(
+                wf_graph.get_next_transitions(task_id), nx_wf_graph.get_next_transitions(task_id)
+            )
+
+            self.assertListEqual(
+                wf_graph.get_prev_transitions(task_id), nx_wf_graph.get_prev_transitions(task_id)
+            )
+
+        self.assertListEqual(
+            sorted(c["tasks"] for c in wf_graph.get_cycles()),
+            sorted(c["tasks"] for c in nx_wf_graph.get_cycles()),
+        )
+
+    def test_default_backend(self):
+        wf_graph = graphing.WorkflowGraph()
+
+        self.assertIs(wf_graph.backend, graphing.DictMultiDiGraph)
+        self.assertIs(graphing.WorkflowGraph(backend="networkx").backend, nx.MultiDiGraph)
+        self.assertIs(graphing.WorkflowGraph(graph=nx.MultiDiGraph()).backend, nx.MultiDiGraph)
+
+        self.assertRaises(exc.PluginFactoryError, graphing.get_graph_backend, "foobar")
+
+    def test_compose_parity(self):
+        for wf_name in WF_NAMES:
+            wf_graph = self.compose_wf_graph(wf_name)
+            nx_wf_graph = self.compose_wf_graph(wf_name, backend="networkx")
+
+            self.assertIs(wf_graph.backend, graphing.DictMultiDiGraph)
+            self.assertIs(nx_wf_graph.backend, nx.MultiDiGraph)
+            self.assert_graph_parity(wf_graph, nx_wf_graph)
+
+            # The graph is serialized in the same format as the adjacency data from networkx.
+            self.assertDictEqual(
+                wf_graph.serialize(), json_graph.adjacency_data(nx_wf_graph._graph)
+            )
+
+    def test_conversion(self):
+        for wf_name in WF_NAMES:
+            wf_graph = self.compose_wf_graph(wf_name)
+            nx_wf_graph = wf_graph.to_backend("networkx")
+
+            self.assertIs(nx_wf_graph.backend, nx.MultiDiGraph)
+            self.assertIsInstance(wf_graph.to_networkx(), nx.MultiDiGraph)
+            self.assertIs(nx_wf_graph.to_networkx(), nx_wf_graph._graph)
+            self.assert_graph_parity(wf_graph, nx_wf_graph)
+            self.assert_graph_parity(nx_wf_graph.to_backend("dict"), nx_wf_graph)
+
+            # The converted graph does not share any attribute with the original graph.
+            for task_id, attrs in wf_graph._graph.nodes.items():
+                self.assertIsNot(nx_wf_graph._graph.nodes[task_id], attrs)
+
+    def test_deserialize_parity(self):
+        for wf_name in WF_NAMES:
+            nx_wf_graph = self.compose_wf_graph(wf_name, backend="networkx")
+
+            for compact in [False, True]:
+                data = nx_wf_graph.serialize(compact=compact)
+                wf_graph = graphing.WorkflowGraph.deserialize(data)
+
+                self.assertIs(wf_graph.backend, graphing.DictMultiDiGraph)
+                self.assert_graph_parity(wf_graph, nx_wf_graph)
+
+                wf_graph = graphing.WorkflowGraph.deserialize(data, backend="networkx")
+
+                self.assertIs(wf_graph.backend, nx.MultiDiGraph)
+                self.assert_graph_parity(wf_graph, nx_wf_graph)
+
+    def test_duplicate_transitions(self):
+        wf_graph = graphing.WorkflowGraph()
+        nx_wf_graph = graphing.WorkflowGraph(backend="networkx")
+
+        for g in [wf_graph, nx_wf_graph]:
+            g.add_transition("task1", "task2", criteria=["foo"])
+            g.add_transition("task1", "task2", criteria=["bar"])
+            g.add_transition("task2", "task2")
+            g._graph.add_edge("task2", "task3", key=5)
+            g._graph.add_edge("task2", "task3")
+            g.update_transition("task1", "task2", 1, ref=1)
+
+        self.assert_graph_parity(wf_graph, nx_wf_graph)
+        self.assertTrue(wf_graph.in_cycle("task2"))
+        self.assertFalse(wf_graph.in_cycle("task1"))
+
+        self.assertRaises(exc.AmbiguousTaskTransition, wf_graph.get_transition, "task1", "task2")
+
+    def test_get_cycle_members(self):
+        successors = {"a": ["b"], "b": ["c", "d"], "c": ["a"], "d": ["d", "e"], "e": ["x"]}
+
+        self.assertSetEqual(graphing.get_cycle_members(successors), {"a", "b", "c", "d"})
+        self.assertSetEqual(graphing.get_cycle_members({}), set())
+
+        # The components are identified without recursion so the depth of the graph is unbounded.
+        num_tasks = 5000
+        successors = {i: [i + 1] for i in range(0, num_tasks)}
+        self.assertSetEqual(graphing.get_cycle_members(successors), set())
+
+        successors[num_tasks] = [0]
+        self.assertEqual(len(graphing.get_cycle_members(successors)), num_tasks + 1)
@@ -12,16 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
 import os
 import shutil
 import six
 import tempfile
+import yaml
 
 from orquesta import conducting
 from orquesta import exceptions as exc
 from orquesta import rehearsing
 from orquesta import statuses
 from orquesta.tests.unit.specs.native import base as test_base
+from orquesta.utils import specs as spec_util
+from orquesta.utils import yml as yaml_util
 
 
 class WorkflowRehearsalSpecTest(test_base.OrchestraWorkflowSpecTest):
@@ -104,6 +108,74 @@ class WorkflowRehearsalSpecTest(test_base.OrchestraWorkflowSpecTest):
         self.assertIsNone(rehearsal.session.expected_errors)
         self.assertIsNone(rehearsal.session.expected_output)
 
+    def test_load_test_spec_with_definition_cache(self):
+        test_spec = {
+            "workflow": self.get_wf_file_path("sequential"),
+            "expected_task_sequence": ["task1", "task2", "task3", "continue"],
+        }
+
+        cache_path = tempfile.mkdtemp()
+        cache = spec_util.set_definition_cache(cache_path)
+
+        try:
+            rehearsal = rehearsing.load_test_spec(dict(test_spec))
+            cached_wf_spec = rehearsing.load_test_spec(dict(test_spec)).wf_spec
+            stats = cache.get_stats()
+        finally:
+            spec_util.set_definition_cache(None)
+            shutil.rmtree(cache_path)
+
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+        # The workflow definition is instantiated as the spec module does with the version
+        # in the spec whether or not it is loaded from the cache.
+        expected_wf_spec = rehearsal.spec_module.instantiate(rehearsal.session.wf_def)
+        self.assertEqual(cached_wf_spec.version, 1.0)
+        self.assertDictEqual(rehearsal.wf_spec.serialize(), expected_wf_spec.serialize())
+        self.assertDictEqual(cached_wf_spec.serialize(), expected_wf_spec.serialize())
+
+    def test_load_test_spec_file_with_lazy_results(self):
+        greeting = "Stanley, %s" % ("x" * 1000)
+
+        test_spec = {
+            "workflow": self.get_wf_file_path("sequential"),
+            "inputs": {"name": "Stanley"},
+            "expected_task_sequence": ["task1", "task2", "task3", "continue"],
+            "mock_action_executions": [
+                {"task_id": "task1", "result": "Stanley"},
+                {"task_id": "task2", "result": "x" * 1000},
+                {"task_id": "task3", "result": greeting},
+            ],
+            "expected_output": {"greeting": greeting},
+        }
+
+        fd, path = tempfile.mkstemp(suffix=".yaml")
+
+        with os.fdopen(fd, "w") as f:
+            yaml.safe_dump(test_spec, f)
+
+        with mock.patch.object(yaml_util, "DEFAULT_LAZY_MIN_SIZE", 100):
+            rehearsal = rehearsing.load_test_spec(fixture_path=path)
+
+        self.assertRaises(ValueError, rehearsing.load_test_spec, fixture_path=path, max_size=100)
+
+        os.remove(path)
+
+        # The large results are replaced with a placeholder in the spec and are loaded on access.
+        ac_exs = rehearsal.session.mock_action_executions
+        self.assertEqual(ac_exs[0].spec["result"], "Stanley")
+        self.assertIsNone(ac_exs[1].spec["result"])
+        self.assertIsNone(ac_exs[2].spec["result"])
+        self.assertEqual(ac_exs[2].result, greeting)
+
+        # The large results are loaded when the test spec is serialized.
+        self.assertDictEqual(rehearsal.session.serialize()["spec"], test_spec)
+        self.assertIsNone(ac_exs[2].spec["result"])
+        self.assertEqual(rehearsal.session.copy().mock_action_executions[2].result, greeting)
+
+        rehearsal.assert_conducting_sequence()
+
     def test_load_test_spec_dict_with_mock_action_executions(self):
         test_spec = {
             "workflow": self.get_wf_file_path("sequential"),
@@ -145,6 +145,80 @@ class WorkflowSpecTest(test_base.OrchestraWorkflowSpecTest):
         self.assertTrue(wf_spec.tasks.in_cycle("task2"))
         self.assertTrue(wf_spec.tasks.in_cycle("task3"))
 
+    def test_transitions_index(self):
+        wf_names = [
+            "sequential",
+            "parallel",
+            "branching",
+            "decision",
+            "cycle",
+            "cycles",
+            "cycle-fork",
+            "join",
+            "join-count-complex",
+            "split",
+            "splits",
+            "splits-mixed",
+            "splits-nested",
+            "task-duplicate-transition",
+            "error-handling",
+        ]
+
+        for wf_name in wf_names:
+            wf_spec = self.get_wf_spec(wf_name)
+            task_names = list(wf_spec.tasks.keys())
+
+            # Compute the next and previous tasks from the task specs without the index.
+            next_tasks = {t: wf_spec.tasks._get_next_tasks(t) for t in task_names}
+            prev_tasks = {t: [] for t in task_names}
+
+            for task_name in task_names:
+                for next_task in next_tasks[task_name]:
+                    prev_task = (task_name, next_task[1], next_task[2])
+                    prev_tasks.setdefault(next_task[0], []).append(prev_task)
+
+            for task_name in task_names:
+                self.assertListEqual(wf_spec.tasks.get_next_tasks(task_name), next_tasks[task_name])
+
+                self.assertListEqual(
+                    wf_spec.tasks.get_prev_tasks(task_name),
+                    sorted(prev_tasks[task_name], key=lambda x: x[0]),
+                )
+
+                # A task is in a cycle if the task is reachable from its next tasks.
+                traversed = set()
+                q = [t[0] for t in next_tasks[task_name]]
+
+                while q:
+                    next_task_name = q.pop()
+
+                    if next_task_name not in traversed:
+                        traversed.add(next_task_name)
+                        q.extend(t[0] for t in next_tasks.get(next_task_name, []))
+
+                self.assertEqual(wf_spec.tasks.in_cycle(task_name), task_name in traversed)
+
+            self.assertListEqual(
+                wf_spec.tasks.get_start_tasks(),
+                sorted([(t, None, None) for t in task_names if not prev_tasks[t]]),
+            )
+
+    def test_transitions_index_reset(self):
+        wf_name = "sequential"
+        wf_spec = self.get_wf_spec(wf_name)
+
+        self.assertListEqual(wf_spec.tasks.get_prev_tasks("task1"), [])
+        self.assertFalse(wf_spec.tasks.has_cycles())
+
+        # The index is reset when a task spec is replaced.
+        task3_spec = {"action": "core.noop", "next": [{"do": "task1"}]}
+        setattr(wf_spec.tasks, "task3", native_specs.TaskSpec(task3_spec, member=True))
+
+        self.assertListEqual(wf_spec.tasks.get_prev_tasks("task1"), [("task3", None, 0)])
+        self.assertListEqual(wf_spec.tasks.get_start_tasks(), [])
+        self.assertTrue(wf_spec.tasks.has_cycles())
+        self.assertTrue(wf_spec.tasks.in_cycle("task1"))
+
     def test_in_cycle_of_multiple(self):
         wf_name = "cycles"
         wf_spec = self.get_wf_spec(wf_name)
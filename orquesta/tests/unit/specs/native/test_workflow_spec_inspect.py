@@ -0,0 +1,193 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import mock
+
+from orquesta.specs import native as native_specs
+from orquesta.tests.unit.specs.native import base as test_base
+from orquesta.utils import yml as yaml_util
+
+
+class WorkflowSpecInspectTest(test_base.OrchestraWorkflowSpecTest):
+    wf_def = """
+    version: 1.0
+
+    input:
+      - x
+
+    vars:
+      - y: <% ctx(x) %>
+
+    tasks:
+      task1:
+        action: core.noop
+        next:
+          - when: <% succeeded() and ctx(foo) %>
+            publish: a=<% ctx(x) %>
+            do: task2
+      task2:
+        action: core.echo message=<% ctx(a) %>
+        foobar: 1
+        next:
+          - do: task3, task4
+      task3:
+        join: all
+        action: core.noop input=<% <% %>
+      task5:
+        action: core.noop
+
+    output:
+      - z: <% ctx(a) %>
+    """
+
+    def assert_incremental_inspection(self, wf_def, changed_wf_def, app_ctx=None):
+        previous = native_specs.WorkflowSpec(copy.deepcopy(wf_def))
+        previous.inspect(app_ctx=app_ctx)
+
+        expected = native_specs.WorkflowSpec(copy.deepcopy(changed_wf_def)).inspect(app_ctx=app_ctx)
+        wf_spec = native_specs.WorkflowSpec(copy.deepcopy(changed_wf_def))
+        errors = wf_spec.inspect(app_ctx=app_ctx, previous=previous)
+        self.assertDictEqual(errors, expected)
+
+    def test_incremental_inspection(self):
+        wf_def = yaml_util.safe_load(self.wf_def)
+        self.assertListEqual(
+            sorted(native_specs.WorkflowSpec(copy.deepcopy(wf_def)).inspect().keys()),
+            ["context", "expressions", "semantics", "syntax"],
+        )
+
+        changes = [
+            lambda d: None,
+            lambda d: d["tasks"]["task1"]["next"][0].update({"publish": "b=<% ctx(x) %>"}),
+            lambda d: d["tasks"]["task2"].pop("foobar"),
+            lambda d: d["tasks"]["task3"].update({"action": "core.noop"}),
+            lambda d: d["tasks"].pop("task5"),
+            lambda d: d["tasks"].update({"task4": {"action": "core.echo message=<% ctx(b) %>"}}),
+            lambda d: d.update({"input": ["x", "a", "foo"]}),
+        ]
+
+        for change in changes:
+            changed_wf_def = copy.deepcopy(wf_def)
+            change(changed_wf_def)
+
+            for app_ctx in [None, {"foo": True}]:
+                self.assert_incremental_inspection(wf_def, changed_wf_def, app_ctx=app_ctx)
+                self.assert_incremental_inspection(changed_wf_def, wf_def, app_ctx=app_ctx)
+
+    def test_incremental_inspection_reuses_unchanged_tasks(self):
+        wf_def = self.get_wf_def("sequential")
+        changed_wf_def = copy.deepcopy(wf_def)
+        changed_wf_def["tasks"]["task3"]["action"] = "core.echo message=<% ctx(greeting) %>"
+
+        previous = native_specs.WorkflowSpec(copy.deepcopy(wf_def))
+        self.assertDictEqual(previous.inspect(), {})
+        wf_spec = native_specs.WorkflowSpec(copy.deepcopy(changed_wf_def))
+
+        with mock.patch.object(
+            native_specs.TaskSpec,
+            "inspect_context",
+            side_effect=native_specs.TaskSpec.inspect_context,
+            autospec=True,
+        ) as mock_inspect_context:
+            self.assertDictEqual(wf_spec.inspect(previous=previous), {})
+
+        # Only the context of the changed task is inspected again.
+        self.assertListEqual(
+            [c[0][0] for c in mock_inspect_context.call_args_list], [wf_spec.tasks["task3"]]
+        )
+
+    def test_incremental_inspection_without_previous_inspection(self):
+        previous = native_specs.WorkflowSpec(self.wf_def)
+        wf_spec = native_specs.WorkflowSpec(self.wf_def)
+
+        self.assertIsNone(wf_spec.get_changed_tasks(previous))
+        self.assertIsNone(wf_spec.get_changed_tasks(None))
+        self.assertDictEqual(wf_spec.inspect(previous=previous), previous.inspect())
+        self.assertSetEqual(wf_spec.get_changed_tasks(previous), set())
+
+    def get_join_chain_wf_spec(self, num_tasks):
+        tasks = {}
+
+        for i in range(0, num_tasks):
+            next_tasks = (
+                "task%s, task%s" % (i + 1, i + 2) if i < num_tasks - 2 else "task%s" % (i + 1)
+            )
+            tasks["task%s" % i] = {"action": "core.noop", "next": [{"do": next_tasks}]}
+
+            if i > 1:
+                tasks["task%s" % i]["join"] = "all"
+
+        tasks["task%s" % num_tasks] = {"action": "core.noop", "join": "all"}
+
+        return native_specs.WorkflowSpec({"version": 1.0, "tasks": tasks})
+
+    def test_traversal_function_of_join_count(self):
+        num_tasks = 40
+        wf_spec = self.get_join_chain_wf_spec(num_tasks)
+        parent = {"spec_path": "tasks", "schema_path": "properties.tasks"}
+
+        # Each task is traversed once regardless of the number of paths to the task.
+        traversals = [
+            ("get_task", wf_spec.tasks.detect_undefined_tasks),
+            ("get_next_tasks", wf_spec.tasks.detect_unreachable_tasks),
+        ]
+
+        for func_name, detect in traversals:
+            func = getattr(native_specs.TaskMappingSpec, func_name)
+
+            with mock.patch.object(
+                native_specs.TaskMappingSpec, func_name, side_effect=func, autospec=True
+            ) as mock_func:
+                self.assertListEqual(detect(parent=parent), [])
+
+            self.assertLessEqual(mock_func.call_count, 2 * (num_tasks + 1))
+
+    def test_join_context_inspection(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - do: task2, task3
+          task2:
+            action: core.noop
+            next:
+              - do: task4
+          task3:
+            action: core.noop
+            next:
+              - do: task4
+          task4:
+            join: all
+            action: core.echo message=<% ctx(foobar) %>
+        """
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+        errors = wf_spec.inspect()
+
+        # The join task is inspected once for each inbound task transition.
+        self.assertListEqual([e["spec_path"] for e in errors["context"]], ["tasks.task4.input"] * 2)
+
+        # The incremental inspection matches the full inspection.
+        changed_wf_def = yaml_util.safe_load(wf_def)
+        changed_wf_def["tasks"]["task1"]["action"] = "core.echo"
+        changed_wf_spec = native_specs.WorkflowSpec(changed_wf_def)
+
+        self.assertDictEqual(
+            changed_wf_spec.inspect(previous=wf_spec),
+            native_specs.WorkflowSpec(changed_wf_def).inspect(),
+        )
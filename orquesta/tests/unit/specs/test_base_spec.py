@@ -13,9 +13,11 @@
 # limitations under the License.
 
 import six
+import threading
 import unittest
 
 from orquesta import exceptions as exc
+from orquesta.specs import base as spec_base
 from orquesta.specs import types as spec_types
 from orquesta.tests.unit.specs import base as test_specs
 from orquesta.utils import jsonify as json_util
@@ -108,6 +110,172 @@ class SpecTest(unittest.TestCase):
 
         self.assertDictEqual(schema, test_specs.MockSpec.get_schema(includes=None))
 
+    def test_get_schema_cached(self):
+        schema = test_specs.MockSpec.get_schema()
+
+        self.assertIs(test_specs.MockSpec.get_schema(includes=["meta"]), schema)
+        self.assertIs(test_specs.MockSpec.get_meta_schema(), test_specs.MockSpec.get_meta_schema())
+        self.assertIsNot(test_specs.MockSpec.get_schema(includes=None), schema)
+        self.assertIsNot(test_specs.MockSpec.get_schema(resolve_specs=False), schema)
+
+        # The cached schema is shared so it cannot be modified.
+        self.assertRaises(TypeError, schema.__setitem__, "type", "array")
+        self.assertRaises(TypeError, schema["properties"].pop, "attr1")
+        self.assertRaises(TypeError, schema["required"].append, "attr2")
+
+        spec1 = test_specs.MockSpec({"attr1": "foobar"})
+        spec2 = test_specs.MockSpec({"attr1": "fubar"})
+        self.assertIs(spec1._schema, spec2._schema)
+        self.assertIs(spec1._meta_schema, spec2._meta_schema)
+
+        # The schema is rebuilt after the cache is reset.
+        spec_base.reset_schema_cache()
+        self.assertIsNot(test_specs.MockSpec.get_schema(), schema)
+        self.assertDictEqual(test_specs.MockSpec.get_schema(), schema)
+
+    def test_get_schema_validator_cached(self):
+        spec_base.reset_schema_cache()
+
+        # The validator is built once and shared across threads.
+        validators = []
+
+        threads = [
+            threading.Thread(
+                target=lambda: validators.append(test_specs.MockSpec.get_schema_validator())
+            )
+            for i in range(0, 8)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(validators), 8)
+
+        validator = test_specs.MockSpec.get_schema_validator()
+        self.assertTrue(all(v is validator for v in validators))
+        self.assertDictEqual(validator.schema, test_specs.MockSpec.get_schema())
+
+        # The validator is not inherited by the subclasses.
+        base_validator = test_specs.MockBaseSpec.get_schema_validator()
+        leaf_validator = test_specs.MockLeafSpec.get_schema_validator()
+        self.assertIsNot(base_validator, leaf_validator)
+        self.assertDictEqual(leaf_validator.schema, test_specs.MockLeafSpec.get_schema())
+
+        # The validator is rebuilt after the cache is reset.
+        spec_base.reset_schema_cache()
+        self.assertIsNot(test_specs.MockSpec.get_schema_validator(), validator)
+
+    def test_is_valid_syntax(self):
+        spec = {"name": "mock", "attr1": "foobar", "attr5": {"attr1": {"attr1": "foobar"}}}
+
+        self.assertTrue(test_specs.MockSpec.is_valid_syntax(spec))
+        self.assertTrue(test_specs.MockSpec.is_valid_syntax("name: mock\nattr1: foobar\n"))
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax({"name": "mock"}))
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax({"attr1": "foobar", "attr5": []}))
+
+        # The result is consistent with the errors from the syntax inspection.
+        spec_obj = test_specs.MockSpec({"attr1": "foobar", "attr5": []})
+        self.assertGreater(len(spec_obj.inspect_syntax()), 0)
+
+    def test_is_valid_syntax_bad_input(self):
+        # The input that cannot be loaded into a spec is not valid instead of raising.
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax("name: mock\n  attr1: [foobar\n"))
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax("name: mock\nname: mock\n"))
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax("foobar"))
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax(""))
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax(None))
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax(123))
+        self.assertFalse(test_specs.MockSpec.is_valid_syntax(["name: mock"]))
+
+    def test_spec_copy(self):
+        spec = {
+            "name": "mock",
+            "attr1": "foobar",
+            "attr5": {"attr1": {"attr1": "foobar"}},
+            "attr6": {"foobar": {"attr1": {"attr1": "foobar"}}},
+            "attr7": [{"attr1": {"attr1": "foobar"}}],
+        }
+
+        spec_obj = test_specs.MockSpec(spec)
+        spec_obj_copy = spec_obj.copy()
+
+        self.assertIsNot(spec_obj_copy, spec_obj)
+        self.assertIsInstance(spec_obj_copy, test_specs.MockSpec)
+        self.assertDictEqual(spec_obj_copy.serialize(), spec_obj.serialize())
+
+        # The copy does not share the raw spec or the nested specs with the original.
+        self.assertIsNot(spec_obj_copy.spec, spec_obj.spec)
+        self.assertIsNot(spec_obj_copy.attr5, spec_obj.attr5)
+        self.assertIsNot(spec_obj_copy.attr7, spec_obj.attr7)
+
+        spec_obj_copy.spec["attr1"] = "fubar"
+        spec_obj_copy.attr5.spec["attr1"]["attr1"] = "fubar"
+        spec_obj_copy.attr6.spec["foobar"]["attr1"]["attr1"] = "fubar"
+        spec_obj_copy.attr7.spec.append({"attr1": {"attr1": "fubar"}})
+
+        self.assertEqual(spec_obj.attr1, "foobar")
+        self.assertDictEqual(spec_obj.attr5.spec, {"attr1": {"attr1": "foobar"}})
+        self.assertDictEqual(spec_obj.attr6.spec, {"foobar": {"attr1": {"attr1": "foobar"}}})
+        self.assertListEqual(spec_obj.attr7.spec, [{"attr1": {"attr1": "foobar"}}])
+
+        mapping_spec_obj_copy = spec_obj.attr6.copy()
+        self.assertIsNot(mapping_spec_obj_copy.spec, spec_obj.attr6.spec)
+        self.assertDictEqual(mapping_spec_obj_copy.spec, spec_obj.attr6.spec)
+        self.assertIsNot(mapping_spec_obj_copy.foobar, spec_obj.attr6.foobar)
+
+        mapping_spec_obj_copy.foobar.spec["attr1"]["attr1"] = "fubar"
+        self.assertEqual(spec_obj.attr6.foobar.attr1.attr1, "foobar")
+
+    def test_spec_attributes(self):
+        spec = {
+            "name": "mock",
+            "description": "foobar",
+            "attr1": "foobar",
+            "attr1-1": "fubar",
+            "attr1_2": "foosball",
+            "attr2": {"macro": "polo"},
+        }
+
+        spec_obj = test_specs.MockSpec(spec)
+        attributes, patterns = test_specs.MockSpec.get_attribute_table()
+
+        self.assertIs(test_specs.MockSpec.get_attribute_table()[0], attributes)
+        self.assertEqual(attributes["attr1_1"][0], "attr1-1")
+        self.assertNotIn("attr1-2", attributes)
+        self.assertListEqual(patterns, [])
+
+        self.assertEqual(spec_obj.name, "mock")
+        self.assertEqual(spec_obj.description, "foobar")
+        self.assertEqual(spec_obj.attr1, "foobar")
+        self.assertEqual(spec_obj.attr1_1, "fubar")
+        self.assertEqual(getattr(spec_obj, "attr1-1"), "fubar")
+        self.assertEqual(spec_obj.attr1_2, "foosball")
+        self.assertDictEqual(spec_obj.attr2, {"macro": "polo"})
+        self.assertIsNone(spec_obj.attr3)
+        self.assertIsNone(spec_obj.tags)
+        self.assertRaises(AttributeError, getattr, spec_obj, "foobar")
+
+        mapping_spec_obj = test_specs.MockMappingSpec({"foo": {"attr1": {"attr1": "bar"}}})
+        self.assertEqual(mapping_spec_obj.foo.attr1.attr1, "bar")
+        self.assertIsNone(mapping_spec_obj.fubar)
+
+    def test_spec_attribute_mutable_default(self):
+        class MockDefaultSpec(test_specs.MockBaseSpec):
+            _schema = {
+                "type": "object",
+                "properties": {"attr1": {"type": "object", "default": {}}},
+            }
+
+        spec_obj = MockDefaultSpec({"attr2": "foobar"})
+        spec_obj.attr1["foo"] = "bar"
+
+        # The default is copied so the schema shared by the specs is not modified.
+        self.assertDictEqual(spec_obj.attr1, {})
+        self.assertDictEqual(MockDefaultSpec({"attr2": "foobar"}).attr1, {})
+
     def test_instance_schema(self):
         schema = {
             "type": "object",
@@ -0,0 +1,127 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import mock
+import unittest
+
+from orquesta import events
+from orquesta import machines
+from orquesta import statuses
+
+
+class UncopyableItemList(list):
+    def __init__(self, *args, **kwargs):
+        super(UncopyableItemList, self).__init__(*args, **kwargs)
+        self.iter_count = 0
+
+    def __iter__(self):
+        self.iter_count += 1
+        return super(UncopyableItemList, self).__iter__()
+
+    def __copy__(self):
+        raise AssertionError("The list of items is copied.")
+
+    def __deepcopy__(self, memo):
+        raise AssertionError("The list of items is copied.")
+
+
+class MockWorkflowState(object):
+    def __init__(self, items):
+        self.staged_task = {"id": "task1", "route": 0, "items": items}
+
+    def get_staged_task(self, task_id, route):
+        return self.staged_task
+
+
+class StateMachineTablesTest(unittest.TestCase):
+    def assert_table_equal(self, data, table, targets):
+        for status in statuses.ALL_STATUSES:
+            transitions = machines.get_transitions(table, status)
+
+            if status not in data:
+                self.assertIsNone(transitions)
+                self.assertIsNone(machines.get_transitions(targets, status))
+                continue
+
+            for event_name in machines.EVENT_CODES.keys():
+                expected = data[status].get(event_name)
+                self.assertEqual(machines.get_transition(transitions, event_name), expected)
+
+            self.assertSetEqual(
+                set(machines.get_transitions(targets, status)), set(data[status].values())
+            )
+
+    def test_task_state_machine_table(self):
+        self.assert_table_equal(
+            machines.TASK_STATE_MACHINE_DATA,
+            machines.TASK_STATE_MACHINE_TABLE,
+            machines.TASK_STATE_MACHINE_TARGETS,
+        )
+
+    def test_workflow_state_machine_table(self):
+        self.assert_table_equal(
+            machines.WORKFLOW_STATE_MACHINE_DATA,
+            machines.WORKFLOW_STATE_MACHINE_TABLE,
+            machines.WORKFLOW_STATE_MACHINE_TARGETS,
+        )
+
+    def test_unknown_status_and_event(self):
+        table = machines.TASK_STATE_MACHINE_TABLE
+        self.assertIsNone(machines.get_transitions(table, "foobar"))
+        self.assertIsNone(machines.get_transitions(table, None))
+
+        transitions = machines.get_transitions(table, statuses.RUNNING)
+        self.assertIsNone(machines.get_transition(transitions, "foobar"))
+
+    def test_task_item_event_context(self):
+        items = [
+            {"status": statuses.SUCCEEDED},
+            {"status": statuses.RUNNING},
+            {"status": statuses.FAILED},
+            {"status": statuses.UNSET},
+        ]
+
+        workflow_state = MockWorkflowState(items)
+        add_context = machines.TaskStateMachine.add_context_to_task_item_event
+
+        cases = [
+            (1, statuses.SUCCEEDED, "action_succeeded_task_dormant_items_failed"),
+            (0, statuses.SUCCEEDED, "action_succeeded_task_active_items_incomplete"),
+            (0, statuses.RUNNING, "action_running"),
+        ]
+
+        for item_id, status, expected in cases:
+            ac_ex_event = events.TaskItemActionExecutionEvent(item_id, status)
+            self.assertEqual(add_context(workflow_state, "task1", 0, ac_ex_event), expected)
+
+        # The items in the staged task are not modified.
+        self.assertEqual(len(items), 4)
+
+    @mock.patch.object(copy, "deepcopy", mock.MagicMock(side_effect=copy.deepcopy))
+    def test_items_not_copied_per_event(self):
+        num_items = 100
+        items = UncopyableItemList({"status": statuses.RUNNING} for i in range(0, num_items))
+        workflow_state = MockWorkflowState(items)
+
+        for i in range(0, num_items):
+            task_state = {"id": "task1", "route": 0, "status": statuses.RUNNING}
+            ac_ex_event = events.TaskItemActionExecutionEvent(i, statuses.SUCCEEDED)
+            machines.TaskStateMachine.process_event(workflow_state, task_state, ac_ex_event)
+            self.assertEqual(task_state["status"], statuses.RUNNING)
+
+        # The status of the items is evaluated in a single pass over the items for each event
+        # and the items are not copied.
+        self.assertEqual(items.iter_count, num_items)
+        copy.deepcopy.assert_not_called()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
 import unittest
 
 from orquesta import conducting
@@ -110,6 +111,67 @@ class WorkflowStateMachineTest(unittest.TestCase):
         machines.WorkflowStateMachine.process_event(conductor.workflow_state, tk_ex_event)
         self.assertEqual(conductor.get_workflow_status(), statuses.PAUSED)
 
+    def assert_workflow_situation(self, conductor, task_id, route=0):
+        workflow_state = conductor.workflow_state
+        expected = machines.WorkflowStateMachine.get_workflow_situation(workflow_state)
+        expected["has_barrier_next"] = workflow_state.has_barrier_next(task_id, route)
+        expected["has_next_tasks"] = workflow_state.has_next_tasks(task_id, route)
+
+        self.assertDictEqual(conductor.get_workflow_situation(task_id, route), expected)
+
+    def test_workflow_situation(self):
+        conductor = self._prep_conductor(statuses.RUNNING)
+        self.assert_workflow_situation(conductor, "task1")
+
+        for status in [statuses.RUNNING, statuses.SUCCEEDED]:
+            conductor.update_task_state("task1", 0, events.ActionExecutionEvent(status))
+            self.assert_workflow_situation(conductor, "task1")
+
+        for status in [statuses.RUNNING, statuses.PAUSING, statuses.PAUSED]:
+            conductor.update_task_state("task2", 0, events.ActionExecutionEvent(status))
+            self.assert_workflow_situation(conductor, "task2")
+
+        conductor.request_workflow_status(statuses.CANCELED)
+        self.assert_workflow_situation(conductor, "task2")
+
+    @mock.patch.object(
+        conducting.WorkflowState, "has_next_tasks", mock.MagicMock(side_effect=AssertionError)
+    )
+    @mock.patch.object(
+        conducting.WorkflowState,
+        "has_active_tasks",
+        mock.PropertyMock(side_effect=AssertionError),
+    )
+    def test_workflow_status_transition_with_situation(self):
+        conductor = self._prep_conductor(statuses.RUNNING)
+        workflow_state = conductor.workflow_state
+
+        situation = {
+            "has_active_tasks": False,
+            "has_staged_tasks": False,
+            "has_pausing_tasks": False,
+            "has_paused_tasks": False,
+            "has_canceling_tasks": False,
+            "has_canceled_tasks": False,
+            "has_barrier_next": False,
+            "has_next_tasks": True,
+        }
+
+        # The workflow state machine does not query the workflow state given the situation.
+        tk_ex_event = events.TaskExecutionEvent("task1", 0, statuses.SUCCEEDED)
+        machines.WorkflowStateMachine.process_event(workflow_state, tk_ex_event, situation)
+        self.assertEqual(workflow_state.status, statuses.RUNNING)
+
+        situation["has_next_tasks"] = False
+        machines.WorkflowStateMachine.process_event(workflow_state, tk_ex_event, situation)
+        self.assertEqual(workflow_state.status, statuses.SUCCEEDED)
+
+        workflow_state.status = statuses.RUNNING
+        wf_ex_event = events.WorkflowExecutionEvent(statuses.PAUSING)
+        situation["has_active_tasks"] = True
+        machines.WorkflowStateMachine.process_event(workflow_state, wf_ex_event, situation)
+        self.assertEqual(workflow_state.status, statuses.PAUSING)
+
 
 class FailedStateTransitionTest(unittest.TestCase):
     @classmethod
@@ -0,0 +1,51 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+import unittest
+
+
+# The libraries that are loaded on first use and not on import of the conductor.
+LAZY_MODULES = ["jinja2", "jsonschema", "networkx", "stevedore", "yaql"]
+
+
+def get_imported_modules(statement):
+    # Run the statement in a new interpreter and list the modules loaded afterward.
+    statement += "; import sys; print('\\n'.join(sorted(sys.modules.keys())))"
+    cmd = [sys.executable, "-c", statement]
+    output = subprocess.check_output(cmd).decode("utf-8")
+
+    return set(output.splitlines())
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_lazy_modules_not_loaded_on_import(self):
+        imported_modules = get_imported_modules("import orquesta.conducting")
+
+        self.assertIn("orquesta.conducting", imported_modules)
+
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, imported_modules)
+
+    def test_lazy_modules_loaded_on_use(self):
+        statement = (
+            "from orquesta.specs import native; "
+            "native.WorkflowSpec('version: 1.0\\ntasks:\\n  t1:\\n    action: a').inspect()"
+        )
+
+        imported_modules = get_imported_modules(statement)
+
+        for module in ["jinja2", "jsonschema", "stevedore", "yaql"]:
+            self.assertIn(module, imported_modules)
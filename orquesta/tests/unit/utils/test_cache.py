@@ -0,0 +1,55 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from orquesta.composers import base as comp_base
+from orquesta.expressions import base as expr_base
+from orquesta.utils import cache as cache_util
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_cache_bounded(self):
+        cache = cache_util.LRUCache(max_size=2)
+
+        for key in ["a", "b", "a", "c"]:
+            if not cache.get(key):
+                cache.put(key, key.upper())
+
+        # The least recently used entry is evicted.
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+        self.assertEqual(cache.get("c"), "C")
+
+        expected_stats = {"hits": 3, "misses": 4, "evictions": 1, "size": 2, "max_size": 2}
+        self.assertDictEqual(cache.get_stats(), expected_stats)
+
+        cache.clear()
+        expected_stats = {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "max_size": 2}
+        self.assertDictEqual(cache.get_stats(), expected_stats)
+
+    def test_cache_disabled(self):
+        # The entry is not cached if the max size is 0.
+        cache = cache_util.LRUCache(max_size=0)
+        cache.put("a", "A")
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("a"))
+
+    def test_shared_cache_class(self):
+        self.assertIsInstance(comp_base.GRAPH_CACHE, cache_util.LRUCache)
+        self.assertEqual(comp_base.GRAPH_CACHE.max_size, comp_base.DEFAULT_GRAPH_CACHE_SIZE)
+        self.assertIsInstance(expr_base.VALIDATION_CACHE, cache_util.LRUCache)
+        self.assertEqual(
+            expr_base.VALIDATION_CACHE.max_size, expr_base.DEFAULT_VALIDATION_CACHE_SIZE
+        )
@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+import threading
 import unittest
 
 from orquesta import exceptions as exc
+from orquesta.expressions import base as expr_base
+from orquesta.expressions import yql as yaql_expr
+from orquesta.specs import base as spec_base
+from orquesta.specs.native.v1 import models as native_v1_models
 from orquesta.utils import plugin as plugin_util
 
 
@@ -22,7 +28,21 @@ class FakePlugin(object):
     pass
 
 
+class FakeEvaluator(object):
+    @classmethod
+    def get_statement_regex(cls):
+        return r"\[\[.*?\]\]"
+
+
+def fake_func(context, value):
+    return "fake %s" % value
+
+
 class PluginFactoryTest(unittest.TestCase):
+    def tearDown(self):
+        plugin_util.reset()
+        super(PluginFactoryTest, self).tearDown()
+
     def test_get_instance(self):
         self.assertIsInstance(plugin_util.get_instance("orquesta.tests", "fake"), FakePlugin)
 
@@ -31,6 +51,13 @@ class PluginFactoryTest(unittest.TestCase):
             exc.PluginFactoryError, plugin_util.get_instance, "orquesta.tests", "foobar"
         )
 
+    def test_get_instance_init_failed(self):
+        plugin_util.register("orquesta.tests", "foobar", FakePlugin)
+
+        self.assertRaises(
+            exc.PluginFactoryError, plugin_util.get_instance, "orquesta.tests", "foobar", "foo"
+        )
+
     def test_get_module(self):
         self.assertEqual(plugin_util.get_module("orquesta.tests", "fake"), FakePlugin)
 
@@ -38,3 +65,109 @@ class PluginFactoryTest(unittest.TestCase):
         self.assertRaises(
             exc.PluginFactoryError, plugin_util.get_module, "orquesta.tests", "foobar"
         )
+
+    def test_get_module_cached(self):
+        plugin_util.reset()
+
+        with mock.patch.object(
+            plugin_util, "_load_module", side_effect=plugin_util._load_module
+        ) as mock_load_module:
+            for i in range(0, 3):
+                self.assertEqual(plugin_util.get_module("orquesta.tests", "fake"), FakePlugin)
+                self.assertIsInstance(
+                    plugin_util.get_instance("orquesta.tests", "fake"), FakePlugin
+                )
+
+        # The entry points are scanned once for the plugin.
+        self.assertEqual(mock_load_module.call_count, 1)
+
+    def test_get_modules(self):
+        self.assertDictEqual(plugin_util.get_modules("orquesta.tests"), {"fake": FakePlugin})
+        self.assertDictEqual(plugin_util.get_modules("orquesta.foobar"), {})
+
+    def test_register(self):
+        plugin_util.register("orquesta.foobar", "fake", FakePlugin)
+        plugin_util.register("orquesta.tests", "foobar", dict)
+
+        self.assertEqual(plugin_util.get_module("orquesta.foobar", "fake"), FakePlugin)
+        self.assertDictEqual(plugin_util.get_modules("orquesta.foobar"), {"fake": FakePlugin})
+
+        self.assertDictEqual(
+            plugin_util.get_modules("orquesta.tests"), {"fake": FakePlugin, "foobar": dict}
+        )
+
+        # The registered plugin takes precedence over the entry point.
+        plugin_util.register("orquesta.tests", "fake", dict)
+        self.assertEqual(plugin_util.get_module("orquesta.tests", "fake"), dict)
+
+        plugin_util.unregister("orquesta.tests", "fake")
+        self.assertEqual(plugin_util.get_module("orquesta.tests", "fake"), FakePlugin)
+
+        plugin_util.reset()
+
+        self.assertRaises(exc.PluginFactoryError, plugin_util.get_module, "orquesta.foobar", "fake")
+
+    def test_register_expression_function(self):
+        expr = "<% fake(ctx(foo)) %>"
+        data = {"foo": "bar"}
+
+        self.assertRaises(exc.ExpressionEvaluationException, expr_base.evaluate, expr, data)
+
+        # The expression evaluators are rebuilt with the registered function.
+        plugin_util.register("orquesta.expressions.functions", "fake", fake_func)
+        self.assertEqual(expr_base.evaluate(expr, data), "fake bar")
+        self.assertIn("fake", yaql_expr.YAQLEvaluator._custom_functions)
+
+        plugin_util.reset()
+        self.assertNotIn("fake", yaql_expr.YAQLEvaluator._custom_functions)
+
+    def test_reset_hook(self):
+        hook = mock.MagicMock()
+        plugin_util.register_reset_hook(hook)
+        plugin_util.register_reset_hook(hook)
+
+        plugin_util.reset()
+        self.assertEqual(hook.call_count, 1)
+
+        plugin_util._RESET_HOOKS.remove(hook)
+
+    def test_reset_hook_runs_without_lock(self):
+        results = []
+
+        # The hook loads the plugins from another thread which blocks if the lock is held.
+        def hook():
+            thread = threading.Thread(
+                target=lambda: results.append(plugin_util.get_modules("orquesta.tests"))
+            )
+
+            thread.start()
+            thread.join(10)
+
+        plugin_util.register_reset_hook(hook)
+
+        try:
+            plugin_util.reset()
+        finally:
+            plugin_util._RESET_HOOKS.remove(hook)
+
+        self.assertListEqual(results, [{"fake": FakePlugin}])
+
+    def test_reset_spec_schemas(self):
+        spec_cls = native_v1_models.ItemizedSpec
+        evaluator_namespace = "orquesta.expressions.evaluators"
+
+        self.assertNotIn(FakeEvaluator.get_statement_regex(), spec_cls._items_regex)
+        self.assertIsNotNone(spec_cls.get_schema_validator())
+        self.assertIn(spec_cls, spec_base._VALIDATOR_CACHE)
+
+        # The regex, the schema, and the validator are built again with the registered evaluator.
+        plugin_util.register(evaluator_namespace, "fake", FakeEvaluator)
+
+        self.assertDictEqual(spec_base._VALIDATOR_CACHE, {})
+        self.assertIn(FakeEvaluator.get_statement_regex(), spec_cls._items_regex)
+
+        pattern = spec_cls.get_schema()["properties"]["items"]["pattern"]
+        self.assertIn(FakeEvaluator.get_statement_regex(), pattern)
+
+        plugin_util.unregister(evaluator_namespace, "fake")
+        self.assertNotIn(FakeEvaluator.get_statement_regex(), spec_cls._items_regex)
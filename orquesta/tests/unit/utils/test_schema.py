@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import pickle
 import unittest
 
 from orquesta import exceptions as exc
@@ -305,3 +307,30 @@ class SchemaUtilsTest(unittest.TestCase):
         expected = {"type": "array", "items": [{"type": "number"}]}
 
         self.assertDictEqual(expected, schema_util.merge_schema(s1, s2))
+
+    def test_freeze_schema(self):
+        s = {
+            "type": "object",
+            "properties": {"attr1": {"type": "string"}, "attr2": {"type": "number"}},
+            "required": ["attr1"],
+        }
+
+        frozen = schema_util.freeze_schema(s)
+
+        self.assertDictEqual(frozen, s)
+        self.assertIsInstance(frozen["properties"]["attr1"], schema_util.FrozenSchemaDict)
+        self.assertIsInstance(frozen["required"], schema_util.FrozenSchemaList)
+
+        self.assertRaises(TypeError, frozen.__setitem__, "type", "array")
+        self.assertRaises(TypeError, frozen["properties"].pop, "attr1")
+        self.assertRaises(TypeError, frozen["properties"]["attr1"].update, {"type": "number"})
+        self.assertRaises(TypeError, frozen["required"].append, "attr2")
+
+        # A copy of the frozen schema is mutable.
+        for s_copy in [copy.deepcopy(frozen), pickle.loads(pickle.dumps(frozen))]:
+            self.assertDictEqual(s_copy, s)
+            s_copy["properties"]["attr1"]["type"] = "number"
+            s_copy["required"].append("attr2")
+
+        self.assertDictEqual(schema_util.merge_schema(frozen, {"type": "object"}), s)
+        self.assertDictEqual(frozen, s)
@@ -12,8 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import mock
+import os
+import shutil
+import tempfile
 import yaml
 
+import orquesta
 from orquesta.specs import loader as spec_loader
 from orquesta.tests.unit import base as test_base
 from orquesta.utils import specs as spec_util
@@ -82,3 +88,175 @@ class SpecsUtilTest(test_base.WorkflowSpecTest):
         self.assertIsInstance(wf_spec_2, self.spec_module.WorkflowSpec)
         self.assertEqual(wf_name, wf_spec_2.name)
         self.assertDictEqual(wf_def[wf_name], wf_spec_2.spec)
+
+
+class DefinitionCacheTest(test_base.WorkflowSpecTest):
+    def setUp(self):
+        super(DefinitionCacheTest, self).setUp()
+        self.cache_path = os.path.join(tempfile.mkdtemp(), "cache")
+        self.cache = spec_util.set_definition_cache(self.cache_path)
+
+    def tearDown(self):
+        spec_util.set_definition_cache(None)
+        shutil.rmtree(os.path.dirname(self.cache_path))
+        super(DefinitionCacheTest, self).tearDown()
+
+    def instantiate(self, wf_def):
+        return spec_util.instantiate(self.spec_module_name, wf_def)
+
+    def get_entry_path(self, wf_def):
+        return self.cache.get_entry_path(self.cache.get_key(self.spec_module_name, wf_def))
+
+    def test_cache_disabled(self):
+        spec_util.set_definition_cache(None)
+        self.assertIsNone(spec_util.get_definition_cache())
+
+        with mock.patch.dict(os.environ, {spec_util.DEFINITION_CACHE_DIR_ENV: self.cache_path}):
+            # The environment is only read if the cache is not configured explicitly.
+            self.assertIsNone(spec_util.get_definition_cache())
+
+            spec_util._DEFINITION_CACHE = None
+            self.assertEqual(spec_util.get_definition_cache().path, self.cache_path)
+
+    def test_cache_hit(self):
+        wf_def = self.get_wf_def("basic", raw=True)
+        wf_spec = self.instantiate(wf_def)
+
+        self.assertTrue(os.path.isfile(self.get_entry_path(wf_def)))
+
+        with mock.patch.object(spec_util, "_instantiate") as mock_instantiate:
+            cached_wf_spec = self.instantiate(wf_def)
+
+        mock_instantiate.assert_not_called()
+        self.assertIsInstance(cached_wf_spec, type(wf_spec))
+        self.assertDictEqual(cached_wf_spec.serialize(), wf_spec.serialize())
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_cache_not_used_for_dict(self):
+        self.instantiate(self.get_wf_def("basic"))
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+
+    def test_cache_invalidation(self):
+        wf_def = self.get_wf_def("basic", raw=True)
+        self.instantiate(wf_def)
+        entry_path = self.get_entry_path(wf_def)
+
+        # The entry from another version of orquesta is removed and the definition is loaded.
+        with open(entry_path, "r") as f:
+            entry = json.load(f)
+
+        entry["version"] = "0.0.0"
+
+        with open(entry_path, "w") as f:
+            json.dump(entry, f)
+
+        self.assertIsNotNone(self.instantiate(wf_def))
+        self.assertEqual(self.cache.get_stats()["hits"], 0)
+        self.assertTrue(os.path.isfile(entry_path))
+
+        # The corrupted entry is removed and the definition is loaded.
+        with open(entry_path, "w") as f:
+            f.write("{foobar")
+
+        self.assertIsNotNone(self.instantiate(wf_def))
+        self.assertEqual(self.cache.get_stats()["hits"], 0)
+        self.assertIsNotNone(self.instantiate(wf_def))
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+        # The key includes the orquesta version.
+        with mock.patch.object(orquesta, "__version__", "0.0.0"):
+            self.assertNotEqual(self.get_entry_path(wf_def), entry_path)
+
+    def test_cache_errors_not_cached(self):
+        self.assertRaises(ValueError, self.instantiate, "foobar")
+        self.assertRaises(ValueError, self.instantiate, "foobar")
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+
+    def test_cache_size_limits(self):
+        self.cache.max_entries = 2
+        wf_defs = []
+
+        for i in range(0, 3):
+            wf_def = self.get_wf_def("basic")
+            wf_def["basic"]["description"] = "workflow %s" % i
+            wf_defs.append(yaml.safe_dump(wf_def))
+            self.instantiate(wf_defs[-1])
+            os.utime(self.get_entry_path(wf_defs[-1]), (i, i))
+
+        # The least recently used entry is pruned.
+        self.assertEqual(self.cache.get_stats()["entries"], 2)
+        self.assertFalse(os.path.isfile(self.get_entry_path(wf_defs[0])))
+
+        self.cache.max_bytes = os.path.getsize(self.get_entry_path(wf_defs[2]))
+        self.cache.prune()
+        self.assertEqual(self.cache.get_stats()["entries"], 1)
+        self.assertTrue(os.path.isfile(self.get_entry_path(wf_defs[2])))
+
+        self.cache.clear()
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+
+    def test_cache_tmp_files_pruned(self):
+        wf_def = self.get_wf_def("basic", raw=True)
+
+        # The temporary file is removed if the entry cannot be written.
+        with mock.patch.object(os, "rename", side_effect=OSError("foobar")):
+            self.instantiate(wf_def)
+
+        self.assertListEqual(os.listdir(self.cache_path), [])
+
+        # The temporary files left over from writes that did not complete are pruned.
+        stale_tmp_path = os.path.join(self.cache_path, "stale.tmp")
+        recent_tmp_path = os.path.join(self.cache_path, "recent.tmp")
+
+        for tmp_path in [stale_tmp_path, recent_tmp_path]:
+            with open(tmp_path, "w") as f:
+                f.write("{")
+
+        os.utime(stale_tmp_path, (0, 0))
+        self.instantiate(wf_def)
+
+        self.assertFalse(os.path.isfile(stale_tmp_path))
+        self.assertTrue(os.path.isfile(recent_tmp_path))
+        self.assertTrue(os.path.isfile(self.get_entry_path(wf_def)))
+        self.assertEqual(self.cache.get_stats()["entries"], 1)
+
+    def test_cache_hit_same_as_miss(self):
+        wf_def = self.get_wf_def("basic")
+        wf_def["basic"]["vars"] = [{"m": {"a": "one", "b": ["two"]}}]
+        wf_def = yaml.safe_dump(wf_def)
+
+        wf_spec = self.instantiate(wf_def)
+        cached_wf_spec = self.instantiate(wf_def)
+
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+        self.assertDictEqual(cached_wf_spec.serialize(), wf_spec.serialize())
+
+    def test_cache_skipped_for_non_string_keys(self):
+        wf_def = self.get_wf_def("basic")
+        wf_def["basic"]["vars"] = [{"m": {1: "one", "a": "two"}}]
+        wf_def = yaml.safe_dump(wf_def)
+
+        # The spec is not cached since the int key would be loaded from JSON as a string.
+        wf_spec = self.instantiate(wf_def)
+        self.assertFalse(os.path.isfile(self.get_entry_path(wf_def)))
+
+        uncached_wf_spec = self.instantiate(wf_def)
+        self.assertDictEqual(uncached_wf_spec.serialize(), wf_spec.serialize())
+        self.assertDictEqual(uncached_wf_spec.spec["vars"][0], {"m": {1: "one", "a": "two"}})
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["hits"], 0)
+        self.assertEqual(stats["entries"], 0)
+
+    def test_cache_layout(self):
+        wf_def = self.get_wf_def("basic", raw=True)
+
+        # The same definition text is cached separately for each layout.
+        self.assertNotEqual(
+            self.cache.get_key(self.spec_module_name, wf_def),
+            self.cache.get_key(self.spec_module_name, wf_def, layout="workflow_spec"),
+        )
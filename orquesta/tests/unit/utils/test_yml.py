@@ -0,0 +1,181 @@
+# Copyright 2021 The StackStorm Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import gc
+import io
+import mock
+import os
+import tempfile
+import unittest
+import yaml
+
+from orquesta.utils import yml as yaml_util
+
+
+LAZY_PATHS = [("mock_action_executions", "*", "result")]
+
+FIXTURE = """
+input: &input
+  - foo
+mock_action_executions:
+  - task_id: task1
+    result:
+      stdout: %s
+      items: [1, 2, {foo: bar}]
+      first: &first a
+      second: *first
+  - task_id: task2
+    result: foobar
+  - task_id: task3
+    result: *input
+"""
+
+
+class StreamLoaderTest(unittest.TestCase):
+    def test_load(self):
+        fixture = FIXTURE % ("x" * 100)
+
+        self.assertDictEqual(yaml_util.safe_load_stream(fixture), yaml_util.safe_load(fixture))
+        self.assertDictEqual(
+            yaml_util.safe_load_stream(io.StringIO(fixture), lazy_paths=LAZY_PATHS),
+            yaml_util.safe_load(fixture),
+        )
+
+    def test_load_small_stream_without_stream_loader(self):
+        fixture = FIXTURE % ("x" * 100)
+        fd, path = tempfile.mkstemp(suffix=".yaml")
+
+        with os.fdopen(fd, "w") as f:
+            f.write(fixture)
+
+        with mock.patch.object(
+            yaml_util.StreamLoader,
+            "__init__",
+            side_effect=yaml_util.StreamLoader.__init__,
+            autospec=True,
+        ) as mock_stream_loader:
+            # The stream loader is not used if no value can be larger than lazy_min_size.
+            with open(path, "r") as f:
+                data = yaml_util.safe_load_stream(f, max_size=len(fixture), lazy_paths=LAZY_PATHS)
+
+            self.assertDictEqual(data, yaml_util.safe_load(fixture))
+            self.assertEqual(mock_stream_loader.call_count, 0)
+
+            lazy_min_size = len(fixture)
+            data = yaml_util.safe_load_stream(
+                fixture, lazy_paths=LAZY_PATHS, lazy_min_size=lazy_min_size
+            )
+            self.assertDictEqual(data, yaml_util.safe_load(fixture))
+            self.assertEqual(mock_stream_loader.call_count, 0)
+
+            # Otherwise, the stream loader is used if the size is larger or not known.
+            data = yaml_util.safe_load_stream(fixture, lazy_paths=LAZY_PATHS, lazy_min_size=150)
+            self.assertDictEqual(data, yaml_util.safe_load(fixture))
+            self.assertEqual(mock_stream_loader.call_count, 1)
+
+            data = yaml_util.safe_load_stream(io.StringIO(fixture), lazy_paths=LAZY_PATHS)
+            self.assertDictEqual(data, yaml_util.safe_load(fixture))
+            self.assertEqual(mock_stream_loader.call_count, 2)
+
+        os.remove(path)
+
+    def test_load_lazy_value(self):
+        stdout = "x" * 1000
+        fixture = FIXTURE % stdout
+        data = yaml_util.safe_load_stream(fixture, lazy_paths=LAZY_PATHS, lazy_min_size=100)
+        ac_exs = data["mock_action_executions"]
+
+        # Only the result that is larger than the lazy_min_size is loaded lazily.
+        self.assertIsInstance(ac_exs[0]["result"], yaml_util.LazyValue)
+        self.assertEqual(ac_exs[1]["result"], "foobar")
+        self.assertListEqual(ac_exs[2]["result"], ["foo"])
+
+        expected_result = {
+            "stdout": stdout,
+            "items": [1, 2, {"foo": "bar"}],
+            "first": "a",
+            "second": "a",
+        }
+
+        lazy_value = ac_exs[0]["result"]
+        path = lazy_value.path
+        self.assertDictEqual(lazy_value.load(), expected_result)
+        self.assertIsNot(lazy_value.load(), lazy_value.load())
+        self.assertIs(copy.deepcopy(data)["mock_action_executions"][0]["result"], lazy_value)
+
+        # The temporary file is removed when the reference is garbage collected.
+        del data, ac_exs, lazy_value
+        gc.collect()
+        self.assertFalse(os.path.exists(path))
+        self.assertNotIn(path, yaml_util._TEMPORARY_FILE_REFS)
+
+    def test_remove_lazy_value_files_on_exit(self):
+        fixture = FIXTURE % ("x" * 1000)
+        data = yaml_util.safe_load_stream(fixture, lazy_paths=LAZY_PATHS, lazy_min_size=100)
+        path = data["mock_action_executions"][0]["result"].path
+        self.assertTrue(os.path.exists(path))
+
+        # The temporary files of the references that are not garbage collected are removed.
+        yaml_util._remove_temporary_files()
+        self.assertFalse(os.path.exists(path))
+        self.assertNotIn(path, yaml_util._TEMPORARY_FILE_REFS)
+
+    def test_load_lazy_value_with_outer_alias(self):
+        fixture = "a: &a [1]\nresult:\n  foo: %s\n  bar: *a\n" % ("x" * 1000)
+
+        self.assertRaises(
+            ValueError,
+            yaml_util.safe_load_stream,
+            fixture,
+            lazy_paths=[("result",)],
+            lazy_min_size=100,
+        )
+
+    def test_load_duplicate_key(self):
+        fixture = "foo: 1\nfoo: 2\n"
+
+        # The duplicate keys are handled the same as yaml.safe_load.
+        self.assertDictEqual(yaml_util.safe_load_stream(fixture), yaml.safe_load(fixture))
+
+        self.assertDictEqual(
+            yaml_util.safe_load_stream(fixture, lazy_paths=[("bar",)], lazy_min_size=0),
+            yaml.safe_load(fixture),
+        )
+
+    def test_load_size_limit(self):
+        fixture = FIXTURE % ("x" * 1000)
+        fd, path = tempfile.mkstemp(suffix=".yaml")
+
+        with os.fdopen(fd, "w") as f:
+            f.write(fixture)
+
+        # The size is checked before parsing if the size of the stream is known.
+        self.assertRaises(ValueError, yaml_util.safe_load_stream, fixture, max_size=100)
+
+        with open(path, "r") as f:
+            self.assertRaises(ValueError, yaml_util.safe_load_stream, f, max_size=100)
+
+            # The file is not read since the size is checked upfront.
+            self.assertEqual(f.tell(), 0)
+
+        os.remove(path)
+
+        # Otherwise, the size is checked as the stream is read.
+        self.assertRaises(
+            ValueError, yaml_util.safe_load_stream, io.StringIO(fixture), max_size=100
+        )
+
+        data = yaml_util.safe_load_stream(io.StringIO(fixture), max_size=len(fixture))
+        self.assertDictEqual(data, yaml_util.safe_load(fixture))
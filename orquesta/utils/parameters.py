@@ -15,8 +15,10 @@
 import json
 import re
 import six
+import threading
 
 from orquesta.expressions import base as expr_base
+from orquesta.utils import plugin as plugin_util
 
 
 REGEX_VALUE_IN_BRACKETS = r"\[.*\]\s*"
@@ -40,11 +42,34 @@ REGEX_INLINE_PARAM_VARIATIONS = [
     REGEX_NULL,
 ]
 
-REGEX_INLINE_PARAM_VARIATIONS.extend(
-    [e._regex_pattern for e in expr_base.get_evaluators().values()]
-)
+_REGEX_INLINE_PARAMS = None
+_REGEX_INLINE_PARAMS_LOCK = threading.Lock()
 
-REGEX_INLINE_PARAMS = r"([\w]+)=(%s)" % "|".join(REGEX_INLINE_PARAM_VARIATIONS)
+
+def get_inline_params_regex():
+    global _REGEX_INLINE_PARAMS
+
+    # The patterns of the expressions are included so the regex is built on first use to
+    # avoid loading the expression evaluators on import.
+    with _REGEX_INLINE_PARAMS_LOCK:
+        if _REGEX_INLINE_PARAMS is None:
+            variations = REGEX_INLINE_PARAM_VARIATIONS + [
+                e.get_statement_regex() for e in expr_base.get_evaluators().values()
+            ]
+
+            _REGEX_INLINE_PARAMS = re.compile(r"([\w]+)=(%s)" % "|".join(variations))
+
+    return _REGEX_INLINE_PARAMS
+
+
+def reset_inline_params_regex():
+    global _REGEX_INLINE_PARAMS
+
+    with _REGEX_INLINE_PARAMS_LOCK:
+        _REGEX_INLINE_PARAMS = None
+
+
+plugin_util.register_reset_hook(reset_inline_params_regex)
 
 
 def parse_inline_params(s, preserve_order=True):
@@ -54,7 +79,7 @@ def parse_inline_params(s, preserve_order=True):
     if s is None or not isinstance(s, six.string_types) or s == str():
         return params
 
-    for k, v in re.findall(REGEX_INLINE_PARAMS, s):
+    for k, v in get_inline_params_regex().findall(s):
         # Remove leading and trailing whitespaces.
         v = v.strip()
 
@@ -13,16 +13,68 @@
 # limitations under the License.
 
 import logging
-
-from stevedore import driver
+import threading
 
 from orquesta import exceptions as exc
 
 
 LOG = logging.getLogger(__name__)
 
+# The plugins are resolved once per namespace and name and cached for the process. Plugins
+# can also be registered explicitly, i.e. for deployments where the entry points of the
+# packages are not available. The registered plugins take precedence over the entry points.
+_PLUGINS = {}
+_SCANNED_NAMESPACES = set()
+_PLUGINS_LOCK = threading.RLock()
+
+# The callbacks to reset the caches that are derived from the plugins.
+_RESET_HOOKS = []
+
+
+def register_reset_hook(hook):
+    with _PLUGINS_LOCK:
+        if hook not in _RESET_HOOKS:
+            _RESET_HOOKS.append(hook)
+
+
+def _run_reset_hooks():
+    # The hooks are run after the plugins lock is released since the hooks acquire the locks
+    # of the caches which are held by the caches when loading the plugins.
+    with _PLUGINS_LOCK:
+        hooks = list(_RESET_HOOKS)
+
+    for hook in hooks:
+        hook()
+
+
+def register(namespace, name, plugin):
+    with _PLUGINS_LOCK:
+        _PLUGINS[(namespace, name)] = plugin
+
+    _run_reset_hooks()
+
+
+def unregister(namespace, name):
+    with _PLUGINS_LOCK:
+        # The plugin is resolved again from the entry points if available.
+        _PLUGINS.pop((namespace, name), None)
+        _SCANNED_NAMESPACES.discard(namespace)
+
+    _run_reset_hooks()
+
+
+def reset():
+    # Clear the registered and resolved plugins and the caches that are derived from them.
+    with _PLUGINS_LOCK:
+        _PLUGINS.clear()
+        _SCANNED_NAMESPACES.clear()
+
+    _run_reset_hooks()
+
+
+def _load_module(namespace, name):
+    from stevedore import driver
 
-def get_module(namespace, name):
     try:
         mgr = driver.DriverManager(namespace=namespace, name=name, invoke_on_load=False)
     except RuntimeError as e:
@@ -31,16 +83,36 @@ def get_module(namespace, name):
     return mgr.driver
 
 
+def get_module(namespace, name):
+    key = (namespace, name)
+
+    with _PLUGINS_LOCK:
+        if key not in _PLUGINS:
+            _PLUGINS[key] = _load_module(namespace, name)
+
+        return _PLUGINS[key]
+
+
+def get_modules(namespace):
+    # Load all the plugins for the namespace from the entry points in a single scan.
+    with _PLUGINS_LOCK:
+        if namespace not in _SCANNED_NAMESPACES:
+            from stevedore import extension
+
+            mgr = extension.ExtensionManager(namespace=namespace, invoke_on_load=False)
+
+            for name in mgr.names():
+                _PLUGINS.setdefault((namespace, name), mgr[name].plugin)
+
+            _SCANNED_NAMESPACES.add(namespace)
+
+        return {k[1]: v for k, v in _PLUGINS.items() if k[0] == namespace}
+
+
 def get_instance(namespace, name, *args, **kwargs):
+    plugin = get_module(namespace, name)
+
     try:
-        mgr = driver.DriverManager(
-            namespace=namespace,
-            name=name,
-            invoke_on_load=True,
-            invoke_args=args,
-            invoke_kwds=kwargs,
-        )
-    except RuntimeError as e:
+        return plugin(*args, **kwargs)
+    except Exception as e:
         raise exc.PluginFactoryError("Unable to load plugin %s.%s. %s" % (namespace, name, str(e)))
-
-    return mgr.driver
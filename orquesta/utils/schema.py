@@ -16,11 +16,70 @@
 # the schema contains instance(s) of Spec class(es) in which the
 # jsonify.deepcopy method will convert the Spec class(es) to dict.
 import copy
+import six
 
 from orquesta import exceptions as exc
 from orquesta.utils import dictionary as dict_util
 
 
+def _raise_schema_immutable(*args, **kwargs):
+    raise TypeError("The schema is immutable. Use copy.deepcopy to get a mutable copy.")
+
+
+class FrozenSchemaDict(dict):
+    # A read only view of an object schema that is shared between callers. A deep copy of the
+    # view returns a mutable dict so the schema can still be merged and modified by the caller.
+    __setitem__ = __delitem__ = __ior__ = _raise_schema_immutable
+    clear = pop = popitem = setdefault = update = _raise_schema_immutable
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        value = {}
+        memo[id(self)] = value
+
+        for k, v in six.iteritems(self):
+            value[copy.deepcopy(k, memo)] = copy.deepcopy(v, memo)
+
+        return value
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenSchemaList(list):
+    # A read only view of a list in the schema such as the list of required properties.
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_schema_immutable
+    append = extend = insert = pop = remove = reverse = sort = _raise_schema_immutable
+
+    if six.PY2:
+        __setslice__ = __delslice__ = _raise_schema_immutable
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        value = []
+        memo[id(self)] = value
+        value.extend(copy.deepcopy(v, memo) for v in self)
+
+        return value
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze_schema(s):
+    if isinstance(s, dict):
+        return FrozenSchemaDict((k, freeze_schema(v)) for k, v in six.iteritems(s))
+
+    if isinstance(s, list):
+        return FrozenSchemaList(freeze_schema(v) for v in s)
+
+    return s
+
+
 def get_schema_type(s):
     return (s or {}).get("type")
 
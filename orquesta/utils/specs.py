@@ -13,16 +13,267 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import logging
+import os
 import six
+import tempfile
+import threading
+import time
 
+import orquesta
 from orquesta.specs import loader as spec_loader
 from orquesta.utils import yml as yaml_util
 
 LOG = logging.getLogger(__name__)
 
+# The directory of the definition cache can be set from the environment for processes that
+# do not configure the cache explicitly with set_definition_cache.
+DEFINITION_CACHE_DIR_ENV = "ORQUESTA_DEFINITION_CACHE_DIR"
+
+DEFAULT_DEFINITION_CACHE_MAX_ENTRIES = 1024
+DEFAULT_DEFINITION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# The age in seconds of a temporary file in the definition cache before it is considered
+# left over from a write that did not complete and is removed.
+DEFINITION_CACHE_TMP_FILE_MAX_AGE = 600
+
+_DEFINITION_CACHE = None
+_DEFINITION_CACHE_LOCK = threading.Lock()
+
+
+class DefinitionCache(object):
+    # Cache the serialized spec of the workflow definitions on disk keyed by the digest of the
+    # definition text, the spec type, and the orquesta version. The entries from other versions
+    # or that cannot be read are removed on access. The oldest entries are removed when the
+    # number of entries or the total size of the entries is over the limits. The temporary
+    # files left over from writes that did not complete are removed with the oldest entries.
+    def __init__(
+        self,
+        path,
+        max_entries=DEFAULT_DEFINITION_CACHE_MAX_ENTRIES,
+        max_bytes=DEFAULT_DEFINITION_CACHE_MAX_BYTES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, spec_type, definition, layout=None):
+        # The layout distinguishes the definitions of the same text that are instantiated
+        # differently, i.e. a named workflow or the workflow spec itself.
+        parts = [orquesta.__version__, spec_type] + ([layout] if layout else []) + [definition]
+        data = "\0".join(parts)
+
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def get_entry_path(self, key):
+        return os.path.join(self.path, key + ".json")
+
+    def _remove(self, entry_path):
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+    def get(self, spec_type, definition, layout=None):
+        key = self.get_key(spec_type, definition, layout=layout)
+        entry_path = self.get_entry_path(key)
+
+        try:
+            with open(entry_path, "r") as f:
+                entry = json.load(f)
+
+            if entry.get("key") != key or entry.get("version") != orquesta.__version__:
+                raise ValueError("The cache entry does not match the workflow definition.")
+
+            spec = deserialize(entry["data"])
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        except Exception as e:
+            LOG.debug('Removing invalid definition cache entry "%s". %s', entry_path, str(e))
+            self._remove(entry_path)
+            self.misses += 1
+            return None
+
+        # Update the modified time of the entry so the least recently used entries are pruned.
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+
+        return spec
+
+    def put(self, spec_type, definition, spec, layout=None):
+        key = self.get_key(spec_type, definition, layout=layout)
+        entry = {"key": key, "version": orquesta.__version__, "data": spec.serialize()}
+
+        try:
+            data = json.dumps(entry)
+        except (TypeError, ValueError) as e:
+            LOG.debug("Unable to write to the definition cache. %s", str(e))
+            return
+
+        # The spec is not cached if it is not the same after it is loaded from JSON, i.e. the
+        # mappings in the definition have keys that are not strings.
+        if json.loads(data) != entry:
+            LOG.debug("Unable to write to the definition cache. The spec is not JSON compatible.")
+            return
+
+        tmp_path = None
+
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+
+            # Write the entry to a temporary file and rename so readers never see a partial entry.
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+
+            os.rename(tmp_path, self.get_entry_path(key))
+        except (IOError, OSError) as e:
+            LOG.debug("Unable to write to the definition cache. %s", str(e))
+
+            if tmp_path:
+                self._remove(tmp_path)
+
+            return
+
+        self.prune()
+
+    def get_entries(self):
+        entries = []
+
+        for name in os.listdir(self.path) if os.path.isdir(self.path) else []:
+            if not name.endswith(".json"):
+                continue
+
+            try:
+                stat = os.stat(os.path.join(self.path, name))
+            except OSError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, os.path.join(self.path, name)))
+
+        return sorted(entries)
+
+    def get_tmp_files(self, max_age=0):
+        tmp_paths = []
+        now = time.time()
+
+        for name in os.listdir(self.path) if os.path.isdir(self.path) else []:
+            if not name.endswith(".tmp"):
+                continue
+
+            try:
+                stat = os.stat(os.path.join(self.path, name))
+            except OSError:
+                continue
+
+            if now - stat.st_mtime >= max_age:
+                tmp_paths.append(os.path.join(self.path, name))
+
+        return tmp_paths
+
+    def prune(self):
+        # The temporary files of writes in progress in other processes are not removed.
+        for tmp_path in self.get_tmp_files(max_age=DEFINITION_CACHE_TMP_FILE_MAX_AGE):
+            self._remove(tmp_path)
+
+        entries = self.get_entries()
+        total_bytes = sum(entry[1] for entry in entries)
+
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, entry_path = entries.pop(0)
+            self._remove(entry_path)
+            total_bytes -= size
+
+    def clear(self):
+        for _, _, entry_path in self.get_entries():
+            self._remove(entry_path)
+
+        for tmp_path in self.get_tmp_files(max_age=DEFINITION_CACHE_TMP_FILE_MAX_AGE):
+            self._remove(tmp_path)
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        entries = self.get_entries()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(entry[1] for entry in entries),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# The definition cache is set to False if the cache is disabled so the environment is not read
+# again on each call to get_definition_cache.
+def set_definition_cache(path, **kwargs):
+    global _DEFINITION_CACHE
+
+    with _DEFINITION_CACHE_LOCK:
+        _DEFINITION_CACHE = DefinitionCache(path, **kwargs) if path else False
+
+    return _DEFINITION_CACHE or None
+
+
+def get_definition_cache():
+    global _DEFINITION_CACHE
+
+    with _DEFINITION_CACHE_LOCK:
+        if _DEFINITION_CACHE is None:
+            path = os.environ.get(DEFINITION_CACHE_DIR_ENV)
+            _DEFINITION_CACHE = DefinitionCache(path) if path else False
+
+    return _DEFINITION_CACHE or None
+
+
+def _instantiate_with_cache(spec_type, definition, instantiate_func, layout=None):
+    cache = get_definition_cache() if isinstance(definition, six.string_types) else None
+
+    if cache:
+        spec = cache.get(spec_type, definition, layout=layout)
+
+        if spec is not None:
+            return spec
+
+    spec = instantiate_func(spec_type, definition)
+
+    if cache:
+        cache.put(spec_type, definition, spec, layout=layout)
+
+    return spec
+
 
 def instantiate(spec_type, definition):
+    return _instantiate_with_cache(spec_type, definition, _instantiate)
+
+
+def instantiate_workflow_spec(spec_type, definition):
+    # Instantiate the workflow spec directly from the definition as the spec module does, where
+    # the version is part of the workflow spec, i.e. the workflow definition of a rehearsal.
+    return _instantiate_with_cache(
+        spec_type, definition, _instantiate_workflow_spec, layout="workflow_spec"
+    )
+
+
+def _instantiate_workflow_spec(spec_type, definition):
+    return spec_loader.get_spec_module(spec_type).instantiate(definition)
+
+
+def _instantiate(spec_type, definition):
     if not definition:
         raise ValueError("Workflow definition is empty.")
 
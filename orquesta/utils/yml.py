@@ -12,7 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
+import collections
+import io
+import itertools
 import logging
+import os
+import six
+import tempfile
+import weakref
 import yaml
 
 try:
@@ -21,6 +29,7 @@ except ImportError:
     from yaml import SafeLoader
 
 from yaml import constructor
+from yaml import events as yaml_events
 from yaml import nodes
 
 LOG = logging.getLogger(__name__)
@@ -62,6 +71,17 @@ yaml.add_constructor(
 )
 
 
+# Loader with the same mapping semantics as yaml.safe_load that uses CSafeLoader where possible.
+class StandardSafeLoader(SafeLoader):
+    pass
+
+
+StandardSafeLoader.add_constructor(
+    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+    constructor.SafeConstructor.construct_yaml_map,
+)
+
+
 # Use a separate method here for yaml safe_load to ensure UniqueKeyLoader is loaded.
 def safe_load(definition):
     try:
@@ -73,3 +93,268 @@ def safe_load(definition):
         # Reraise the exception as a ValueError since we do not need to
         # propagate the additional args returned by the ConstructorError.
         raise ValueError("Failed to load workflow definition because %s." % str(e))
+
+
+# The default size in characters of a value under a lazy path before it is spooled to a file.
+DEFAULT_LAZY_MIN_SIZE = 1024 * 1024
+
+LAZY_VALUE_TAG = "tag:orquesta,2021:lazy"
+
+
+# The weak references to the lazy values with a temporary file by the path of the file.
+_TEMPORARY_FILE_REFS = {}
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _track_temporary_file(value, path):
+    # Remove the file when the value is garbage collected. The weak reference is kept
+    # until then so the callback is called.
+    def callback(ref):
+        _TEMPORARY_FILE_REFS.pop(path, None)
+        _remove_file(path)
+
+    _TEMPORARY_FILE_REFS[path] = weakref.ref(value, callback)
+
+
+@atexit.register
+def _remove_temporary_files():
+    for path in list(_TEMPORARY_FILE_REFS.keys()):
+        _TEMPORARY_FILE_REFS.pop(path, None)
+        _remove_file(path)
+
+
+class LazyValue(object):
+    """Reference to a value that is stored in a file and loaded on access.
+
+    The value is not cached so the memory used by the value is released once the
+    caller is done with it. If the file is temporary, it is removed when the
+    reference is garbage collected.
+    """
+
+    def __init__(self, path, loader=None, temporary=False):
+        self.path = path
+        self.loader = loader or safe_load
+
+        if temporary:
+            _track_temporary_file(self, path)
+
+    def __deepcopy__(self, memo):
+        # The reference is immutable so it is shared by copies and the file is only
+        # removed when all references are garbage collected.
+        return self
+
+    def load(self):
+        with open(self.path, "r") as f:
+            return self.loader(f)
+
+
+class SizeLimitedStream(object):
+    def __init__(self, stream, max_size):
+        self.stream = stream
+        self.max_size = max_size
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.size += len(data)
+
+        if self.size > self.max_size:
+            raise ValueError("the size exceeds the size limit of %s" % self.max_size)
+
+        return data
+
+
+class StreamLoader(yaml.SafeLoader):
+    """YAML loader that composes the document from the stream of parser events.
+
+    The value of nodes at the given lazy paths are written to a temporary file as
+    events are parsed if the value is larger than lazy_min_size and are returned
+    as LazyValue. A lazy path is a tuple of keys and indices where "*" matches
+    any key or index. Otherwise, the document is constructed as in yaml.safe_load.
+    """
+
+    def __init__(self, stream, lazy_paths=None, lazy_min_size=DEFAULT_LAZY_MIN_SIZE):
+        super(StreamLoader, self).__init__(stream)
+        self.lazy_paths = [tuple(p) for p in lazy_paths or []]
+        self.lazy_min_size = lazy_min_size
+        self.lazy_values = {}
+        self.replay_events = collections.deque()
+        self.node_path = []
+
+    def check_event(self, *choices):
+        if not self.replay_events:
+            return super(StreamLoader, self).check_event(*choices)
+
+        return not choices or isinstance(self.replay_events[0], choices)
+
+    def peek_event(self):
+        if not self.replay_events:
+            return super(StreamLoader, self).peek_event()
+
+        return self.replay_events[0]
+
+    def get_event(self):
+        if not self.replay_events:
+            return super(StreamLoader, self).get_event()
+
+        return self.replay_events.popleft()
+
+    def is_lazy_path(self):
+        for lazy_path in self.lazy_paths:
+            if len(lazy_path) != len(self.node_path):
+                continue
+
+            if None in self.node_path:
+                continue
+
+            if all(p == "*" or p == str(k) for p, k in zip(lazy_path, self.node_path)):
+                return True
+
+        return False
+
+    def compose_node(self, parent, index):
+        # The index of a mapping value is the key node and the index of a mapping key is None.
+        if isinstance(parent, nodes.MappingNode):
+            key = index.value if isinstance(index, nodes.ScalarNode) else None
+        else:
+            key = index
+
+        if parent is not None:
+            self.node_path.append(key)
+
+        try:
+            if (
+                parent is not None
+                and self.is_lazy_path()
+                and not self.check_event(yaml_events.AliasEvent)
+            ):
+                return self.compose_lazy_node(parent, index)
+
+            return super(StreamLoader, self).compose_node(parent, index)
+        finally:
+            if parent is not None:
+                self.node_path.pop()
+
+    def iter_subtree_events(self):
+        depth = 0
+
+        while True:
+            event = super(StreamLoader, self).get_event()
+
+            if isinstance(event, (yaml_events.SequenceStartEvent, yaml_events.MappingStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml_events.SequenceEndEvent, yaml_events.MappingEndEvent)):
+                depth -= 1
+
+            yield event
+
+            if depth == 0:
+                break
+
+    def compose_lazy_node(self, parent, index):
+        subtree_events = self.iter_subtree_events()
+        buffered = []
+        size = 0
+
+        # Buffer the events until the size of the scalars exceeds lazy_min_size. If the
+        # subtree ends before then, the node is composed from the buffered events as usual.
+        for event in subtree_events:
+            buffered.append(event)
+
+            if isinstance(event, yaml_events.ScalarEvent):
+                size += len(event.value)
+
+            if size > self.lazy_min_size:
+                break
+        else:
+            self.replay_events.extend(buffered)
+            return super(StreamLoader, self).compose_node(parent, index)
+
+        fd, path = tempfile.mkstemp(prefix="orquesta-", suffix=".yaml")
+        self.lazy_values[path] = LazyValue(path, temporary=True)
+        anchors = set()
+
+        with os.fdopen(fd, "w") as f:
+            emitter = yaml.emitter.Emitter(f)
+            emitter.emit(yaml_events.StreamStartEvent())
+            emitter.emit(yaml_events.DocumentStartEvent(explicit=False))
+
+            for event in itertools.chain(buffered, subtree_events):
+                anchor = getattr(event, "anchor", None)
+
+                if isinstance(event, yaml_events.AliasEvent) and anchor not in anchors:
+                    raise ValueError(
+                        'the lazy value at "%s" references the anchor "%s" outside of it'
+                        % ("/".join(str(k) for k in self.node_path), anchor)
+                    )
+
+                if anchor is not None:
+                    anchors.add(anchor)
+
+                emitter.emit(event)
+
+            emitter.emit(yaml_events.DocumentEndEvent(explicit=False))
+            emitter.emit(yaml_events.StreamEndEvent())
+
+        return nodes.ScalarNode(LAZY_VALUE_TAG, path)
+
+    def construct_lazy_value(self, node):
+        return self.lazy_values[node.value]
+
+
+StreamLoader.add_constructor(LAZY_VALUE_TAG, StreamLoader.construct_lazy_value)
+
+StreamLoader.add_constructor(
+    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+    constructor.SafeConstructor.construct_yaml_map,
+)
+
+
+def get_stream_size(stream):
+    if isinstance(stream, (six.string_types, six.binary_type)):
+        return len(stream)
+
+    try:
+        return os.fstat(stream.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def safe_load_stream(stream, max_size=None, lazy_paths=None, lazy_min_size=None):
+    size = get_stream_size(stream)
+
+    # Check the size of the stream upfront if it is known and otherwise as it is read.
+    if max_size is not None:
+        if size is not None and size > max_size:
+            raise ValueError(
+                "Failed to load workflow definition because the size %s exceeds "
+                "the size limit of %s." % (size, max_size)
+            )
+
+        if size is None:
+            stream = SizeLimitedStream(stream, max_size)
+
+    if lazy_min_size is None:
+        lazy_min_size = DEFAULT_LAZY_MIN_SIZE
+
+    try:
+        # The stream loader is pure python so it is only used if the stream may have a value
+        # under the lazy paths that is larger than lazy_min_size.
+        if lazy_paths and (size is None or size > lazy_min_size):
+            loader = StreamLoader(stream, lazy_paths=lazy_paths, lazy_min_size=lazy_min_size)
+        else:
+            loader = StandardSafeLoader(stream)
+
+        try:
+            return loader.get_single_data()
+        finally:
+            loader.dispose()
+    except Exception as e:
+        # Reraise the exception as a ValueError to be consistent with safe_load.
+        raise ValueError("Failed to load workflow definition because %s." % str(e))
@@ -72,6 +72,10 @@ setup(
             "mistral = orquesta.composers.mistral:WorkflowComposer",
             "mock = orquesta.composers.mock:WorkflowComposer",
         ],
+        "orquesta.graphing.backends": [
+            "dict = orquesta.graphing:DictMultiDiGraph",
+            "networkx = networkx:MultiDiGraph",
+        ],
         "orquesta.expressions.evaluators": [
             "yaql = orquesta.expressions.yql:YAQLEvaluator",
             "jinja = orquesta.expressions.jinja:JinjaEvaluator",
@@ -99,6 +103,7 @@ setup(
     },
     scripts=[
         "bin/orquesta-generate-schemas",
+        "bin/orquesta-inspect",
         "bin/orquesta-rehearse",
     ],
 )